@@ -2,10 +2,12 @@ import scipy.spatial as sptl
 import scipy.sparse as sprs
 import numpy as np
 from openpnm._skgraph.generators import cubic
+from openpnm._skgraph.generators._cubic import _check_index_dtype
 from openpnm._skgraph.tools import tri_to_am
 
 
-def bcc(shape, spacing=1, mode='kdtree', node_prefix='node', edge_prefix='edge'):
+def bcc(shape, spacing=1, mode='kdtree', node_prefix='node', edge_prefix='edge',
+        index_dtype=int):
     r"""
     Generate a body-centered cubic lattice
 
@@ -29,6 +31,11 @@ def bcc(shape, spacing=1, mode='kdtree', node_prefix='node', edge_prefix='edge')
         'triangulation'  Uses ``scipy.spatial.Delaunay`` to find all neighbors
         ===============  ======================================================
 
+    index_dtype : dtype
+        The integer type used for the edge connections.  Using ``np.int32``
+        halves their memory, and is possible as long as there are fewer
+        than 2**31 nodes.
+
     Returns
     -------
     network : dict
@@ -58,6 +65,7 @@ def bcc(shape, spacing=1, mode='kdtree', node_prefix='node', edge_prefix='edge')
     body_label = np.concatenate(
         (np.zeros(net1[node_prefix + '.coords'].shape[0], dtype=bool),
          np.ones(net2[node_prefix + '.coords'].shape[0], dtype=bool)))
+    _check_index_dtype(index_dtype, crds.shape[0])
     if mode.startswith('tri'):
         tri = sptl.Delaunay(points=crds)
         am = tri_to_am(tri)
@@ -84,7 +92,7 @@ def bcc(shape, spacing=1, mode='kdtree', node_prefix='node', edge_prefix='edge')
 
     d = {}
     d[node_prefix+'.coords'] = crds*spacing
-    d[edge_prefix+'.conns'] = conns
+    d[edge_prefix+'.conns'] = conns.astype(index_dtype, copy=False)
     d[node_prefix+'.corner'] = corner_label
     d[node_prefix+'.body'] = body_label
     return d
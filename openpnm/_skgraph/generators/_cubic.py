@@ -1,7 +1,17 @@
+import os
 import numpy as np
 
 
-def cubic(shape, spacing=1, connectivity=6, node_prefix='node', edge_prefix='edge'):
+# The offset between the tail and head node of each type of joint, listed in
+# the order in which their edges are numbered
+_face_joints = [(0, 0, 1), (0, 1, 0), (1, 0, 0)]
+_corner_joints = [(1, 1, 1), (1, 1, -1), (1, -1, 1), (-1, 1, 1)]
+_edge_joints = [(0, 1, 1), (0, 1, -1), (1, 0, 1), (-1, 0, 1),
+                (-1, -1, 0), (-1, 1, 0)]
+
+
+def cubic(shape, spacing=1, connectivity=6, node_prefix='node',
+          edge_prefix='edge', index_dtype=int, chunk_size=None, store=None):
     r"""
     Generate a simple cubic lattice
 
@@ -13,6 +23,26 @@ def cubic(shape, spacing=1, connectivity=6, node_prefix='node', edge_prefix='edg
     spacing : array_like or float
         The size of a unit cell in each direction. If an scalar is given it is
         applied in all 3 directions.
+    connectivity : int
+        The number of neighbors each node is connected to, which can be 6,
+        14, 18, 20 or 26.
+    index_dtype : dtype
+        The integer type used for the edge connections.  Using ``np.int32``
+        halves the memory needed for large lattices, and is possible as long
+        as there are fewer than 2**31 nodes.
+    chunk_size : int, optional
+        The approximate number of nodes to process at once.  The lattice is
+        generated in slabs of whole planes along the x-axis, so the memory
+        needed beyond the returned arrays is proportional to this value
+        rather than to the size of the lattice.  If not given the entire
+        lattice is processed at once.
+    store : str or h5py.Group, optional
+        Where to write the ``coords`` and ``conns`` arrays.  If a path to a
+        directory is given they are written to ``coords.npy`` and
+        ``conns.npy`` files in that directory and returned as memory mapped
+        arrays.  If an HDF5 group is given they are written to datasets of
+        the same names.  In both cases the lattice is never held in memory
+        in its entirety.  If not given (default) normal arrays are returned.
 
     Returns
     -------
@@ -20,63 +50,94 @@ def cubic(shape, spacing=1, connectivity=6, node_prefix='node', edge_prefix='edg
         A dictionary containing ``coords`` and ``conns`` of a cubic network with the
         specified spacing and connectivity.
 
+    Notes
+    -----
+    The node and edge numbering does not depend on ``chunk_size``, so the
+    same network is produced regardless of how it was generated.
+
     """
     # Take care of 1D/2D networks
     shape = np.array(shape, ndmin=1)
     shape = np.concatenate((shape, [1] * (3 - shape.size))).astype(int)
-    arr = np.atleast_3d(np.empty(shape))
     spacing = np.float64(spacing)
     if spacing.size == 2:
         spacing = np.concatenate((spacing, [1]))
     spacing = np.ones(3, dtype=float) * np.array(spacing, ndmin=1)
 
-    z = np.tile(np.arange(shape[2]), shape[0] * shape[1])
-    y = np.tile(np.repeat(np.arange(shape[1]), shape[2]), shape[0])
-    x = np.repeat(np.arange(shape[0]), shape[1] * shape[2])
-    points = (np.vstack([x, y, z]).T).astype(float) + 0.5
-
-    idx = np.arange(arr.size).reshape(arr.shape)
-
-    face_joints = [(idx[:, :, :-1], idx[:, :, 1:]),
-                   (idx[:, :-1], idx[:, 1:]),
-                   (idx[:-1], idx[1:])]
-
-    corner_joints = [(idx[:-1, :-1, :-1], idx[1:, 1:, 1:]),
-                     (idx[:-1, :-1, 1:], idx[1:, 1:, :-1]),
-                     (idx[:-1, 1:, :-1], idx[1:, :-1, 1:]),
-                     (idx[1:, :-1, :-1], idx[:-1, 1:, 1:])]
-
-    edge_joints = [(idx[:, :-1, :-1], idx[:, 1:, 1:]),
-                   (idx[:, :-1, 1:], idx[:, 1:, :-1]),
-                   (idx[:-1, :, :-1], idx[1:, :, 1:]),
-                   (idx[1:, :, :-1], idx[:-1, :, 1:]),
-                   (idx[1:, 1:, :], idx[:-1, :-1, :]),
-                   (idx[1:, :-1, :], idx[:-1, 1:, :])]
-
     if connectivity == 6:
-        joints = face_joints
+        joints = _face_joints
     elif connectivity == 6 + 8:
-        joints = face_joints + corner_joints
+        joints = _face_joints + _corner_joints
     elif connectivity == 6 + 12:
-        joints = face_joints + edge_joints
+        joints = _face_joints + _edge_joints
     elif connectivity == 12 + 8:
-        joints = edge_joints + corner_joints
+        joints = _edge_joints + _corner_joints
     elif connectivity == 6 + 8 + 12:
-        joints = face_joints + corner_joints + edge_joints
+        joints = _face_joints + _corner_joints + _edge_joints
     else:
         raise Exception("Invalid connectivity. Must be 6, 14, 18, 20 or 26.")
 
-    tails, heads = np.array([], dtype=int), np.array([], dtype=int)
-    for T, H in joints:
-        tails = np.concatenate((tails, T.flatten()))
-        heads = np.concatenate((heads, H.flatten()))
-    pairs = np.vstack([tails, heads]).T
-    # NOTE: pairs is already sorted for connectivity = 6
-    if connectivity != 6:
-        pairs = np.sort(pairs, axis=1)
+    Np = int(np.prod(shape))
+    _check_index_dtype(index_dtype, Np)
+    Nt = [int(np.prod(shape - np.abs(j))) for j in joints]
+    nplane = int(shape[1]*shape[2])
+    nslab = shape[0] if chunk_size is None \
+        else max(1, int(chunk_size) // max(nplane, 1))
+
+    coords = _allocate(store, 'coords', (Np, 3), float)
+    conns = _allocate(store, 'conns', (sum(Nt), 2), index_dtype)
+
+    for x0 in range(0, shape[0], nslab):
+        x = np.arange(x0, min(x0 + nslab, shape[0]))
+        pts = np.empty((x.size, shape[1], shape[2], 3), dtype=float)
+        pts[..., 0] = x[:, None, None]
+        pts[..., 1] = np.arange(shape[1])[None, :, None]
+        pts[..., 2] = np.arange(shape[2])[None, None, :]
+        pts += 0.5
+        pts *= spacing
+        coords[x0*nplane:(x0 + x.size)*nplane] = pts.reshape(-1, 3)
+
+    start = 0
+    for j in joints:
+        # The tails of each joint are the nodes from which the offset j
+        # stays within the lattice, visited in the same order as the nodes
+        lo = [1 if d < 0 else 0 for d in j]
+        hi = [s - 1 if d > 0 else s for d, s in zip(j, shape)]
+        y = np.arange(lo[1], hi[1], dtype=index_dtype)
+        z = np.arange(lo[2], hi[2], dtype=index_dtype)
+        yz = (y[:, None]*shape[2] + z[None, :]).ravel()
+        shift = (j[0]*shape[1] + j[1])*shape[2] + j[2]
+        for x0 in range(lo[0], hi[0], nslab):
+            x = np.arange(x0, min(x0 + nslab, hi[0]), dtype=index_dtype)
+            tails = (x[:, None]*nplane + yz[None, :]).ravel()
+            heads = tails + shift
+            stop = start + tails.size
+            if shift < 0:  # Keep the smaller node index in the first column
+                tails, heads = heads, tails
+            conns[start:stop, 0] = tails
+            conns[start:stop, 1] = heads
+            start = stop
 
     d = {}
-    d[f"{node_prefix}.coords"] = points * spacing
-    d[f"{edge_prefix}.conns"] = pairs
+    d[f"{node_prefix}.coords"] = coords
+    d[f"{edge_prefix}.conns"] = conns
 
     return d
+
+
+def _check_index_dtype(index_dtype, n):
+    # Generators build their edge connections in the requested integer type
+    # directly, so it must be able to hold all the node indices
+    if np.iinfo(index_dtype).max < n:
+        raise Exception(f'{np.dtype(index_dtype)} is too small to index '
+                        f'{n} nodes')
+
+
+def _allocate(store, name, shape, dtype):
+    if store is None:
+        return np.empty(shape, dtype=dtype)
+    if hasattr(store, 'create_dataset'):
+        return store.create_dataset(name, shape=shape, dtype=dtype)
+    os.makedirs(store, exist_ok=True)
+    return np.lib.format.open_memmap(os.path.join(store, f'{name}.npy'),
+                                     mode='w+', shape=shape, dtype=dtype)
@@ -1,12 +1,19 @@
+import logging
 import numpy as np
 import scipy.spatial as sptl
+from concurrent.futures import ProcessPoolExecutor
 from openpnm._skgraph.generators import tools
+from openpnm._skgraph.generators._cubic import _check_index_dtype
 from openpnm._skgraph.tools import tri_to_am, isoutside
 from openpnm._skgraph.operations import trim_nodes
 
 
+logger = logging.getLogger(__name__)
+
+
 def delaunay(points, shape=[1, 1, 1], reflect=False, trim=True,
-             node_prefix='node', edge_prefix='edge'):
+             node_prefix='node', edge_prefix='edge', divs=None, cores=None,
+             index_dtype=int):
     r"""
     Generate a network based on Delaunay triangulation of random points
 
@@ -25,22 +32,285 @@ def delaunay(points, shape=[1, 1, 1], reflect=False, trim=True,
     trim : boolean, optional (default = ``True``)
         If ``True`` then any points laying outside the domain are removed. This is
         mostly only useful if ``reflect=True``.
+    divs : int or array_like, optional
+        The number of tiles into which the domain is divided along each
+        axis.  If given, each tile is triangulated separately along with a
+        surrounding halo of points, and only the simplices which are
+        guaranteed to be part of the full triangulation are kept (see Notes).
+        The default is to triangulate all the points at once.
+    cores : int, optional
+        The number of processes used to triangulate the tiles.  The default
+        is to use all available cores.  If 1, the tiles are processed in
+        the current process.
+    index_dtype : dtype
+        The integer type used for the edge connections.  Using ``np.int32``
+        halves their memory, and is possible as long as there are fewer
+        than 2**31 nodes.
 
     Returns
     -------
     network : dict
         A dictionary containing 'node.coords' and 'edge.conns'
     tri : Delaunay tessellation object
-        The Delaunay tessellation object produced by ``scipy.spatial.Delaunay``
+        The Delaunay tessellation object produced by ``scipy.spatial.Delaunay``,
+        or ``None`` if ``divs`` was given.
+
+    Notes
+    -----
+    A simplex is assigned to the tile which contains its circumcenter, and is
+    kept if its circumsphere encloses no part of the domain outside the
+    points given to that tile, meaning it is also part of the triangulation
+    of all the points.  Tiles with simplices that do not meet this
+    requirement are repeated with a wider halo, and if the kept simplices do
+    not fill the convex hull of the points the full triangulation is
+    performed instead.  The resulting connections are identical to those of
+    the full triangulation provided the points are in general position,
+    which is the case for randomly generated points.
+
     """
     points = tools.parse_points(points=points, shape=shape, reflect=reflect)
     mask = ~np.all(points == 0, axis=0)
-    tri = sptl.Delaunay(points=points[:, mask])
-    coo = tri_to_am(tri)
     d = {}
     d[node_prefix+'.coords'] = points
-    d[edge_prefix+'.conns'] = np.vstack((coo.row, coo.col)).T
+    _check_index_dtype(index_dtype, points.shape[0])
+    if divs is None:
+        tri = sptl.Delaunay(points=points[:, mask])
+        coo = tri_to_am(tri)
+        conns = np.empty((coo.nnz, 2), dtype=index_dtype)
+        conns[:, 0], conns[:, 1] = coo.row, coo.col
+        d[edge_prefix+'.conns'] = conns
+    else:
+        tri = None
+        divs = np.array(divs, ndmin=1)
+        if divs.size == mask.size:  # Drop the divisions along unused axes
+            divs = divs[mask]
+        simplices = _tiled_delaunay(points[:, mask], divs=divs, cores=cores)
+        d[edge_prefix+'.conns'] = _simplices_to_conns(simplices, index_dtype)
     if trim:
         trim = isoutside(d, shape=shape)
         d = trim_nodes(network=d, inds=np.where(trim)[0])
     return d, tri
+
+
+def _simplices_to_conns(simplices, index_dtype=int):
+    # Unique sorted pairs of nodes sharing a simplex, in the same order as
+    # the upper triangular adjacency matrix produced by tri_to_am
+    k = simplices.shape[1]
+    i, j = np.triu_indices(k, 1)
+    a = simplices[:, i].ravel().astype(np.int64)
+    b = simplices[:, j].ravel().astype(np.int64)
+    # Encode each pair as a single integer, which is much faster to sort
+    n = max(a.max(), b.max()) + 1
+    keys = np.unique(np.minimum(a, b)*n + np.maximum(a, b))
+    conns = np.empty((keys.size, 2), dtype=index_dtype)
+    conns[:, 0], conns[:, 1] = np.divmod(keys, n)
+    return conns
+
+
+def _tiled_delaunay(points, divs, cores=None, halo=3.0):
+    r"""
+    Finds the simplices of the Delaunay triangulation of ``points`` by
+    triangulating overlapping tiles of the domain in parallel
+    """
+    N, ndim = points.shape
+    lo, hi = points.min(axis=0), points.max(axis=0)
+    divs = np.ones(ndim, dtype=int)*np.array(divs, dtype=int)
+    edges = [np.linspace(lo[i], hi[i], divs[i] + 1) for i in range(ndim)]
+    # Start with a halo a few times the mean spacing between points
+    width = halo*(np.prod(hi - lo)/N)**(1/ndim)
+    # Simplices on the outside of the domain can span several tiles, but
+    # have all their corners close to one face, so each face is also done
+    faces = [('face', i, side) for i in range(ndim) for side in [0, 1]]
+    tiles = faces + list(np.ndindex(*divs))
+    widths = {t: width for t in tiles}
+    tree = None
+    inner, outer, hull = [], [], []
+    volume = 0.0
+    with ProcessPoolExecutor(max_workers=cores) if cores != 1 else \
+            _SerialExecutor() as pool:
+        while tiles:
+            jobs = {t: pool.submit(_triangulate_tile, *_get_region(
+                points, t, edges, widths[t])) for t in tiles}
+            tiles = []
+            for t, job in jobs.items():
+                res = job.result()
+                if res is None:
+                    ok = False
+                else:
+                    hull.append(res[7])
+                    # Simplices near the edges of the region can have very
+                    # large circumspheres, so check these against all points
+                    S, c, r, own = res[2:6]
+                    empty = np.ones(r.size, dtype=bool)
+                    if r.size:
+                        if tree is None:
+                            tree = sptl.cKDTree(points)
+                        # The nearest point which is not a corner
+                        d, i = tree.query(c, k=ndim + 2)
+                        d[np.any(i[..., None] == S[:, None, :], axis=2)] = \
+                            np.inf
+                        # Reflected points give many cospherical vertices,
+                        # so points lying on the circumsphere are allowed,
+                        # to within the size of the simplex rather than of
+                        # its circumsphere which can be huge near the hull
+                        X = points[S]
+                        L = np.sqrt(((X[:, 1:] - X[:, :1])**2).sum(axis=2))
+                        empty = d.min(axis=1) >= r - 1e-9*L.max(axis=1)
+                    ok = np.all(empty[own])
+                if ok:
+                    inner.append(res[0])
+                    inner.append(S[own])
+                    outer.append(np.vstack((res[1], S[~own & empty])))
+                    volume += res[6] + _volume(points, S[own])
+                else:
+                    widths[t] *= 2
+                    tiles.append(t)
+    # Simplices with circumcenters beyond the domain can be found by several
+    # tiles, while the others were only kept by the tile containing them
+    outer = np.unique(np.sort(np.vstack(outer), axis=1), axis=0)
+    simplices = np.vstack(inner + [outer])
+    # The simplices fill the convex hull if the triangulation is complete.
+    # The tiles found the volume of the simplices they own and the vertices
+    # of their own hulls, so only the simplices checked here and those
+    # beyond the domain are measured, and only the points on the hulls of
+    # the tiles can be on the overall hull.
+    volume += _volume(points, outer)
+    hull = np.unique(np.concatenate(hull))
+    if not np.isclose(volume, sptl.ConvexHull(points[hull]).volume,
+                      rtol=1e-9, atol=0):
+        logger.warning('Tiled triangulation was incomplete, performing the'
+                       ' full triangulation instead')
+        simplices = sptl.Delaunay(points).simplices
+    return simplices
+
+
+def _volume(points, simplices, chunk=1000000):
+    # The total area/volume of the given simplices
+    ndim = points.shape[1]
+    vol = 0.0
+    for i in range(0, simplices.shape[0], chunk):
+        X = points[simplices[i:i + chunk]]
+        vol += np.abs(np.linalg.det(X[:, 1:] - X[:, :1])).sum()
+    return vol/np.prod(np.arange(1, ndim + 1))
+
+
+def _get_region(points, t, edges, width):
+    # The arguments of _triangulate_tile for a tile or a face
+    if t[0] == 'face':
+        return _get_face(points, t, edges, width)
+    return _get_tile(points, t, edges, width)
+
+
+def _get_tile(points, t, edges, width):
+    # The core box of tile t, and the box containing the points it is given,
+    # which both extend to infinity beyond the edges of the domain
+    ndim = points.shape[1]
+    last = np.array([len(e) - 2 for e in edges])
+    core = np.array([[edges[i][t[i]], edges[i][t[i] + 1]]
+                     for i in range(ndim)])
+    region = np.vstack((core[:, 0] - width, core[:, 1] + width)).T
+    core[:, 0][np.array(t) == 0] = -np.inf
+    core[:, 1][np.array(t) == last] = np.inf
+    bounds = np.array([[e[0], e[-1]] for e in edges])
+    region[region[:, 0] <= bounds[:, 0], 0] = -np.inf
+    region[region[:, 1] >= bounds[:, 1], 1] = np.inf
+    inside = np.all((points >= region[:, 0]) & (points <= region[:, 1]),
+                    axis=1)
+    inds = np.where(inside)[0]
+    return points[inds], inds, core, region, bounds
+
+
+def _get_face(points, f, edges, width):
+    # A tile which owns nothing and is given the points near one face
+    _, i, side = f
+    ndim = points.shape[1]
+    core = np.tile([np.inf, -np.inf], (ndim, 1))
+    bounds = np.array([[e[0], e[-1]] for e in edges])
+    region = np.tile([-np.inf, np.inf], (ndim, 1))
+    if side == 0:
+        region[i, 1] = bounds[i, 0] + width
+    else:
+        region[i, 0] = bounds[i, 1] - width
+    inside = (points[:, i] >= region[i, 0]) & (points[:, i] <= region[i, 1])
+    inds = np.where(inside)[0]
+    return points[inds], inds, core, region, bounds
+
+
+def _triangulate_tile(points, inds, core, region, bounds):
+    r"""
+    Triangulates the points in one tile and returns the global indices of the
+    simplices found to be globally Delaunay, split into those owned by the
+    tile and those with circumcenters beyond the domain, followed by the
+    simplices and circumspheres of those which still need to be checked
+    against all the points, whether each of these is owned, the total volume
+    of the owned simplices and the points on the convex hull of the tile
+    """
+    ndim = points.shape[1]
+    if points.shape[0] <= ndim:
+        return None
+    tri = sptl.Delaunay(points)
+    X = points[tri.simplices]
+    A = X[:, 1:] - X[:, :1]
+    # Cospherical points, such as reflected ones, can give flat simplices
+    # which add no edges that their neighbors do not already have
+    scale = np.prod(np.sqrt((A**2).sum(axis=2)), axis=1)
+    vol = np.abs(np.linalg.det(A))
+    keep = vol > 1e-12*scale
+    X, A, simplices, vol = X[keep], A[keep], tri.simplices[keep], vol[keep]
+    # Circumcenter of each simplex relative to its first vertex
+    b = (A**2).sum(axis=2)/2
+    c = np.linalg.solve(A, b[..., None])[..., 0]
+    r = np.sqrt((c**2).sum(axis=1))
+    c += X[:, 0]
+    # Each simplex inside the domain is owned by the tile containing its
+    # circumcenter, while those beyond it may be found by several tiles
+    own = np.all((c >= core[:, 0]) & (c < core[:, 1]), axis=1)
+    beyond = np.any((c < bounds[:, 0]) | (c > bounds[:, 1]), axis=1)
+    own &= ~beyond
+    # The points left out all lie in the parts of the domain outside the
+    # region, so a circumsphere that misses these parts is empty
+    certified = np.ones(c.shape[0], dtype=bool)
+    for i in range(ndim):
+        for side in [0, 1]:
+            if np.isinf(region[i, side]):
+                continue
+            blo, bhi = bounds[:, 0].copy(), bounds[:, 1].copy()
+            if side == 0:
+                bhi[i] = region[i, 0]
+            else:
+                blo[i] = region[i, 1]
+            certified &= _box_distance(c, blo, bhi) >= r
+    S = inds[simplices]
+    check = (own | beyond) & ~certified
+    vol = vol[own & certified].sum()/np.prod(np.arange(1, ndim + 1))
+    return (S[own & certified], S[beyond & certified],
+            S[check], c[check], r[check], own[check], vol,
+            inds[np.unique(tri.convex_hull)])
+
+
+def _box_distance(pts, lo, hi):
+    # The distance from each point to an axis aligned box
+    d = np.maximum(np.maximum(lo - pts, pts - hi), 0)
+    return np.sqrt((d**2).sum(axis=1))
+
+
+class _SerialExecutor:
+    # Stands in for a process pool when only one core is requested
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        return False
+
+    def submit(self, func, *args):
+        return _Done(func(*args))
+
+
+class _Done:
+
+    def __init__(self, value):
+        self.value = value
+
+    def result(self):
+        return self.value
@@ -3,6 +3,7 @@ import scipy.spatial as sptl
 import scipy.sparse as sprs
 from numba import njit
 from openpnm._skgraph.generators import cubic
+from openpnm._skgraph.generators._cubic import _check_index_dtype
 from openpnm._skgraph.tools import tri_to_am
 
 
@@ -12,7 +13,8 @@ def len_lil(lil):
     return indptr
 
 
-def fcc(shape, spacing=1, mode='kdtree', node_prefix='node', edge_prefix='edge'):
+def fcc(shape, spacing=1, mode='kdtree', node_prefix='node', edge_prefix='edge',
+        index_dtype=int):
     r"""
     Generate a face-centered cubic lattice
 
@@ -35,6 +37,11 @@ def fcc(shape, spacing=1, mode='kdtree', node_prefix='node', edge_prefix='edge')
         'triangulation'  Uses ``scipy.spatial.Delaunay`` to find all neighbors.
         ===============  =====================================================
 
+    index_dtype : dtype
+        The integer type used for the edge connections.  Using ``np.int32``
+        halves their memory, and is possible as long as there are fewer
+        than 2**31 nodes.
+
     Returns
     -------
     network : dict
@@ -50,7 +57,7 @@ def fcc(shape, spacing=1, mode='kdtree', node_prefix='node', edge_prefix='edge')
     """
     shape = np.array(shape)
     # Create base cubic network of corner sites
-    net1 = cubic(shape=shape,
+    net1 = cubic(shape=shape, index_dtype=index_dtype,
                  node_prefix=node_prefix, edge_prefix=edge_prefix)
     # Create 3 networks to become face sites
     net2 = cubic(shape=shape - [1, 1, 0],
@@ -72,6 +79,7 @@ def fcc(shape, spacing=1, mode='kdtree', node_prefix='node', edge_prefix='edge')
          np.zeros(net2[node_prefix+'.coords'].shape[0], dtype=bool),
          np.zeros(net3[node_prefix+'.coords'].shape[0], dtype=bool),
          np.zeros(net4[node_prefix+'.coords'].shape[0], dtype=bool)))
+    _check_index_dtype(index_dtype, crds.shape[0])
     if mode.startswith('tri'):
         tri = sptl.Delaunay(points=crds)
         am = tri_to_am(tri)
@@ -95,7 +103,8 @@ def fcc(shape, spacing=1, mode='kdtree', node_prefix='node', edge_prefix='edge')
         am = sprs.triu(am, k=1)
         am = am.tocoo()
         conns = np.vstack((am.row, am.col)).T
-    conns = np.vstack((net1[edge_prefix+'.conns'], conns))
+    conns = np.vstack((net1[edge_prefix+'.conns'],
+                       conns.astype(index_dtype, copy=False)))
 
     d = {}
     d[node_prefix + '.coords'] = crds*spacing
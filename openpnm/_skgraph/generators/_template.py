@@ -4,7 +4,7 @@ from openpnm._skgraph.operations import trim_nodes
 
 
 def cubic_template(template, spacing=1, connectivity=6,
-                   node_prefix='node', edge_prefix='edge'):
+                   node_prefix='node', edge_prefix='edge', index_dtype=int):
     r"""
     Generate a simple cubic lattice matching the shape of the provided tempate
 
@@ -16,6 +16,10 @@ def cubic_template(template, spacing=1, connectivity=6,
     spacing : array_like or float
         The size of a unit cell in each direction. If an scalar is given it is
         applied in all 3 directions.
+    index_dtype : dtype
+        The integer type used for the edge connections.  Using ``np.int32``
+        halves their memory, and is possible as long as there are fewer
+        than 2**31 nodes.
 
     Returns
     -------
@@ -26,7 +30,7 @@ def cubic_template(template, spacing=1, connectivity=6,
     template = np.atleast_3d(template).astype(bool)
     # Generate a full cubic network
     temp = cubic(shape=template.shape, spacing=spacing,
-                 connectivity=connectivity,
+                 connectivity=connectivity, index_dtype=index_dtype,
                  node_prefix=node_prefix, edge_prefix=edge_prefix)
     # Store some info about template
     coords = np.unravel_index(range(template.size), template.shape)
@@ -2,11 +2,12 @@ import numpy as np
 import scipy.spatial as sptl
 from openpnm._skgraph.tools import vor_to_am, isoutside
 from openpnm._skgraph.generators import tools
+from openpnm._skgraph.generators._cubic import _check_index_dtype
 from openpnm._skgraph.operations import trim_nodes
 
 
 def voronoi(points, shape=[1, 1, 1], trim=True, reflect=False, relaxation=0,
-            node_prefix='node', edge_prefix='edge'):
+            node_prefix='node', edge_prefix='edge', index_dtype=int):
     r"""
     Generate a network based on a Voronoi tessellation of base points
 
@@ -27,12 +28,15 @@ def voronoi(points, shape=[1, 1, 1], trim=True, reflect=False, relaxation=0,
     relaxation : int, optional (default = 0)
         The number of iterations to use for relaxing the base points. This is
         sometimes called `Lloyd's algorithm
-        <https://en.wikipedia.org/wiki/Lloyd%27s_algorithm>`_. This function computes
-        the new base points as the simple average of the Voronoi vertices instead
-        of rigorously finding the center of mass, which is quite time consuming.
-        To use the rigorous method, call the ``lloyd_relaxation`` function manually
-        to obtain relaxed points, then pass the points directly to this funcion.
-        The results are quite stable after only a few iterations.
+        <https://en.wikipedia.org/wiki/Lloyd%27s_algorithm>`_. Each iteration
+        moves the base points to the center of mass of their Voronoi cells, which
+        are all found at once from the current tessellation (see
+        ``lloyd_relaxation``). The results are quite stable after only a few
+        iterations.
+    index_dtype : dtype
+        The integer type used for the edge connections.  Using ``np.int32``
+        halves their memory, and is possible as long as there are fewer
+        than 2**31 nodes.
 
     Returns
     -------
@@ -59,7 +63,9 @@ def voronoi(points, shape=[1, 1, 1], trim=True, reflect=False, relaxation=0,
     coo = vor_to_am(vor)
     # Write values to dictionary
     d = {}
-    conns = np.vstack((coo.row, coo.col)).T
+    _check_index_dtype(index_dtype, vor.vertices.shape[0])
+    conns = np.empty((coo.nnz, 2), dtype=index_dtype)
+    conns[:, 0], conns[:, 1] = coo.row, coo.col
     d[edge_prefix+'.conns'] = conns
     # Convert coords to 3D if necessary
     # Rounding is crucial since some voronoi verts endup outside domain
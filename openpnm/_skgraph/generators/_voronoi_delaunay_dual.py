@@ -2,13 +2,14 @@ import scipy.spatial as sptl
 import scipy.sparse as sprs
 import numpy as np
 from openpnm._skgraph.generators import tools
+from openpnm._skgraph.generators._cubic import _check_index_dtype
 from openpnm._skgraph.operations import trim_nodes
 from openpnm._skgraph.tools import isoutside, conns_to_am
 from openpnm._skgraph.queries import find_neighbor_nodes
 
 
 def voronoi_delaunay_dual(points, shape, trim=True, reflect=True, relaxation=0,
-                          node_prefix='node', edge_prefix='edge'):
+                          node_prefix='node', edge_prefix='edge', index_dtype=int):
     r"""
     Generate a dual Voronoi-Delaunay network from given base points
 
@@ -30,10 +31,14 @@ def voronoi_delaunay_dual(points, shape, trim=True, reflect=True, relaxation=0,
         sometimes called `Lloyd's algorithm
         <https://en.wikipedia.org/wiki/Lloyd%27s_algorithm>`_. This function computes
         the new base points as the simple average of the Voronoi vertices instead
-        of rigorously finding the center of mass, which is quite time consuming.
-        To use the rigorous method, call the ``lloyd_relaxation`` function manually
-        to obtain relaxed points, then pass the points directly to this funcion.
-        The results are quite stable after only a few iterations.
+        of rigorously finding the center of mass. To use the rigorous method, call
+        the ``lloyd_relaxation`` function manually to obtain relaxed points, then
+        pass the points directly to this funcion. The results are quite stable
+        after only a few iterations.
+    index_dtype : dtype
+        The integer type used for the edge connections.  Using ``np.int32``
+        halves their memory, and is possible as long as there are fewer
+        than 2**31 nodes.
 
     Returns
     -------
@@ -89,7 +94,9 @@ def voronoi_delaunay_dual(points, shape, trim=True, reflect=True, relaxation=0,
     # Convert to sanitized adjacency matrix
     am = conns_to_am(conns)
     # Finally, retreive conns back from am
-    conns = np.vstack((am.row, am.col)).T
+    _check_index_dtype(index_dtype, Nall)
+    conns = np.empty((am.nnz, 2), dtype=index_dtype)
+    conns[:, 0], conns[:, 1] = am.row, am.col
 
     # Convert coords to 3D if necessary
     # Rounding is crucial since some voronoi verts endup outside domain
@@ -4,6 +4,7 @@ Tools
 
 """
 import numpy as np
+from itertools import chain
 from openpnm._skgraph import tools
 import scipy.spatial as sptl
 
@@ -35,25 +36,86 @@ def lloyd_relaxation(vor, mode='rigorous'):
         =========== ================================================================
         mode        description
         =========== ================================================================
-        rigorous    Computes a Delaunay triangulation of the input points then finds
-                    the true centroid by computing the area/volume of each triangle/
-                    tetrahedron to find the weighted average center of mass.
+        rigorous    Splits each Voronoi cell into triangles/tetrahedra spanning
+                    its base point and the faces of the cell, then finds the true
+                    centroid as the area/volume weighted average of their centers.
         fast        Computes the basic average of the input points without
                     accounting for the distribution of points. This is a decent
-                    approximation and is *much* faster.
+                    approximation and is slightly faster.
         =========== ================================================================
 
+    Returns
+    -------
+    points : ndarray
+        The base points with those lying in closed Voronoi cells moved to the
+        center of mass of their cell.  Points in open cells are not moved.
+
+    Notes
+    -----
+    The centroids of all cells are found at once from the ridges of the given
+    tessellation, so no further tessellations are required.
+
     """
-    pts = vor.points
-    for i, r in enumerate(vor.point_region):
-        if np.all(np.array(vor.regions[r]) > 0):
-            pts[i, :pts.shape[1]] = \
-                get_centroid(vor.vertices[vor.regions[r]], mode=mode)
+    pts = np.array(vor.points, dtype=float)
+    regions = [vor.regions[r] for r in vor.point_region]
+    lens = np.fromiter(map(len, regions), dtype=int, count=len(regions))
+    verts = np.fromiter(chain.from_iterable(regions), dtype=int,
+                        count=lens.sum())
+    starts = np.cumsum(lens) - lens
+    closed = lens > 0
+    closed[closed] = np.minimum.reduceat(verts, starts[closed]) >= 0
+    if mode == 'rigorous':
+        CoM = _cell_centroids(vor)
+    elif mode == 'fast':
+        CoM = np.zeros_like(pts)
+        CoM[lens > 0] = np.add.reduceat(vor.vertices[verts], starts[lens > 0])
+        CoM[lens > 0] /= lens[lens > 0, None]
+    else:
+        raise Exception(f'Unrecognized mode: {mode}')
+    pts[closed] = CoM[closed]
     if pts.shape[1] == 2:
         pts = np.c_[pts, np.zeros_like(pts[:, 0])]
     return pts
 
 
+def _cell_centroids(vor):
+    # Each ridge is split into a fan of segments (2D) or triangles (3D) which
+    # together with either of the base points it separates forms a simplex
+    # inside that point's cell.  The cells are convex so the simplices tile
+    # each cell exactly, even if they are not all of the same orientation.
+    ndim = vor.points.shape[1]
+    rv = vor.ridge_vertices
+    lens = np.fromiter(map(len, rv), dtype=int, count=len(rv))
+    flat = np.fromiter(chain.from_iterable(rv), dtype=int, count=lens.sum())
+    starts = np.cumsum(lens) - lens
+    ok = lens >= ndim
+    ok[ok] = np.minimum.reduceat(flat, starts[ok]) >= 0
+    nfan = np.where(ok, lens - ndim + 1, 0)
+    ridge = np.repeat(np.arange(len(rv)), nfan)
+    k = np.arange(ridge.size) - np.repeat(np.cumsum(nfan) - nfan, nfan)
+    if ndim == 2:
+        faces = np.vstack((flat[starts[ridge]], flat[starts[ridge] + 1])).T
+    else:
+        faces = np.vstack((flat[starts[ridge]],
+                           flat[starts[ridge] + k + 1],
+                           flat[starts[ridge] + k + 2])).T
+    V = vor.vertices[faces]
+    CoM = np.zeros_like(vor.points, dtype=float)
+    vol = np.zeros(vor.points.shape[0], dtype=float)
+    for side in [0, 1]:
+        P = vor.ridge_points[ridge, side]
+        vecs = V - vor.points[P][:, None, :]
+        w = np.abs(np.linalg.det(vecs))
+        cen = (V.sum(axis=1) + vor.points[P])/(ndim + 1)
+        vol += np.bincount(P, weights=w, minlength=vol.size)
+        for i in range(ndim):
+            CoM[:, i] += np.bincount(P, weights=w*cen[:, i],
+                                     minlength=vol.size)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        CoM /= vol[:, None]
+    return CoM
+
+
 def get_centroid(pts, mode='rigorous'):
     r"""
     Finds the centroid of a given set of points
@@ -91,35 +153,28 @@ def get_centroid(pts, mode='rigorous'):
     return CoM
 
 
-# This function is causing all kinds of problems on the CI.  It is working on
-# Ubuntu, Py3.8, but failing on all others.  It is working locally, windows with
-# Py3.9.  jit and njit both fail for different reasons.  Anyway, the slow part
-# is the tessellation of the points, not this actually CoM calculation
-# so I'm commenting out the decorator for now.
-# @njit
 def center_of_mass(simplices, points):
-    A = []
-    centroids = np.zeros((simplices.shape[0], points.shape[1]), dtype=np.float_)
-    for i, s in enumerate(simplices):
-        xy = points[s]
-        cen = np.sum(points[s], axis=0)/simplices.shape[1]
-        centroids[i, :] = cen.astype(np.float_)
-        if xy.shape[1] == 2:  # In 2D
-            # Use Heron's formula to find area of arbitrary triangle
-            a = np.sqrt((xy[0, 0] - xy[1, 0])**2 + (xy[0, 1] - xy[1, 1])**2)
-            b = np.sqrt((xy[1, 0] - xy[2, 0])**2 + (xy[1, 1] - xy[2, 1])**2)
-            c = np.sqrt((xy[2, 0] - xy[0, 0])**2 + (xy[2, 1] - xy[0, 1])**2)
-            s = (a + b + c)/2
-            temp = np.sqrt(s*(s-a)*(s-b)*(s-c))
-        else:
-            # Using formula from here: https://en.wikipedia.org/wiki/Tetrahedron
-            d = np.concatenate((xy.T, np.ones((1, 4))))  # In 3D
-            temp = np.abs(np.linalg.det(d))/6.0
-            # temp = 0
-        A.append(temp)
-    A = np.array(A, dtype=np.float_)
-    CoM = np.array([(centroids[:, i]*A/A.sum()*len(A)).mean()
-                    for i in range(centroids.shape[1])], dtype=np.float_)
+    r"""
+    Finds the center of mass of a set of triangles or tetrahedra
+
+    Parameters
+    ----------
+    simplices : ndarray
+        The indices into ``points`` of the corners of each simplex
+    points : ndarray
+        The coordinates of the corners
+
+    Returns
+    -------
+    CoM : ndarray
+        The centroid of each simplex weighted by its area/volume
+
+    """
+    xy = points[simplices]
+    centroids = xy.mean(axis=1)
+    # The area/volume is proportional to the determinant of the edge vectors
+    A = np.abs(np.linalg.det(xy[:, 1:] - xy[:, :1]))
+    CoM = (centroids*A[:, None]).sum(axis=0)/A.sum()
     return CoM
 
 
@@ -166,8 +166,9 @@ def trim_nodes(network, inds):
     edges = np.any(np.isin(network[edge_prefix+'.conns'], inds), axis=1)
     network = trim_edges(network, inds=edges)
     # Renumber conns
-    remapping = np.cumsum(keep) - 1
-    network[edge_prefix+'.conns'] = remapping[network[edge_prefix+'.conns']]
+    conns = network[edge_prefix+'.conns']
+    remapping = (np.cumsum(keep) - 1).astype(conns.dtype, copy=False)
+    network[edge_prefix+'.conns'] = remapping[conns]
     return network
 
 
@@ -1,5 +1,6 @@
+import os
 import numpy as np
-import scipy.sparse as sprs
+from concurrent.futures import ProcessPoolExecutor
 from scipy.sparse import csgraph
 from openpnm._skgraph.tools import conns_to_am, dict_to_am, dict_to_im
 from openpnm._skgraph.tools import istriu, isgtriu
@@ -16,6 +17,8 @@ __all__ = [
     'find_complementary_nodes',
     'find_complementary_edges',
     'find_path',
+    'find_shortest_paths',
+    'reconstruct_path',
     'find_coordination',
 ]
 
@@ -84,7 +87,8 @@ def find_complementary_nodes(network, inds, asmask=False):
         return np.arange(N)[mask]
 
 
-def find_connected_nodes(network, inds, flatten=True, logic='or'):
+def find_connected_nodes(network, inds, flatten=True, logic='or',
+                         ragged=False):
     r"""
     Finds which nodes are connected to a given set of edges
 
@@ -122,22 +126,32 @@ def find_connected_nodes(network, inds, flatten=True, logic='or'):
                 'and'.
         ======= ===============================================================
 
+    ragged : bool
+        If ``True`` the neighbors of each input edge are returned as a
+        ragged array in the form of an ``(indptr, indices)`` tuple, where the
+        neighbors of input ``i`` are ``indices[indptr[i]:indptr[i+1]]``.  This
+        is computed without any Python loops so is much faster than
+        ``flatten=False`` for large numbers of inputs, and overrides
+        ``flatten``.  The default is ``False``.
+
     Returns
     -------
     An array containing the connected sites, filtered by the given logic.  If
     ``flatten`` is ``False`` then the result is a list of lists containing the
     neighbors of each given input edge.  In this latter case, nodes that
     have been removed by the given logic are indicated by ``nans``, thus the
-    array is of type ``float`` and is not suitable for indexing.
+    array is of type ``float`` and is not suitable for indexing.  If
+    ``ragged`` is ``True`` the removed nodes are simply omitted from the
+    ``indices``.
 
     """
     if not isgtriu(network):
         raise Exception("This function is not implemented for directed networks")
     edges = np.array(inds, ndmin=1)
     if len(edges) == 0:  # Short-circuit this function if edges is empty
-        return []
-    am = dict_to_am(network)
-    neighbors = np.hstack((am.row[edges], am.col[edges]))
+        return _empty_ragged() if ragged else []
+    conns = network[get_edge_prefix(network)+'.conns']
+    neighbors = np.hstack((conns[edges, 0], conns[edges, 1]))
     if neighbors.size > 0:
         n_sites = np.amax(neighbors)
     if logic in ['or', 'union', 'any']:
@@ -147,18 +161,24 @@ def find_connected_nodes(network, inds, flatten=True, logic='or'):
     elif logic in ['xnor', 'nxor']:
         neighbors = np.unique(np.where(np.bincount(neighbors) > 1)[0])
     elif logic in ['and', 'all', 'intersection']:
-        temp = np.vstack((am.row[edges], am.col[edges])).T.tolist()
+        temp = conns[edges].tolist()
         temp = [set(pair) for pair in temp]
         neighbors = temp[0]
         [neighbors.intersection_update(pair) for pair in temp[1:]]
         neighbors = np.array(list(neighbors), dtype=np.int64, ndmin=1)
     else:
         raise Exception('Specified logic is not implemented')
+    if ragged:
+        vals = conns[edges].flatten().astype(np.int64)
+        mask = np.zeros(shape=n_sites + 1, dtype=bool)
+        mask[neighbors] = True
+        indptr = np.arange(0, 2*len(edges) + 1, 2)
+        return _mask_ragged(indptr, vals, mask[vals])
     if flatten is False:
         if neighbors.size:
             mask = np.zeros(shape=n_sites + 1, dtype=bool)
             mask[neighbors] = True
-            temp = np.hstack((am.row[edges], am.col[edges])).astype(np.int64)
+            temp = np.hstack((conns[edges, 0], conns[edges, 1])).astype(np.int64)
             temp[~mask[temp]] = -1
             inds = np.where(temp == -1)[0]
             if len(inds):
@@ -171,7 +191,8 @@ def find_connected_nodes(network, inds, flatten=True, logic='or'):
     return neighbors
 
 
-def find_neighbor_edges(network, inds, flatten=True, logic='or'):
+def find_neighbor_edges(network, inds, flatten=True, logic='or', im=None,
+                        ragged=False):
     r"""
     Finds all edges that are connected to the given input nodes
 
@@ -209,11 +230,25 @@ def find_neighbor_edges(network, inds, flatten=True, logic='or'):
                 'and'.
         ======= ===============================================================
 
+    im : scipy.sparse matrix, optional
+        The incidence matrix of the network, which is used when ``flatten``
+        is ``False`` or ``ragged`` is ``True``.  If not given it is generated
+        from ``network``, so it should be provided when available to save
+        time.
+    ragged : bool
+        If ``True`` the neighbors of each input node are returned as a
+        ragged array in the form of an ``(indptr, indices)`` tuple, where the
+        neighbors of input ``i`` are ``indices[indptr[i]:indptr[i+1]]``.  This
+        is computed without any Python loops so is much faster than
+        ``flatten=False`` for large numbers of inputs, and overrides
+        ``flatten``.  The default is ``False``.
+
     Returns
     -------
     An array containing the neighboring edges filtered by the given logic. If
     ``flatten`` is ``False`` then the result is a list of lists containing the
-    neighbors of each given input node.
+    neighbors of each given input node, or an ``(indptr, indices)`` tuple if
+    ``ragged`` is ``True``.
 
     Notes
     -----
@@ -224,20 +259,25 @@ def find_neighbor_edges(network, inds, flatten=True, logic='or'):
     if global sites are considered.
 
     """
-    if flatten == False:
-        im = dict_to_im(network)
+    if (flatten == False) or ragged:
+        if im is None:
+            im = dict_to_im(network)
         am = None
+    elif isgtriu(network):
+        am = None
+        im = None
     else:
         am = dict_to_am(network)
         im = None
     if im is not None:
-        if im.format != 'lil':
-            im = im.tolil(copy=False)
-        rows = [im.rows[i] for i in np.array(inds, ndmin=1, dtype=np.int64)]
-        if len(rows) == 0:
-            return []
-        neighbors = np.hstack(rows).astype(np.int64)
-        n_bonds = int(im.nnz / 2)
+        if im.format != 'csr':
+            im = im.tocsr()
+        nodes = np.array(inds, ndmin=1, dtype=np.int64)
+        if len(nodes) == 0:
+            return _empty_ragged() if ragged else []
+        indptr, vals = _gather_rows(im.indptr, im.indices, nodes)
+        neighbors = vals
+        n_bonds = im.shape[1]
         if logic in ['or', 'union', 'any']:
             neighbors = np.unique(neighbors)
         elif logic in ['xor', 'exclusive_or']:
@@ -246,31 +286,29 @@ def find_neighbor_edges(network, inds, flatten=True, logic='or'):
             neighbors = np.unique(np.where(np.bincount(neighbors) > 1)[0])
         elif logic in ['and', 'all', 'intersection']:
             neighbors = set(neighbors)
-            [neighbors.intersection_update(i) for i in rows]
+            [neighbors.intersection_update(i)
+             for i in np.split(vals, indptr[1:-1])]
             neighbors = np.array(list(neighbors), dtype=int, ndmin=1)
         else:
             raise Exception('Specified logic is not implemented')
-        if (flatten is False):
-            if (neighbors.size > 0):
-                mask = np.zeros(shape=n_bonds, dtype=bool)
-                mask[neighbors] = True
-                for i in range(len(rows)):
-                    vals = np.array(rows[i], dtype=np.int64)
-                    rows[i] = vals[mask[vals]]
-                neighbors = rows
-            else:
-                neighbors = [np.array([], dtype=np.int64) for i in range(len(inds))]
-        return neighbors
-    elif am is not None:
-        if am.format != 'coo':
-            am = am.tocoo(copy=False)
-        if flatten is False:
-            raise Exception('flatten cannot be used with an adjacency matrix')
-        if isgtriu(network):
-            am = sprs.triu(am, k=1)
-        Ps = np.zeros(am.shape[0], dtype=bool)
+        mask = np.zeros(shape=n_bonds, dtype=bool)
+        mask[neighbors] = True
+        indptr, vals = _mask_ragged(indptr, vals, mask[vals])
+        if ragged:
+            return indptr, vals
+        return np.split(vals, indptr[1:-1])
+    else:
+        if am is None:
+            # The graph is undirected so the edges are the upper triangle
+            conns = network[get_edge_prefix(network)+'.conns']
+            Np = network[get_node_prefix(network)+'.coords'].shape[0]
+        else:
+            if am.format != 'coo':
+                am = am.tocoo(copy=False)
+            conns = np.vstack((am.row, am.col)).T
+            Np = am.shape[0]
+        Ps = np.zeros(Np, dtype=bool)
         Ps[inds] = True
-        conns = np.vstack((am.row, am.col)).T
         if logic in ['or', 'union', 'any']:
             neighbors = np.any(Ps[conns], axis=1)
         elif logic in ['xor', 'exclusive_or']:
@@ -283,12 +321,10 @@ def find_neighbor_edges(network, inds, flatten=True, logic='or'):
             raise Exception('Specified logic is not implemented')
         neighbors = np.where(neighbors)[0]
         return neighbors
-    else:
-        raise Exception('Either the incidence or the adjacency matrix must be specified')
 
 
 def find_neighbor_nodes(network, inds, flatten=True, include_input=False,
-                        logic='or'):
+                        logic='or', am=None, ragged=False):
     r"""
     Finds all nodes that are directly connected to the input nodes
 
@@ -329,12 +365,25 @@ def find_neighbor_nodes(network, inds, flatten=True, include_input=False,
                 'and'.
         ======= ===============================================================
 
+    am : scipy.sparse matrix, optional
+        The adjacency matrix of the network.  If not given it is generated
+        from ``network``, so it should be provided when available to save
+        time.
+    ragged : bool
+        If ``True`` the neighbors of each input node are returned as a
+        ragged array in the form of an ``(indptr, indices)`` tuple, where the
+        neighbors of input ``i`` are ``indices[indptr[i]:indptr[i+1]]``.  This
+        is computed without any Python loops so is much faster than
+        ``flatten=False`` for large numbers of inputs, and overrides
+        ``flatten``.  The default is ``False``.
+
     Returns
     -------
     nodes : ndarray
         An array containing the neighboring nodes filtered by the given logic.  If
         ``flatten`` is ``False`` then the result is a list of lists containing the
-        neighbors of each input site.
+        neighbors of each input site, or an ``(indptr, indices)`` tuple if
+        ``ragged`` is ``True``.
 
     Notes
     -----
@@ -347,14 +396,17 @@ def find_neighbor_nodes(network, inds, flatten=True, include_input=False,
     nodes = np.array(inds, ndmin=1)
     # Short-circuit the function if the input list is already empty
     if len(nodes) == 0:
-        return []
-    am_coo = dict_to_am(g)
-    am = am_coo.tolil(copy=False)
-    rows = am.rows[nodes].tolist()
-    if len(rows) == 0:
-        return []
+        return _empty_ragged() if ragged else []
+    if am is None:
+        am = dict_to_am(g)
+    if am.format != 'csr':
+        am = am.tocsr()
     n_nodes = am.shape[0]
-    neighbors = am_coo.col[np.in1d(am_coo.row, nodes)]
+    if (logic in ['and', 'all', 'intersection']) or not flatten or ragged:
+        indptr, vals = _gather_rows(am.indptr, am.indices, nodes)
+    mask = np.zeros(shape=n_nodes, dtype=bool)
+    mask[nodes] = True
+    neighbors = am.indices[np.repeat(mask, np.diff(am.indptr))]
     if logic in ['or', 'union', 'any']:
         neighbors = np.unique(neighbors)
     elif logic in ['xor', 'exclusive_or']:
@@ -363,7 +415,8 @@ def find_neighbor_nodes(network, inds, flatten=True, include_input=False,
         neighbors = np.unique(np.where(np.bincount(neighbors) > 1)[0])
     elif logic in ['and', 'all', 'intersection']:
         neighbors = set(neighbors)
-        [neighbors.intersection_update(i) for i in rows]
+        [neighbors.intersection_update(i)
+         for i in np.split(vals, indptr[1:-1])]
         neighbors = np.array(list(neighbors), dtype=np.int64, ndmin=1)
     else:
         raise Exception('Specified logic is not implemented')
@@ -373,16 +426,13 @@ def find_neighbor_nodes(network, inds, flatten=True, include_input=False,
     if not include_input:
         mask[nodes] = False
     # Finally flatten or not
-    if flatten:
+    if flatten and not ragged:
         neighbors = np.where(mask)[0]
     else:
-        if neighbors.size > 0:
-            for i in range(len(rows)):
-                vals = np.array(rows[i], dtype=np.int64)
-                rows[i] = vals[mask[vals]]
-            neighbors = rows
-        else:
-            neighbors = [np.array([], dtype=int) for i in range(len(nodes))]
+        indptr, vals = _mask_ragged(indptr, vals, mask[vals])
+        if ragged:
+            return indptr, vals
+        neighbors = np.split(vals, indptr[1:-1])
     return neighbors
 
 
@@ -410,9 +460,10 @@ def find_connecting_edges(inds, network=None, am=None):
 
     Notes
     -----
-    The adjacency matrix is converted to the ``DOK`` format internally if
-    needed, so if this format is already available it should be provided to
-    save time.
+    If ``am`` is in ``CSR`` format with sorted indices the edges are found
+    by a binary search, otherwise it is converted to the ``DOK`` format
+    internally if needed, so if this format is already available it should
+    be provided to save time.
 
     """
     nodes = np.array(inds, ndmin=2)
@@ -429,6 +480,20 @@ def find_connecting_edges(inds, network=None, am=None):
         pass
     else:
         raise Exception('Either g or am must be provided')
+    if (am.format == 'csr') and am.has_sorted_indices:
+        # Each location has a unique key when the rows are laid end to end,
+        # and these are sorted so can be searched directly
+        N = am.shape[1]
+        rows = np.repeat(np.arange(am.shape[0]), np.diff(am.indptr))
+        keys = rows*N + am.indices
+        query = nodes[:, 0].astype(np.int64)*N + nodes[:, 1]
+        loc = np.clip(np.searchsorted(keys, query), 0, max(keys.size - 1, 0))
+        hits = keys[loc] == query if keys.size else np.zeros(len(query), bool)
+        if np.all(hits):
+            return am.data[loc]
+        neighbors = np.full(len(query), np.nan)
+        neighbors[hits] = am.data[loc[hits]]
+        return neighbors
     if am.format != 'dok':
         am = am.todok(copy=True)
     z = tuple(zip(nodes[:, 0], nodes[:, 1]))
@@ -546,36 +611,188 @@ def find_path(network, pairs, weights=None):
     Notes
     -----
     The shortest path is found using Dijkstra's algorithm included in the
-    ``scipy.sparse.csgraph`` module
+    ``scipy.sparse.csgraph`` module, which is run once for each unique
+    starting node.  If only the lengths of the paths are needed then
+    ``find_shortest_paths`` is much faster since it does not construct the
+    paths.
 
     """
-    am = dict_to_am(network)
-    if weights is not None:
-        am.data = np.ones_like(am.row, dtype=int)
-    pairs = np.array(pairs, ndmin=2)
-    paths = csgraph.dijkstra(csgraph=am, indices=pairs[:, 0],
-                             return_predecessors=True, min_only=False)[1]
-    if isgtriu(network):
-        am.data = np.hstack(2*[np.arange(am.data.size/2)]).astype(int)
-    else:
-        am.data = np.arange(am.data.size).astype(int)
-    dok = am.todok()
-    nodes = []
-    edges = []
-    for row in range(0, np.shape(pairs)[0]):
-        j = pairs[row][1]
-        ans = []
-        while paths[row][j] > -9999:
-            ans.append(j)
-            j = paths[row][j]
-        if len(ans) > 0:
-            ans.append(pairs[row][0])
-            ans.reverse()
-            nodes.append(np.array(ans, dtype=int))
-            keys = [tuple((ans[i], ans[i+1])) for i in range(len(ans)-1)]
-            temp = [dok[k] for k in keys]
-            edges.append(np.array(temp, dtype=int))
-        else:
-            nodes.append([])
-            edges.append([])
+    paths = find_shortest_paths(network=network, pairs=pairs, weights=weights)
+    nodes = [reconstruct_path(paths, i) for i in range(len(paths['lengths']))]
+    # Find the edges along all the paths at once
+    steps = [np.vstack((n[:-1], n[1:])).T for n in nodes]
+    edges = np.zeros(0, dtype=int)
+    if sum([len(i) for i in steps]):
+        edge_prefix = get_edge_prefix(network)
+        Nt = network[edge_prefix+'.conns'].shape[0]
+        am = dict_to_am(network, weights=np.arange(Nt)).tocsr()
+        am.sort_indices()
+        edges = find_connecting_edges(np.vstack(steps), am=am).astype(int)
+    edges = np.split(edges, np.cumsum([len(i) for i in steps])[:-1])
+    nodes = [n if len(n) else [] for n in nodes]
+    edges = [e if len(e) else [] for e in edges]
     return {'node_paths': nodes, 'edge_paths': edges}
+
+
+def find_shortest_paths(network, pairs, weights=None, cores=1):
+    r"""
+    Find the lengths of the shortest paths between many pairs of nodes
+
+    Parameters
+    ----------
+    network : dict
+        The network dictionary
+    pairs : array_like
+        An N x 2 array containing N pairs of nodes between which the shortest
+        path is sought
+    weights : ndarray, optional
+        The edge weights to use when traversing the path. If not provided
+        then 1's will be used.
+    cores : int, optional
+        The number of processes among which the unique starting nodes are
+        divided.  The default is 1, which does all the work in the current
+        process.  If ``None`` all available cores are used.
+
+    Returns
+    -------
+    paths : dict
+        A dictionary containing the following items:
+
+        ================ ======================================================
+        key              description
+        ================ ======================================================
+        'lengths'        The length of the shortest path between each pair,
+                         or ``inf`` if there is no path
+        'pairs'          The pairs of nodes as an N x 2 array
+        'sources'        The unique starting nodes
+        'predecessors'   An array with a row for each of the unique starting
+                         nodes, containing the previous node on the shortest
+                         path to each node from that starting node, or
+                         -9999 if there is none
+        'index'          The row of ``predecessors`` to use for each pair
+        ================ ======================================================
+
+    Notes
+    -----
+    Pairs are grouped by their starting node, so Dijkstra's algorithm is run
+    only once for each unique starting node however many pairs share it.
+    The paths themselves are not constructed, but can be obtained for any
+    of the pairs using ``reconstruct_path``.
+
+    The ``predecessors`` array is dense, with one ``int32`` entry for every
+    node per unique starting node, so it takes ``4*S*N`` bytes for ``S``
+    starting nodes in a network of ``N`` nodes (e.g. 4 GB for 1000 starting
+    nodes in a network of a million nodes).  Pairs that share a starting
+    node share a row, so grouping queries by their starting node keeps
+    this down.
+
+    Examples
+    --------
+    >>> import numpy as np
+    >>> from openpnm._skgraph.generators import cubic
+    >>> from openpnm._skgraph.queries import find_shortest_paths
+    >>> from openpnm._skgraph.queries import reconstruct_path
+    >>> g = cubic(shape=[4, 4, 1])
+    >>> paths = find_shortest_paths(g, pairs=[[0, 15], [0, 5], [3, 12]])
+    >>> print(paths['lengths'])
+    [6. 2. 6.]
+    >>> print(paths['sources'])
+    [0 3]
+    >>> print(len(reconstruct_path(paths, 0)))
+    7
+
+    """
+    pairs = np.array(pairs, dtype=int, ndmin=2).reshape(-1, 2)
+    am = dict_to_am(network, weights=weights).tocsr()
+    if pairs.shape[0] == 0:
+        return {'lengths': np.zeros(0), 'pairs': pairs,
+                'sources': np.zeros(0, dtype=int),
+                'predecessors': np.zeros((0, am.shape[0]), dtype=np.int32),
+                'index': np.zeros(0, dtype=int)}
+    sources, index = np.unique(pairs[:, 0], return_inverse=True)
+    index = index.ravel()
+    n = 1 if cores == 1 else min(cores or os.cpu_count(), sources.size)
+    chunks = np.array_split(np.arange(sources.size), max(n, 1))
+    # Each chunk of sources only returns the lengths of its own pairs
+    jobs = []
+    for rows in chunks:
+        hits = np.where(np.isin(index, rows))[0]
+        jobs.append((rows, hits, index[hits] - rows[0] if rows.size else 0))
+    args = [(am, sources[rows], loc, pairs[hits, 1])
+            for rows, hits, loc in jobs]
+    if n > 1:
+        with ProcessPoolExecutor(max_workers=n) as pool:
+            results = list(pool.map(_dijkstra, *zip(*args)))
+    else:
+        results = [_dijkstra(*a) for a in args]
+    lengths = np.full(pairs.shape[0], np.inf)
+    for (rows, hits, _), (L, _) in zip(jobs, results):
+        lengths[hits] = L
+    pred = np.vstack([r[1] for r in results]) if results else \
+        np.zeros((0, am.shape[0]), dtype=np.int32)
+    return {'lengths': lengths, 'pairs': pairs, 'sources': sources,
+            'predecessors': pred, 'index': index}
+
+
+def reconstruct_path(paths, i):
+    r"""
+    Constructs the path between one of the pairs of nodes given to
+    ``find_shortest_paths``
+
+    Parameters
+    ----------
+    paths : dict
+        The dictionary returned by ``find_shortest_paths``
+    i : int
+        The index of the pair whose path is required
+
+    Returns
+    -------
+    nodes : ndarray
+        The nodes along the path from the starting to the ending node,
+        which is empty if no path was found.
+
+    """
+    pred = paths['predecessors'][paths['index'][i]]
+    j = paths['pairs'][i][1]
+    ans = []
+    while pred[j] > -9999:
+        ans.append(j)
+        j = pred[j]
+    if len(ans) > 0:
+        ans.append(paths['pairs'][i][0])
+        ans.reverse()
+    return np.array(ans, dtype=int)
+
+
+def _dijkstra(am, sources, rows, targets):
+    # The predecessors from each source, and the path lengths of the pairs
+    # found in the given rows
+    dist, pred = csgraph.dijkstra(csgraph=am, indices=sources,
+                                  return_predecessors=True, min_only=False)
+    return dist[rows, targets], pred.astype(np.int32, copy=False)
+
+
+def _empty_ragged():
+    return np.zeros(1, dtype=np.int64), np.array([], dtype=np.int64)
+
+
+def _gather_rows(indptr, indices, rows):
+    # Collects the given rows of a CSR structure into a new (indptr, indices)
+    # pair by computing the location of every entry at once
+    rows = np.asarray(rows, dtype=np.int64)
+    starts = indptr[rows]
+    lengths = indptr[rows + 1] - starts
+    ptr = np.zeros(len(rows) + 1, dtype=np.int64)
+    np.cumsum(lengths, out=ptr[1:])
+    locs = np.arange(ptr[-1]) + np.repeat(starts - ptr[:-1], lengths)
+    return ptr, indices[locs].astype(np.int64)
+
+
+def _mask_ragged(indptr, indices, keep):
+    # Removes the entries of a ragged array where keep is False
+    n = indptr.size - 1
+    seg = np.repeat(np.arange(n), np.diff(indptr))
+    ptr = np.zeros(n + 1, dtype=np.int64)
+    np.cumsum(np.bincount(seg[keep], minlength=n), out=ptr[1:])
+    return ptr, indices[keep]
@@ -8,6 +8,7 @@ __all__ = [
     'qupc_update',
     'qupc_compress',
     'qupc_reduce',
+    'qupc_find',
 ]
 
 
@@ -29,6 +30,15 @@ def qupc_update(arr, ind, val):
     return arr
 
 
+@njit
+def qupc_find(arr, ind):
+    # Follow the chain to the root, halving its length along the way
+    while arr[ind] != ind:
+        arr[ind] = arr[arr[ind]]
+        ind = arr[ind]
+    return ind
+
+
 def qupc_compress(arr):
     temp = rankdata(arr, method='dense')
     arr[:] = temp
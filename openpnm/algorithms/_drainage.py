@@ -1,4 +1,5 @@
 import numpy as np
+from numba import njit
 from tqdm.auto import tqdm
 from collections import namedtuple
 from openpnm.algorithms import Algorithm
@@ -8,6 +9,11 @@ from openpnm._skgraph.simulations import (
     site_percolation,
     find_connected_clusters,
 )
+from openpnm._skgraph.queries import (
+    qupc_initialize,
+    qupc_update,
+    qupc_find,
+)
 
 
 docstr = Docorator()
@@ -148,28 +154,66 @@ class Drainage(Algorithm):
         ----------
         pressures : int or ndarray
             The number of pressue steps to apply, or an array of specific
-            points
+            points.  If a number is given, the pressures span the range of
+            the throat entry pressures, ignoring any NaNs.
+
+        Notes
+        -----
+        Rather than finding the invaded clusters at each pressure, the
+        lowest pressure at which each throat and pore becomes connected to
+        the inlets is found in a single sweep through the throats in order
+        of entry pressure, using a union-find structure.  Each location is
+        then assigned the first of the given pressures at which it is
+        invaded.
 
         """
         if isinstance(pressures, int):
             phase = self.project[self.settings.phase]
-            hi = 1.25*phase[self.settings.throat_entry_pressure].max()
-            low = 0.80*phase[self.settings.throat_entry_pressure].min()
-            pressures = np.logspace(np.log10(low), np.log10(hi), pressures)
-        pressures = np.array(pressures, ndmin=1)
-        msg = 'Performing drainage simulation'
-        for i, p in enumerate(tqdm(pressures, msg)):
-            self._run_special(p)
-            pmask = self['pore.invaded'] * (self['pore.invasion_pressure'] == np.inf)
-            self['pore.invasion_pressure'][pmask] = p
-            self['pore.invasion_sequence'][pmask] = i
-            tmask = self['throat.invaded'] * (self['throat.invasion_pressure'] == np.inf)
-            self['throat.invasion_pressure'][tmask] = p
-            self['throat.invasion_sequence'][tmask] = i
+            entry = phase[self.settings.throat_entry_pressure]
+            # Throats with NaN entry pressures are never invaded, and if
+            # there are no others then nothing can be invaded
+            entry = entry[~np.isnan(entry)]
+            if entry.size == 0:
+                pressures = []
+            else:
+                hi = 1.25*entry.max()
+                low = 0.80*entry.min()
+                pressures = np.logspace(np.log10(low), np.log10(hi), pressures)
+        pressures = np.array(pressures, ndmin=1, dtype=float)
+        if np.any(np.isnan(pressures)):
+            raise Exception('The given pressures must not contain NaNs')
+        Pt, Tt = self._find_thresholds()
+        # The first pressure in the list exceeding each threshold
+        pmax = np.maximum.accumulate(pressures)
+        for element, thresh in [('pore', Pt), ('throat', Tt)]:
+            seq = np.searchsorted(pmax, thresh, side='left')
+            mask = (seq < pressures.size) \
+                * (self[element + '.invasion_pressure'] == np.inf)
+            self[element + '.invaded'][mask] = True
+            self[element + '.invasion_pressure'][mask] = pressures[seq[mask]]
+            self[element + '.invasion_sequence'][mask] = seq[mask]
         # If any outlets were specified, evaluate trapping
         if np.any(self['pore.bc.outlet']):
             self.apply_trapping()
 
+    def _find_thresholds(self):
+        r"""
+        Finds the lowest pressure at which each pore and throat is invaded,
+        being the smallest possible maximum entry pressure along a path of
+        throats leading to it from the inlets
+        """
+        phase = self.project[self.settings.phase]
+        entry = np.array(phase[self.settings.throat_entry_pressure],
+                         dtype=float)
+        conns = self.network.conns
+        Ts = np.where(~np.isnan(entry))[0]
+        order = Ts[np.argsort(entry[Ts], kind='stable')]
+        Tt = _invasion_thresholds(conns, order, entry, self['pore.bc.inlet'])
+        Pt = np.full(self.Np, np.inf)
+        np.minimum.at(Pt, conns[:, 0], Tt)
+        np.minimum.at(Pt, conns[:, 1], Tt)
+        return Pt, Tt
+
     def _run_special(self, pressure):
         phase = self.project[self.settings.phase]
         Tinv = phase[self.settings.throat_entry_pressure] <= pressure
@@ -201,41 +245,42 @@ class Drainage(Algorithm):
 
         Notes
         -----
-        This search proceeds by the following 3 steps:
-
-        1. A site percolation is applied to *uninvaded* pores and they are set
-        to trapped if they belong to a cluster that is not connected to the
-        outlets.
+        This search proceeds by the following 2 steps:
 
-        2. All throats which were invaded at a pressure *higher* than either
+        1. All throats which were invaded at a pressure *higher* than both
         of its two neighboring pores are set to trapped, regardless of
         whether the pores themselves are trapped.
 
-        3. All throats which are connected to trapped pores are set to trapped
-        as these cannot be invaded since the fluid they contain cannot escape.
+        2. The pores are added to a union-find structure in order of
+        *decreasing* invasion pressure, so that after each pressure level has
+        been added the clusters are those of the defending phase just before
+        that level was invaded.  A pore is trapped if its cluster is not
+        connected to the outlets at this point, and so is a throat if the
+        neighboring pore with the higher invasion pressure is trapped, since
+        the fluid it contains cannot escape.
+
+        This gives the same result as a site percolation on the uninvaded
+        pores at each invasion pressure, but requires only a single sweep.
 
         """
         pseq = self['pore.invasion_pressure']
         tseq = self['throat.invasion_pressure']
+        conns = self.network.conns
         # Firstly, find any throats who were invaded at a pressure higher than
-        # either of its two neighboring pores
-        temp = (pseq[self.network.conns].T > tseq).T
+        # both of its two neighboring pores
+        temp = (pseq[conns].T > tseq).T
         self['throat.trapped'][np.all(temp, axis=1)] = True
-        # Now scan through and use site percolation to find other trapped
-        # clusters of pores
-        for p in np.unique(pseq):
-            s, b = site_percolation(conns=self.network.conns,
-                                    occupied_sites=pseq > p)
-            # Identify cluster numbers connected to the outlets
-            clusters = np.unique(s[self['pore.bc.outlet']])
-            # Find ALL throats connected to any trapped site, since these
-            # throats must also be trapped, and update their cluster numbers
-            Ts = self.network.find_neighbor_throats(pores=s >= 0)
-            b[Ts] = np.amax(s[self.network.conns], axis=1)[Ts]
-            # Finally, mark pores and throats as trapped if their cluster
-            # numbers are NOT connected to the outlets
-            self['pore.trapped'] += np.isin(s, clusters, invert=True)*(s >= 0)
-            self['throat.trapped'] += np.isin(b, clusters, invert=True)*(b >= 0)
+        # Now sweep backwards through the invasion to find the pores which
+        # were cut off from the outlets before being invaded
+        am = self.network.get_adjacency_matrix(fmt='csr')
+        order = np.argsort(-pseq, kind='stable')
+        trapped = _find_trapped_pores(pseq, order, am.indices, am.indptr,
+                                      self['pore.bc.outlet'])
+        self['pore.trapped'] += trapped
+        # Each throat is trapped along with its neighbor that was invaded last
+        hi = np.where(pseq[conns[:, 0]] >= pseq[conns[:, 1]], conns[:, 0],
+                      conns[:, 1])
+        self['throat.trapped'] += trapped[hi]
         # Use the identified trapped pores and throats to update the other
         # data on the object accordingly
         # self['pore.trapped'][self['pore.residual']] = False
@@ -270,6 +315,86 @@ class Drainage(Algorithm):
         return data
 
 
+@njit
+def _invasion_thresholds(conns, order, entry, inlets):
+    # Adds the throats in the given order while recording how the clusters
+    # merge as a tree, in which the nodes above the pores each correspond to
+    # a throat that joined two clusters
+    Np, Nt = inlets.size, conns.shape[0]
+    roots = qupc_initialize(Np)
+    node = np.arange(Np)
+    parent = -np.ones(2*Np, dtype=np.int_)
+    time = np.full(2*Np, -np.inf)
+    has_inlet = np.zeros(2*Np, dtype=np.bool_)
+    has_inlet[:Np] = inlets
+    anchor = -np.ones(Nt, dtype=np.int_)
+    n = Np
+    for t in order:
+        a = qupc_find(roots, conns[t, 0])
+        b = qupc_find(roots, conns[t, 1])
+        if a != b:
+            parent[node[a]] = n
+            parent[node[b]] = n
+            time[n] = entry[t]
+            has_inlet[n] = has_inlet[node[a]] or has_inlet[node[b]]
+            qupc_update(roots, b, a)
+            node[a] = n
+            n += 1
+        anchor[t] = node[a]
+    # A cluster is connected to the inlets from the time it first contained
+    # one, which is inherited from the cluster it later merged into if not
+    connected = np.full(n, np.inf)
+    for i in range(n - 1, -1, -1):
+        if has_inlet[i]:
+            connected[i] = time[i]
+        elif parent[i] >= 0:
+            connected[i] = connected[parent[i]]
+    thresh = np.full(Nt, np.inf)
+    for t in order:
+        thresh[t] = max(entry[t], connected[anchor[t]])
+    return thresh
+
+
+@njit
+def _find_trapped_pores(pseq, order, indices, indptr, outlets):
+    # Adds the pores in order of decreasing invasion pressure, one pressure
+    # level at a time, and checks which of the newly added pores belong to
+    # a cluster without an outlet.  The pores invaded at the lowest pressure
+    # are never defended by a cluster of their own so cannot be trapped.
+    # Pores with NaN pressures are each added on their own and never trapped.
+    Np = pseq.size
+    roots = qupc_initialize(Np)
+    added = np.zeros(Np, dtype=np.bool_)
+    has_outlet = outlets.copy()
+    trapped = np.zeros(Np, dtype=np.bool_)
+    pmin = np.inf
+    for k in range(Np):
+        if pseq[k] < pmin:
+            pmin = pseq[k]
+    i = 0
+    while i < Np:
+        p = pseq[order[i]]
+        added[order[i]] = True
+        j = i + 1
+        while j < Np and pseq[order[j]] == p:
+            added[order[j]] = True
+            j += 1
+        for k in range(i, j):
+            a = order[k]
+            for n in indices[indptr[a]:indptr[a+1]]:
+                if added[n]:
+                    ra = qupc_find(roots, a)
+                    rn = qupc_find(roots, n)
+                    if ra != rn:
+                        has_outlet[ra] = has_outlet[ra] or has_outlet[rn]
+                        qupc_update(roots, rn, ra)
+        if p > pmin:
+            for k in range(i, j):
+                trapped[order[k]] = not has_outlet[qupc_find(roots, order[k])]
+        i = j
+    return trapped
+
+
 # %%
 # def run_examples():
 if __name__ == '__main__':
@@ -1,5 +1,4 @@
 import logging
-import heapq as hq
 import numpy as np
 from numba import njit, jit
 from tqdm.auto import tqdm
@@ -14,6 +13,7 @@ from openpnm._skgraph.queries import (
     qupc_initialize,
     qupc_update,
     qupc_reduce,
+    qupc_find,
 )
 
 
@@ -41,12 +41,17 @@ class IPSettings:
         The dictionary key for the throat volume array
     entry_pressure : str
         The dictionary key for the throat capillary pressure
+    trapping : bool
+        If ``True`` the defending phase is treated as incompressible, so
+        any cluster of it which is cut off from the outlets is not invaded.
+        The outlets must be specified before ``run`` is first called.
 
     """
     phase = ''
     pore_volume = 'pore.volume'
     throat_volume = 'throat.volume'
     entry_pressure = 'throat.entry_pressure'
+    trapping = False
 
 
 class InvasionPercolation(Algorithm):
@@ -83,6 +88,7 @@ class InvasionPercolation(Algorithm):
         self['throat.invasion_sequence'] = -1
         self['pore.trapped'] = False
         self['throat.trapped'] = False
+        self._queue = None
         # self['pore.residual'] = False
         # self['throat.residual'] = False
 
@@ -187,43 +193,98 @@ class InvasionPercolation(Algorithm):
         """
         self.set_BC(pores=pores, bcvalues=True, bctype='outlet', mode=mode)
 
-    def run(self):
+    def run(self, n_steps=None, pressure=None, saturation=None):
         r"""
         Performs the algorithm for the given number of steps
 
+        Parameters
+        ----------
+        n_steps : int, optional
+            The maximum number of throats to invade.  If not given then the
+            invasion continues until one of the other criteria is met or all
+            accessible throats have been invaded.
+        pressure : float, optional
+            The capillary pressure at which to stop, so that only throats
+            with an entry pressure at or below this value are invaded
+        saturation : float, optional
+            The saturation of the invading phase at which to stop.  The
+            invasion stops as soon as this value is reached or exceeded.
+
+        Notes
+        -----
+        The queue of accessible throats is kept between calls, so each call
+        resumes the invasion from where the previous one stopped.  Calling
+        ``reset`` or ``set_inlet_BC`` starts a new invasion, which is also
+        required if the entry pressures of the phase have changed.
+
+        If ``settings['trapping']`` is ``True`` then pores and throats are
+        marked as trapped as soon as the defending phase they contain is cut
+        off from the outlets, and they are skipped by the invasion.  The
+        invasion sequence then remains contiguous, and ``apply_trapping``
+        is not needed.
+
         """
-        # Setup arrays and info
-        # TODO: This should be called conditionally so that it doesn't
-        # overwrite existing data when doing a few steps at a time
-        self._run_setup()
-        n_steps = np.inf
-
-        # Create incidence matrix for use in _run_accelerated which is jit
-        im = self.network.create_incidence_matrix(fmt='csr')
-
-        # Perform initial analysis on input pores
-        Ts = self.project.network.find_neighbor_throats(pores=self['pore.bc.inlet'])
-        t_start = self['throat.order'][Ts]
-        t_inv, p_inv, p_inv_t = \
+        # Setup arrays and info on the first call only so that further calls
+        # continue the existing invasion
+        if self._queue is None:
+            self._run_setup()
+        t_entry = self['throat.entry_pressure']
+        t_inv = self['throat.invasion_sequence']
+        p_inv = self['pore.invasion_sequence']
+        n_steps = self.Nt if n_steps is None else int(n_steps)
+        max_rank = self.Nt
+        if pressure is not None:
+            max_rank = np.searchsorted(t_entry[self['throat.sorted']],
+                                       pressure, side='right')
+        # Track the invaded volume only when it is needed as a criterion
+        Vp = Vt = np.zeros(0, dtype=float)
+        vol, max_vol = 0.0, np.inf
+        if saturation is not None:
+            net = self.project.network
+            Vp = net[self.settings['pore_volume']]
+            Vt = net[self.settings['throat_volume']]
+            tot_vol = np.sum(Vp) + np.sum(Vt)
+            Vp, Vt = Vp/tot_vol, Vt/tot_vol
+            vol = np.sum(Vp[p_inv >= 0]) + np.sum(Vt[t_inv >= 0])
+            max_vol = float(saturation)
+
+        # Fetch incidence matrix for use in _run_accelerated which is jit
+        im = self.network.get_incidence_matrix(fmt='csr')
+        self._queue_size, count = \
             _run_accelerated(
-                t_start=t_start,
+                queue=self._queue,
+                size=self._queue_size,
                 t_sorted=self['throat.sorted'],
                 t_order=self['throat.order'],
-                t_inv=self['throat.invasion_sequence'],
-                p_inv=self['pore.invasion_sequence'],
-                p_inv_t=np.zeros_like(self['pore.invasion_sequence']),
+                t_inv=t_inv,
+                p_inv=p_inv,
                 conns=self.project.network['throat.conns'],
                 idx=im.indices,
                 indptr=im.indptr,
-                n_steps=n_steps)
-
-        # Transfer results onto algorithm object
-        self['throat.invasion_sequence'] = t_inv
-        self['pore.invasion_sequence'] = p_inv
-        self['throat.invasion_pressure'] = self['throat.entry_pressure']
-        self['pore.invasion_pressure'] = self['throat.entry_pressure'][p_inv_t]
+                count=max(t_inv.max(), 0) + 1,
+                n_steps=n_steps,
+                max_rank=max_rank,
+                Vp=Vp,
+                Vt=Vt,
+                vol=float(vol),
+                max_vol=max_vol,
+                trapping=self.settings['trapping'],
+                p_trapped=self['pore.trapped'],
+                t_trapped=self['throat.trapped'],
+                trap_ptr=self._trap_ptr,
+                trap_pores=self._trap_pores)
+
+        # Transfer results onto algorithm object.  Each pore was invaded by
+        # the throat with the same invasion sequence number.
+        Ts = np.where(t_inv > 0)[0]
+        t_seq = np.zeros(count, dtype=int)
+        t_seq[t_inv[Ts]] = Ts
+        Ps = p_inv > 0
+        self['throat.invasion_pressure'] = np.where(t_inv >= 0, t_entry, np.inf)
+        self['pore.invasion_pressure'] = np.inf
+        self['pore.invasion_pressure'][Ps] = t_entry[t_seq[p_inv[Ps]]]
         # Set invasion pressure of inlets to 0
-        self['pore.invasion_pressure'][self['pore.invasion_sequence'] == 0] = 0.0
+        self['pore.invasion_pressure'][p_inv == 0] = 0.0
         # Set invasion sequence and pressure of any residual pores/throats to 0
         # self['throat.invasion_sequence'][self['throat.residual']] = 0
         # self['pore.invasion_sequence'][self['pore.residual']] = 0
@@ -243,6 +304,72 @@ class InvasionPercolation(Algorithm):
         self['throat.sorted'] = np.argsort(self['throat.entry_pressure'], axis=0)
         self['throat.order'] = 0
         self['throat.order'][self['throat.sorted']] = np.arange(0, self.Nt)
+        # Start the queue with the throats connected to the inlets.  A sorted
+        # array is a valid heap, and each throat can be added at most once
+        # from each of its pores so the queue can never hold more than 2*Nt.
+        Ts = self.network.find_neighbor_throats(pores=self['pore.bc.inlet'])
+        self._queue = np.zeros(2*self.Nt, dtype=int)
+        self._queue[:Ts.size] = np.sort(self['throat.order'][Ts])
+        self._queue_size = Ts.size
+        self._trap_ptr = np.zeros(self.Np + 1, dtype=int)
+        self._trap_pores = np.zeros(0, dtype=int)
+        if self.settings['trapping']:
+            self._trapping_setup()
+
+    def _trapping_setup(self):
+        # Union-find can merge clusters but not split them, so the clusters
+        # of defending phase are instead tracked backwards through a full
+        # invasion without trapping.  Invading a trapped cluster only opens
+        # throats into that cluster, so the remaining pores are invaded in
+        # the same order whether or not trapped clusters are skipped.
+        if not np.any(self['pore.bc.outlet']):
+            raise Exception('Outlets must be specified when trapping is enabled')
+        im = self.network.get_incidence_matrix(fmt='csr')
+        p_inv = np.copy(self['pore.invasion_sequence'])
+        _run_accelerated(
+            queue=np.copy(self._queue),
+            size=self._queue_size,
+            t_sorted=self['throat.sorted'],
+            t_order=self['throat.order'],
+            t_inv=np.copy(self['throat.invasion_sequence']),
+            p_inv=p_inv,
+            conns=self.network['throat.conns'],
+            idx=im.indices,
+            indptr=im.indptr,
+            count=1,
+            n_steps=self.Nt,
+            max_rank=self.Nt,
+            Vp=np.zeros(0, dtype=float),
+            Vt=np.zeros(0, dtype=float),
+            vol=0.0,
+            max_vol=np.inf,
+            trapping=False,
+            p_trapped=self['pore.trapped'],
+            t_trapped=self['throat.trapped'],
+            trap_ptr=self._trap_ptr,
+            trap_pores=self._trap_pores)
+        pseq = np.where(p_inv < 0, np.inf, p_inv)
+        am = self.network.get_adjacency_matrix(fmt='csr')
+        order = np.argsort(-pseq, kind='stable')
+        trap_by = _find_trap_events(pseq, order, am.indices, am.indptr,
+                                    self['pore.bc.outlet'])
+        # Pores which are never reached can not be trapped, and pores cut off
+        # by the inlets are trapped from the start
+        trap_by[~np.isfinite(pseq) | (p_inv == 0)] = -1
+        hits = (trap_by >= 0) & (trap_by < self.Np)
+        hits[hits] = p_inv[trap_by[hits]] == 0
+        trap_by[hits] = self.Np
+        Ps = np.where(trap_by == self.Np)[0]
+        self['pore.trapped'][Ps] = True
+        Ts = self.network.find_neighbor_throats(pores=Ps)
+        self['throat.trapped'][Ts] = True
+        # Group the remaining pores by the pore whose invasion traps them
+        Ps = np.where((trap_by >= 0) & (trap_by < self.Np))[0]
+        Ps = Ps[np.argsort(trap_by[Ps], kind='stable')]
+        self._trap_pores = Ps
+        self._trap_ptr = np.zeros(self.Np + 1, dtype=int)
+        np.cumsum(np.bincount(trap_by[Ps], minlength=self.Np),
+                  out=self._trap_ptr[1:])
 
     def pc_curve(self):
         r"""
@@ -304,7 +431,7 @@ class InvasionPercolation(Algorithm):
 
         """
         outlets = np.where(self['pore.bc.outlet'])[0]
-        am = self.network.create_adjacency_matrix(fmt='csr')
+        am = self.network.get_adjacency_matrix(fmt='csr')
         inv_seq = self['pore.invasion_sequence']
         self['pore.trapped'] = _find_trapped_pores(inv_seq, am.indices,
                                                    am.indptr, outlets)
@@ -415,58 +542,162 @@ def _find_trapped_pores(inv_seq, indices, indptr, outlets):  # pragma: no cover
 
 
 @njit
-def _run_accelerated(t_start, t_sorted, t_order, t_inv, p_inv, p_inv_t,
-                     conns, idx, indptr, n_steps):  # pragma: no cover
+def _heap_push(heap, size, item):  # pragma: no cover
+    # Adds item to the binary heap stored in heap[:size]
+    i = size
+    while i > 0:
+        parent = (i - 1) >> 1
+        if heap[parent] <= item:
+            break
+        heap[i] = heap[parent]
+        i = parent
+    heap[i] = item
+    return size + 1
+
+
+@njit
+def _heap_pop(heap, size):  # pragma: no cover
+    # Removes and returns the smallest item from the binary heap in heap[:size]
+    top = heap[0]
+    size -= 1
+    item = heap[size]
+    i = 0
+    while True:
+        c = 2*i + 1
+        if c >= size:
+            break
+        if (c + 1 < size) and (heap[c + 1] < heap[c]):
+            c += 1
+        if heap[c] >= item:
+            break
+        heap[i] = heap[c]
+        i = c
+    heap[i] = item
+    return top, size
+
+
+@njit
+def _find_trap_events(pseq, order, indices, indptr, outlets):  # pragma: no cover
+    # Adds the pores in reverse order of invasion while tracking which
+    # clusters contain an outlet.  When a cluster without an outlet merges
+    # with one that has an outlet, its pores were cut off from the outlets
+    # by the invasion of the pore being added.  Each cluster keeps a linked
+    # list of its pores starting from its root so these can be found.
+    # Pores whose cluster never reaches an outlet are given Np.
+    Np = pseq.size
+    roots = qupc_initialize(Np)
+    added = np.zeros(Np, dtype=np.bool_)
+    has_outlet = outlets.copy()
+    nxt = -np.ones(Np, dtype=np.int_)
+    tail = np.arange(Np)
+    trap_by = -np.ones(Np, dtype=np.int_)
+    i = 0
+    while i < Np:
+        p = pseq[order[i]]
+        j = i
+        while j < Np and pseq[order[j]] == p:
+            added[order[j]] = True
+            j += 1
+        for k in range(i, j):
+            a = order[k]
+            for n in indices[indptr[a]:indptr[a+1]]:
+                if not added[n]:
+                    continue
+                ra = qupc_find(roots, a)
+                rn = qupc_find(roots, n)
+                if ra == rn:
+                    continue
+                if has_outlet[ra] != has_outlet[rn]:
+                    m = rn if has_outlet[ra] else ra
+                    while m >= 0:
+                        if pseq[m] > p:
+                            trap_by[m] = a
+                        m = nxt[m]
+                nxt[tail[ra]] = rn
+                tail[ra] = tail[rn]
+                has_outlet[ra] = has_outlet[ra] or has_outlet[rn]
+                qupc_update(roots, rn, ra)
+        i = j
+    for m in range(Np):
+        if not has_outlet[qupc_find(roots, m)]:
+            trap_by[m] = Np
+    return trap_by
+
+
+@njit
+def _run_accelerated(queue, size, t_sorted, t_order, t_inv, p_inv, conns,
+                     idx, indptr, count, n_steps, max_rank, Vp, Vt, vol,
+                     max_vol, trapping, p_trapped, t_trapped, trap_ptr,
+                     trap_pores):  # pragma: no cover
     r"""
     Numba-jitted run method for InvasionPercolation class.
 
     Notes
     -----
+    ``queue`` is a binary heap of the ranks of the accessible throats in
+    ``queue[:size]``, which is updated in place so that the invasion can be
+    resumed by a later call.  The updated ``size`` and the next invasion
+    sequence number are returned.
+
     ``idx`` and ``indptr`` are properties are the network's incidence
     matrix, and are used to quickly find neighbor throats.
 
     Numba doesn't like foreign data types (i.e. Network), and so
     ``find_neighbor_throats`` method cannot be called in a jitted method.
 
-    Nested wrapper is for performance issues (reduced OpenPNM import)
-    time due to local numba import
+    The invasion stops after ``n_steps`` throats, before invading a throat
+    whose rank is ``max_rank`` or higher, or once the invaded volume ``vol``
+    reaches ``max_vol``.  The volumes are only tracked if ``Vp`` and ``Vt``
+    are not empty.
+
+    If ``trapping`` is ``True`` then throats marked in ``t_trapped`` are not
+    invaded.  Throats are marked as soon as both of their pores have been
+    invaded, and the pores ``trap_pores[trap_ptr[p]:trap_ptr[p+1]]`` and
+    their throats are marked once pore ``p`` has been invaded.
 
     """
-    # TODO: The following line is supposed to be numba's new list, but the
-    # heap does not work with this
-    # queue = List(t_start)
-    queue = list(t_start)
-    hq.heapify(queue)
-    count = 1
-    while count < (n_steps + 1):
+    track = Vp.size > 0
+    stop = count + n_steps
+    while (size > 0) and (count < stop):
         # Find throat at the top of the queue
-        t = hq.heappop(queue)
+        t = queue[0]
+        if (t >= max_rank) or (vol >= max_vol):
+            break
+        t, size = _heap_pop(queue, size)
         # Extract actual throat number
         t_next = t_sorted[t]
-        t_inv[t_next] = count
         # If throat is duplicated
-        while len(queue) > 0 and queue[0] == t:
-            _ = hq.heappop(queue)
-        # Find pores connected to newly invaded throat from am in coo format
-        Ps = conns[t_next]
-        # Remove already invaded pores from Ps
-        Ps = Ps[p_inv[Ps] < 0]
+        while (size > 0) and (queue[0] == t):
+            _, size = _heap_pop(queue, size)
+        if trapping and t_trapped[t_next]:
+            continue
+        t_inv[t_next] = count
+        if track:
+            vol += Vt[t_next]
         # If either of the neighboring pores are uninvaded (-1), set it to
-        # invaded and add its neighboring throats to the queue
-        if len(Ps) > 0:
-            p_inv[Ps] = count
-            p_inv_t[Ps] = t_next
-            for i in Ps:
-                # Get neighboring throat numbers from im in csr format
-                Ts = idx[indptr[i]:indptr[i+1]]
-                # Keep only throats which are uninvaded
-                Ts = Ts[t_inv[Ts] < 0]
-            for i in Ts:  # Add throat to the queue
-                hq.heappush(queue, t_order[i])
+        # invaded and add its neighboring uninvaded throats to the queue
+        for p in conns[t_next]:
+            if p_inv[p] < 0:
+                p_inv[p] = count
+                if track:
+                    vol += Vp[p]
+                for i in idx[indptr[p]:indptr[p+1]]:
+                    if t_inv[i] < 0:
+                        # With trapping, a throat whose other pore has been
+                        # invaded holds defending phase which can't escape
+                        other = conns[i, 0] + conns[i, 1] - p
+                        if trapping and (t_trapped[i] or p_inv[other] >= 0):
+                            t_trapped[i] = True
+                        else:
+                            size = _heap_push(queue, size, t_order[i])
+                if trapping:
+                    for q in trap_pores[trap_ptr[p]:trap_ptr[p+1]]:
+                        p_trapped[q] = True
+                        for i in idx[indptr[q]:indptr[q+1]]:
+                            if t_inv[i] < 0:
+                                t_trapped[i] = True
         count += 1
-        if len(queue) == 0:
-            break
-    return t_inv, p_inv, p_inv_t
+    return size, count
 
 
 # %%
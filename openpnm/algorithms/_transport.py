@@ -1,6 +1,6 @@
 import logging
 import numpy as np
-import scipy.sparse.csgraph as spgr
+import scipy.sparse as sprs
 from openpnm.topotools import is_fully_connected
 from openpnm.algorithms import Algorithm
 from openpnm.utils import Docorator, TypedSet, Workspace
@@ -109,9 +109,21 @@ class Transport(Algorithm):
             self._pure_A = None
         if self._pure_A is None:
             phase = self.project[self.settings.phase]
-            g = phase[gvals]
-            am = self.network.create_adjacency_matrix(weights=g, fmt='coo')
-            self._pure_A = spgr.laplacian(am).astype(float)
+            g = np.array(phase[gvals], dtype=float)
+            network = self.network
+            Np, Nt = network.Np, network.Nt
+            if g.shape == (Nt, ):
+                g = np.vstack((g, g)).T
+            elif g.shape == (2*Nt, ):
+                g = g.reshape((2, Nt)).T
+            # Assemble the Laplacian directly from the stored sparsity
+            # pattern, with column sums on the diagonal (as per csgraph)
+            rows, cols = network._get_topology('laplacian')
+            conns = network.conns
+            diag = np.bincount(conns[:, 1], weights=g[:, 0], minlength=Np) \
+                + np.bincount(conns[:, 0], weights=g[:, 1], minlength=Np)
+            data = np.concatenate((-g[:, 0], -g[:, 1], diag))
+            self._pure_A = sprs.coo_matrix((data, (rows, cols)), shape=(Np, Np))
         self.A = self._pure_A.copy()
 
     def _build_b(self):
@@ -1,6 +1,7 @@
 import numpy as np
 import logging
 import uuid
+import itertools
 from copy import deepcopy
 from openpnm.core import (
     LabelMixin,
@@ -15,12 +16,17 @@ from openpnm.utils import (
     Docorator,
     get_printable_props,
     get_printable_labels,
+    is_compact,
 )
+from openpnm.utils._compact import _state, _uniform_value, uniform_inputs
 
 
 docstr = Docorator()
 logger = logging.getLogger(__name__)
 ws = Workspace()
+# Source of the write versions of stored arrays, which is shared by all
+# objects so that a version number is never reused, see _get_version
+_write_count = itertools.count(1)
 
 
 __all__ = [
@@ -62,6 +68,14 @@ class Base2(dict):
         # use it before calling super.__init__()
         instance.settings = SettingsAttr()
         instance.settings['uuid'] = str(uuid.uuid4())
+        # The version of each stored array, which changes whenever the array
+        # is written, so that data derived from it can be cached
+        instance._versions = {}
+        # Cache of integer indices for each label, see _get_domain_indices
+        instance._domain_index = {}
+        # Maps each prefix of the stored keys (e.g. 'pore.mole_fraction') to
+        # the keys nested below it, so that nested lookups do not scan all keys
+        instance._prefix_index = {}
         return instance
 
     def __init__(self, network=None, project=None, name='obj_?'):
@@ -104,7 +118,7 @@ class Base2(dict):
         if '@' in key:
             element, prop = key.split('@')[0].split('.', 1)
             domain = key.split('@')[1]
-            locs = super().__getitem__(f'{element}.{domain}')
+            locs = self._get_domain_indices(f'{element}.{domain}')
             try:
                 vals = self[f'{element}.{prop}']
                 vals[locs] = value
@@ -114,6 +128,7 @@ class Base2(dict):
                 temp = self._initialize_empty_array_like(value, element)
                 self.__setitem__(f'{element}.{prop}', temp)
                 self[f'{element}.{prop}'][locs] = value
+                self._mark_written(f'{element}.{prop}')
             return
 
         element, prop = key.split('.', 1)
@@ -165,23 +180,32 @@ class Base2(dict):
             domain = key.split('@')[1]
             if f'{element}.{domain}' not in self.keys():
                 raise KeyError(key)
-            locs = self[f'{element}.{domain}']
+            locs = self._get_domain_indices(f'{element}.{domain}')
             vals = self[f'{element}.{prop}']
+            if _state['uniform'] and (vals.shape[0] == 1):
+                return vals
             return vals[locs]
 
         try:
-            return super().__getitem__(key)
+            vals = super().__getitem__(key)
+            if _state['uniform']:  # Give elementwise models a single value
+                return _uniform_value(vals)
+            if is_compact(vals):  # Expand to a full array, see compact_array
+                vals = np.array(vals)
+                self._store_expanded(key, vals)
+            return vals
         except KeyError:
             # If key is object's name or all, return ones
             if key.split('.', 1)[-1] in [self.name, 'all']:
                 element, prop = key.split('.', 1)
                 vals = np.ones(self._count(element), dtype=bool)
+                if _state['uniform']:
+                    return vals[:1]
                 return vals
             else:
                 vals = {}  # Gather any arrays into a dict
-                for k in self.keys():
-                    if k.startswith(f'{key}.'):
-                        vals.update({k.replace(f'{key}.', ''): self[k]})
+                for k in list(self._prefix_index.get(key, {}).keys()):
+                    vals.update({k.replace(f'{key}.', ''): self[k]})
                 if len(vals) > 0:
                     return vals
                 else:
@@ -190,10 +214,73 @@ class Base2(dict):
     def __delitem__(self, key):
         try:
             super().__delitem__(key)
+            self._unindex_key(key)
         except KeyError:
             d = self[key]  # If key is a nested dict, get all values
             for item in d.keys():
                 super().__delitem__(f'{key}.{item}')
+                self._unindex_key(f'{key}.{item}')
+
+    def update(self, *args, **kwargs):
+        d = dict(*args, **kwargs)
+        super().update(d)
+        for k in d.keys():
+            self._index_key(k)
+
+    def values(self):
+        r"""
+        An overloaded version of ``values`` which returns the arrays as
+        given by ``__getitem__``, so compact arrays are expanded
+        """
+        return [self[k] for k in self.keys()]
+
+    def items(self):
+        r"""
+        An overloaded version of ``items`` which returns the arrays as given
+        by ``__getitem__``, so compact arrays are expanded
+        """
+        return [(k, self[k]) for k in self.keys()]
+
+    def _get_version(self, key):
+        r"""
+        Returns the write version of the given array
+
+        Notes
+        -----
+        The version changes each time the array is assigned or deleted, or a
+        compact array is expanded by reading it, so data derived from an
+        array can be cached along with its version.  Writes made in place by
+        ``run_model``, ``set_label`` and '@' assignments also change it (see
+        ``_mark_written``), but other in-place writes do not, so after doing
+        so assign the array back to the object (e.g. ``obj[key] = obj[key]``).
+        """
+        return self._versions.get(key, 0)
+
+    def _mark_written(self, key):
+        # Called after writing into a stored array in place, see _get_version
+        self._versions[key] = next(_write_count)
+
+    def _store_expanded(self, key, value):
+        # Called when a compact array is expanded by reading it
+        super().__setitem__(key, value)
+        self._mark_written(key)
+
+    def _index_key(self, key):
+        self._versions[key] = next(_write_count)
+        parts = key.split('.')
+        for i in range(1, len(parts)):
+            prefix = '.'.join(parts[:i])
+            self._prefix_index.setdefault(prefix, {})[key] = None
+
+    def _unindex_key(self, key):
+        self._versions[key] = next(_write_count)
+        parts = key.split('.')
+        for i in range(1, len(parts)):
+            prefix = '.'.join(parts[:i])
+            keys = self._prefix_index.get(prefix, {})
+            keys.pop(key, None)
+            if len(keys) == 0:
+                self._prefix_index.pop(prefix, None)
 
     def pop(self, *args):
         v = super().pop(*args)
@@ -204,13 +291,19 @@ class Base2(dict):
                 for item in d.keys():
                     key = f'{args[0]}.{item}'
                     v[key] = super().pop(key)
+                    self._unindex_key(key)
             except KeyError:
                 pass
+        else:
+            self._unindex_key(args[0])
         return v
 
     def clear(self, mode=None):
         if mode is None:
             super().clear()
+            self._prefix_index.clear()
+            self._domain_index.clear()
+            self._versions.clear()
         else:
             if isinstance(mode, str):
                 mode = [mode]
@@ -518,6 +611,79 @@ class Base2(dict):
         lines += '\n' + hr
         return lines
 
+    def _get_domain_indices(self, label):
+        r"""
+        Returns the indices of the locations where the given label is
+        ``True``, which are cached for subsequent calls
+
+        Parameters
+        ----------
+        label : str
+            The label of interest, such as ``'pore.left'``
+
+        Returns
+        -------
+        locs : ndarray
+            The integer indices of the labelled locations
+
+        Notes
+        -----
+        The cached indices are stored along with the label packed into bits,
+        which is compared to the current label on each call, so they are
+        found again whenever the label changes, including when it is written
+        in place such as by ``set_label``.  This comparison is several times
+        faster than finding the indices.
+        """
+        with uniform_inputs(False):
+            mask = self[label]
+        bits = np.packbits(mask)
+        try:
+            size, cached, locs = self._domain_index[label]
+            if (size == mask.size) and np.array_equal(cached, bits):
+                return locs
+        except KeyError:
+            pass
+        locs = np.where(mask)[0]
+        locs = locs.astype(self._get_index_dtype(mask.size), copy=False)
+        self._domain_index[label] = (mask.size, bits, locs)
+        return locs
+
+    def footprint(self, by='array'):
+        r"""
+        Reports the memory used by the arrays stored on this object
+
+        Parameters
+        ----------
+        by : str
+            How to summarize the results, see ``Project.footprint``. The
+            default is 'array', which gives one row per array.
+
+        Returns
+        -------
+        df : pandas.DataFrame
+            A table of memory usage, see ``Project.footprint`` for details.
+
+        """
+        return self.project.footprint(by=by, objects=[self])
+
+    def _get_stored_arrays(self):
+        # The data held by this object as (key, element, array) tuples, for
+        # use by Project.footprint. Compact arrays are not expanded.
+        return [(k, k.split('.', 1)[0], v) for k, v in dict.items(self)]
+
+    def _get_index_dtype(self, n):
+        # The integer type for index arrays with values below n, which is
+        # int32 if the project asks for compact indices and n allows it
+        proj = self.project
+        if (proj is not None) and (n < 2**31) \
+                and getattr(proj.settings, 'compact_indices', False):
+            return np.int32
+        return np.int64
+
+    def _get_float_dtype(self):
+        # The floating point type for new arrays, see Network for an override
+        return np.float64
+
     def _initialize_empty_array_like(self, value, element):
         element = element.split('.', 1)[0]
         value = np.array(value)
@@ -525,8 +691,8 @@ class Base2(dict):
             temp = np.zeros([self._count(element), *value.shape[1:]],
                             dtype=bool)
         else:
-            temp = np.zeros([self._count(element), *value.shape[1:]],
-                            dtype=float)*np.nan
+            temp = np.full([self._count(element), *value.shape[1:]],
+                           np.nan, dtype=self._get_float_dtype())
         return temp
 
 
@@ -359,6 +359,8 @@ class LabelMixin:
             self[element + '.' + label][locs] = True
         if mode == 'remove':
             self[element + '.' + label][locs] = False
+        if mode in ['add', 'overwrite', 'remove']:
+            self._mark_written(element + '.' + label)
         if mode == 'clear':
             self['pore' + '.' + label] = False
             self['throat' + '.' + label] = False
@@ -1,3 +1,4 @@
+import time
 import logging
 import inspect
 import openpnm as op
@@ -6,12 +7,18 @@ from copy import deepcopy
 from openpnm.utils import (
     PrintableDict,
     Workspace,
+    ModelCache,
+    PropertyTable,
     is_valid_propname,
+    compact_array,
+    uniform_inputs,
 )
+from openpnm.utils._compact import _elementwise_models, _NotUniform
 
 
 logger = logging.getLogger(__name__)
 ws = Workspace()
+cache = ModelCache()
 
 
 __all__ = [
@@ -245,6 +252,7 @@ class ModelWrapper(dict):
     This class is used to hold individual models and provide some extra
     functionality, such as pretty-printing and the ability to run itself.
     """
+    table = None
 
     def __call__(self):
         model = self['model']
@@ -313,6 +321,8 @@ class ModelsMixin2:
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
         self.models = ModelsDict()
+        # Number of calls and total run time of each model, if profiled
+        self._model_times = {}
 
     def add_model(self, propname, model, domain='all', regen_mode='normal',
                   **kwargs):
@@ -441,6 +451,91 @@ class ModelsMixin2:
                 v['regen_mode'] = regen_mode
             self.add_model(propname=k, **v)
 
+    def _call_model(self, mod_dict, kwargs):
+        model = mod_dict['model']
+        if mod_dict.table is not None:
+            run = mod_dict.table.run
+        else:
+            run = cache.run
+        if model in _elementwise_models:
+            # Evaluate once if all the arrays read by the model are uniform,
+            # which stops at the first array that is not
+            try:
+                with uniform_inputs():
+                    return run(model, self, **kwargs)
+            except _NotUniform:
+                pass
+        return run(model, self, **kwargs)
+
+    def tabulate_model(self, propname, T_range, P_range=None,
+                       T='pore.temperature', P='pore.pressure', num_T=50,
+                       num_P=10, rtol=1e-4):
+        r"""
+        Replaces calls to a model with interpolation of its values from a
+        precomputed table of temperature and pressure
+
+        Parameters
+        ----------
+        propname : str
+            The name of the model to tabulate. If no domain is given then the
+            models on all domains are tabulated.
+        T_range : list of 2 scalars
+            The lower and upper temperature values to tabulate
+        P_range : list of 2 scalars, optional
+            The lower and upper pressure values to tabulate. If not given
+            the table is only a function of temperature.
+        T, P : str
+            The dictionary keys containing the temperature and pressure
+        num_T, num_P : int
+            The number of points in each direction of the initial grid
+        rtol : float
+            The maximum relative error between the interpolated and exact
+            values. The grid is refined until this tolerance is met.
+
+        Notes
+        -----
+        This is useful for non-isothermal simulations where thermophysical
+        properties must be recomputed on each iteration. Locations whose
+        conditions fall outside the given ranges are computed using the
+        exact model. The table is only valid if the model depends on ``T``
+        and ``P`` alone, and must be rebuilt (by calling this method again)
+        if any other parameters are changed. To remove the table use
+        ``untabulate_model``.
+
+        """
+        if '@' in propname:
+            names = [propname]
+        else:
+            names = [k for k in self.models.keys()
+                     if k.startswith(propname+'@')]
+        if len(names) == 0:
+            raise KeyError(propname)
+        for name in names:
+            mod_dict = self.models[name]
+            if 'domain' in inspect.getfullargspec(mod_dict['model']).args:
+                raise Exception(f'{name} accepts a domain argument so cannot'
+                                ' be tabulated')
+            kwargs = {k: v for k, v in mod_dict.items()
+                      if k not in ['model', 'regen_mode']}
+            table = PropertyTable(T_range=T_range, P_range=P_range, T=T, P=P,
+                                  num_T=num_T, num_P=num_P, rtol=rtol)
+            mod_dict.table = table.build(mod_dict['model'], self, **kwargs)
+
+    def untabulate_model(self, propname):
+        r"""
+        Removes the lookup table created by ``tabulate_model`` so the exact
+        model is used again
+
+        Parameters
+        ----------
+        propname : str
+            The name of the model. If no domain is given then the models on
+            all domains are affected.
+        """
+        for k in self.models.keys():
+            if (k == propname) or k.startswith(propname+'@'):
+                self.models[k].table = None
+
     def regenerate_models(self, propnames=None, exclude=[]):
         r"""
         Runs all the models stored in the object's ``models`` attribute
@@ -506,6 +601,7 @@ class ModelsMixin2:
                         _, _, domain = item.partition("@")
                         self.run_model(propname=propname, domain=domain)
         else:  # domain was given explicitly
+            tic = time.perf_counter()
             domain = domain.split('.', 1)[-1]
             element, prop = propname.split('@')[0].split('.', 1)
             propname = f'{element}.{prop}'
@@ -518,28 +614,51 @@ class ModelsMixin2:
             # Deal with models that don't have domain argument yet
             if 'domain' not in inspect.getfullargspec(mod_dict['model']).args:
                 _ = kwargs.pop('domain', None)
-                vals = mod_dict['model'](self, **kwargs)
+                vals = self._call_model(mod_dict, kwargs)
                 if isinstance(vals, dict):  # Handle models that return a dict
                     for k, v in vals.items():
+                        el = k.split('.', 1)[0] if is_valid_propname(k) else element
                         v = np.atleast_1d(v)
                         if v.shape[0] == 1:  # Returned item was a scalar
-                            v = np.tile(v, self._count(element))
-                        vals[k] = v[self[f'{element}.{domain}']]
+                            v = np.tile(v, self._count(el))
+                        vals[k] = v[self._get_domain_indices(f'{el}.{domain}')]
                 elif isinstance(vals, (int, float)):  # Handle models that return a float
                     vals = np.atleast_1d(vals)
+                elif vals.shape[0] == 1:  # Uniform result, broadcast below
+                    pass
                 else:  # Index into full domain result for use below
-                    vals = vals[self[f'{element}.{domain}']]
+                    vals = vals[self._get_domain_indices(f'{element}.{domain}')]
             else:  # Model that accepts domain arg
-                vals = mod_dict['model'](self, **kwargs)
+                vals = cache.run(mod_dict['model'], self, **kwargs)
             # Finally add model results to self
-            if isinstance(vals, np.ndarray):  # If model returns single array
+            if isinstance(vals, np.ndarray) and (vals.shape == (1, )) \
+                    and (domain == 'all'):  # Store uniform values compactly
+                self[propname] = compact_array(vals, self._count(element))
+            elif isinstance(vals, np.ndarray):  # If model returns single array
                 if propname not in self.keys():
                     temp = self._initialize_empty_array_like(vals, element)
                     self[f'{element}.{prop}'] = temp
-                self[propname][self[f'{element}.{domain}']] = vals
+                self[propname][self._get_domain_indices(f'{element}.{domain}')] = vals
+                self._mark_written(propname)
             elif isinstance(vals, dict):  # If model returns a dict of arrays
+                # Record the keys written by the model, see Project.footprint
+                outputs = self.__dict__.setdefault('_model_outputs', {})
+                outputs[f'{propname}@{domain}'] = []
                 for k, v in vals.items():
-                    if f'{propname}.{k}' not in self.keys():
-                        temp = self._initialize_empty_array_like(v, element)
-                        self[f'{propname}.{k}'] = temp
-                    self[f'{propname}.{k}'][self[f'{element}.{domain}']] = v
+                    # Keys which are full propnames are stored as is,
+                    # otherwise they are nested below propname
+                    if is_valid_propname(k):
+                        el, key = k.split('.', 1)[0], k
+                    else:
+                        el, key = element, f'{propname}.{k}'
+                    outputs[f'{propname}@{domain}'].append(key)
+                    if key not in self.keys():
+                        temp = self._initialize_empty_array_like(v, el)
+                        self[key] = temp
+                    self[key][self._get_domain_indices(f'{el}.{domain}')] = v
+                    self._mark_written(key)
+            if ws.settings['profile_models']:
+                times = self.__dict__.setdefault('_model_times', {})
+                t = times.setdefault(f'{propname}@{domain}', [0, 0.0])
+                t[0] += 1
+                t[1] += time.perf_counter() - tic
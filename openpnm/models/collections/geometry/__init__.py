@@ -1,6 +1,8 @@
 from .spheres_and_cylinders import spheres_and_cylinders
+from .spheres_and_cylinders import spheres_and_cylinders_fused
 from .circles_and_rectangles import circles_and_rectangles
 from .cones_and_cylinders import cones_and_cylinders
+from .cones_and_cylinders import cones_and_cylinders_fused
 from .pyramids_and_cuboids import pyramids_and_cuboids
 from .trapezoids_and_rectangles import trapezoids_and_rectangles
 from .cubes_and_cuboids import cubes_and_cuboids
@@ -64,3 +64,17 @@ spheres_and_cylinders = {
         'throat_diameter': 'throat.diameter',
     },
 }
+
+
+# Identical to the above, but all the throat properties are computed in one
+# compiled pass by a single fused model
+spheres_and_cylinders_fused = {
+    k: v for k, v in spheres_and_cylinders.items()
+    if k in ['pore.seed', 'pore.max_size', 'pore.diameter', 'pore.volume',
+             'throat.max_size', 'throat.diameter']
+}
+spheres_and_cylinders_fused['throat.conduit_geometry'] = {
+    'model': mods.geometry.fused.spheres_and_cylinders,
+    'pore_diameter': 'pore.diameter',
+    'throat_diameter': 'throat.diameter',
+}
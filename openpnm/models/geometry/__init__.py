@@ -26,3 +26,4 @@ from . import throat_vector
 from . import hydraulic_size_factors
 from . import diffusive_size_factors
 from . import conduit_lengths
+from . import fused
@@ -1,6 +1,7 @@
 import numpy as np
 
 from openpnm.models.geometry import _geodocs
+from openpnm.utils import cacheable as _cacheable
 
 __all__ = [
     "spheres_and_cylinders",
@@ -19,6 +20,7 @@ __all__ = [
 ]
 
 
+@_cacheable(inputs=['throat.spacing'])
 @_geodocs
 def spheres_and_cylinders(
     network,
@@ -63,6 +65,7 @@ def spheres_and_cylinders(
     return np.vstack((L1, Lt, L2)).T
 
 
+@_cacheable(inputs=['throat.spacing'])
 @_geodocs
 def circles_and_rectangles(
     network, pore_diameter="pore.diameter", throat_diameter="throat.diameter"
@@ -95,6 +98,7 @@ def circles_and_rectangles(
     )
 
 
+@_cacheable(inputs=['throat.spacing'])
 @_geodocs
 def cones_and_cylinders(
     network, pore_diameter="pore.diameter", throat_diameter="throat.diameter"
@@ -130,6 +134,7 @@ def cones_and_cylinders(
     return np.vstack((L1, Lt, L2)).T
 
 
+@_cacheable
 @_geodocs
 def intersecting_cones(network, pore_coords="pore.coords", throat_coords="throat.coords"):
     r"""
@@ -158,6 +163,7 @@ def intersecting_cones(network, pore_coords="pore.coords", throat_coords="throat
     return np.vstack((L1, Lt, L2)).T
 
 
+@_cacheable(inputs=['throat.spacing'])
 @_geodocs
 def hybrid_cones_and_cylinders(
     network, pore_diameter="pore.diameter", throat_coords="throat.coords"
@@ -198,6 +204,7 @@ def hybrid_cones_and_cylinders(
     return np.vstack((L1, Lt, L2)).T
 
 
+@_cacheable(inputs=['throat.spacing'])
 @_geodocs
 def trapezoids_and_rectangles(
     network, pore_diameter="pore.diameter", throat_diameter="throat.diameter"
@@ -228,6 +235,7 @@ def trapezoids_and_rectangles(
     )
 
 
+@_cacheable
 @_geodocs
 def intersecting_trapezoids(
     network, pore_coords="pore.coords", throat_coords="throat.coords"
@@ -258,6 +266,7 @@ def intersecting_trapezoids(
     )
 
 
+@_cacheable(inputs=['throat.spacing'])
 @_geodocs
 def hybrid_trapezoids_and_rectangles(
     network, pore_diameter="pore.diameter", throat_coords="throat.coords"
@@ -288,6 +297,7 @@ def hybrid_trapezoids_and_rectangles(
     )
 
 
+@_cacheable(inputs=['throat.spacing'])
 @_geodocs
 def pyramids_and_cuboids(
     network, pore_diameter="pore.diameter", throat_diameter="throat.diameter"
@@ -313,6 +323,7 @@ def pyramids_and_cuboids(
     )
 
 
+@_cacheable
 @_geodocs
 def intersecting_pyramids(
     network, pore_coords="pore.coords", throat_coords="throat.coords"
@@ -338,6 +349,7 @@ def intersecting_pyramids(
     )
 
 
+@_cacheable(inputs=['throat.spacing'])
 @_geodocs
 def hybrid_pyramids_and_cuboids(
     network, pore_diameter="pore.diameter", throat_coords="throat.coords"
@@ -364,6 +376,7 @@ def hybrid_pyramids_and_cuboids(
     )
 
 
+@_cacheable(inputs=['throat.spacing'])
 @_geodocs
 def cubes_and_cuboids(
     network, pore_diameter="pore.diameter", throat_diameter="throat.diameter"
@@ -398,6 +411,7 @@ def cubes_and_cuboids(
     return np.vstack((L1, Lt, L2)).T
 
 
+@_cacheable(inputs=['throat.spacing'])
 @_geodocs
 def squares_and_rectangles(
     network, pore_diameter="pore.diameter", throat_diameter="throat.diameter"
@@ -1,6 +1,7 @@
 import numpy as _np
 import openpnm.models.geometry.conduit_lengths as _conduit_lengths
 from openpnm.models.geometry import _geodocs
+from openpnm.utils import cacheable as _cacheable
 
 __all__ = [
     "spheres_and_cylinders",
@@ -21,6 +22,7 @@ __all__ = [
 ]
 
 
+@_cacheable(inputs=['throat.spacing'])
 @_geodocs
 def spheres_and_cylinders(
     network,
@@ -75,6 +77,7 @@ def spheres_and_cylinders(
     return vals
 
 
+@_cacheable(inputs=['throat.spacing'])
 @_geodocs
 def circles_and_rectangles(
     network,
@@ -116,6 +119,7 @@ def circles_and_rectangles(
     return vals
 
 
+@_cacheable(inputs=['throat.spacing'])
 @_geodocs
 def cones_and_cylinders(
     network,
@@ -157,6 +161,7 @@ def cones_and_cylinders(
     return vals
 
 
+@_cacheable
 @_geodocs
 def intersecting_cones(
     network,
@@ -196,6 +201,7 @@ def intersecting_cones(
     return vals
 
 
+@_cacheable(inputs=['throat.spacing'])
 @_geodocs
 def hybrid_cones_and_cylinders(
     network,
@@ -244,6 +250,7 @@ def hybrid_cones_and_cylinders(
     return vals
 
 
+@_cacheable(inputs=['throat.spacing'])
 @_geodocs
 def trapezoids_and_rectangles(
     network,
@@ -291,6 +298,7 @@ def trapezoids_and_rectangles(
     return vals
 
 
+@_cacheable
 @_geodocs
 def intersecting_trapezoids(
     network,
@@ -337,6 +345,7 @@ def intersecting_trapezoids(
     return vals
 
 
+@_cacheable(inputs=['throat.spacing'])
 @_geodocs
 def hybrid_trapezoids_and_rectangles(
     network,
@@ -392,6 +401,7 @@ def hybrid_trapezoids_and_rectangles(
     return vals
 
 
+@_cacheable(inputs=['throat.spacing'])
 @_geodocs
 def pyramids_and_cuboids(
     network,
@@ -433,6 +443,7 @@ def pyramids_and_cuboids(
     return vals
 
 
+@_cacheable(inputs=['throat.spacing'])
 @_geodocs
 def hybrid_pyramids_and_cuboids(
     network,
@@ -481,6 +492,7 @@ def hybrid_pyramids_and_cuboids(
     return vals
 
 
+@_cacheable
 @_geodocs
 def intersecting_pyramids(
     network,
@@ -520,6 +532,7 @@ def intersecting_pyramids(
     return vals
 
 
+@_cacheable(inputs=['throat.spacing'])
 @_geodocs
 def cubes_and_cuboids(
     network,
@@ -567,6 +580,7 @@ def cubes_and_cuboids(
     return vals
 
 
+@_cacheable(inputs=['throat.spacing'])
 @_geodocs
 def squares_and_rectangles(
     network,
@@ -614,6 +628,7 @@ def squares_and_rectangles(
     return vals
 
 
+@_cacheable(inputs=['throat.spacing'])
 @_geodocs
 def ncylinders_in_series(
     network,
@@ -0,0 +1,11 @@
+r"""
+Fused Conduit Models
+--------------------
+
+This model contains functions which compute all the throat and conduit
+properties of a given shape family in a single compiled pass over the
+throats, rather than running a separate model for each property.
+
+"""
+
+from ._funcs import *
@@ -0,0 +1,238 @@
+import numpy as _np
+from numba import njit
+from openpnm.models.geometry import _geodocs
+from openpnm.models.geometry.conduit_lengths._funcs import (
+    _get_L_ctc,
+    _raise_incompatible_data,
+)
+
+
+__all__ = [
+    "spheres_and_cylinders",
+    "cones_and_cylinders",
+]
+
+
+@_geodocs
+def spheres_and_cylinders(
+    network,
+    pore_diameter="pore.diameter",
+    throat_diameter="throat.diameter",
+):
+    r"""
+    Computes all throat properties assuming pores are spheres and throats
+    are cylinders in a single pass
+
+    Parameters
+    ----------
+    %(network)s
+    %(Dp)s
+    %(Dt)s
+
+    Returns
+    -------
+    vals : dict
+        A dictionary containing the following arrays, which are identical to
+        those produced by the corresponding model in ``models.geometry``:
+
+        ================================= ===================================
+        key                               equivalent model
+        ================================= ===================================
+        'throat.length'                   throat_length.spheres_and_cylinders
+        'throat.cross_sectional_area'     throat_cross_sectional_area.cylinder
+        'throat.total_volume'             throat_volume.cylinder
+        'throat.lens_volume'              throat_volume.lens
+        'throat.volume'                   total volume minus lens volume
+        'throat.diffusive_size_factors'   diffusive_size_factors.spheres_and_cylinders
+        'throat.hydraulic_size_factors'   hydraulic_size_factors.spheres_and_cylinders
+        ================================= ===================================
+
+    Notes
+    -----
+    Because the keys of the returned dictionary are full property names the
+    results are written to those locations on ``network`` rather than nested
+    below the name under which this model was added.
+
+    """
+    conns = network["throat.conns"]
+    Dp = network[pore_diameter]
+    Dt = network[throat_diameter]
+    L_ctc = _get_L_ctc(network)
+    L, valid = _spheres_and_cylinders_lengths(conns, Dp, Dt, L_ctc)
+    if not valid:
+        _raise_incompatible_data()
+    # Transcendental functions are applied with numpy so that results match
+    # the individual models exactly, since numba uses different routines
+    atanh = _np.arctanh(_np.vstack((2 * L[:, 0], 2 * L[:, 2])) / Dp[conns.T])
+    cosq = _np.cos(_np.arcsin((Dt / 2) / (Dp[conns.T] / 2)))
+    out = _spheres_and_cylinders(conns, Dp, Dp**3, Dt, L, atanh, cosq)
+    vals = {
+        "throat.length": out[:, 1],
+        "throat.cross_sectional_area": out[:, 3],
+        "throat.total_volume": out[:, 4],
+        "throat.lens_volume": out[:, 5],
+        "throat.volume": out[:, 6],
+        "throat.diffusive_size_factors": out[:, 7:10],
+        "throat.hydraulic_size_factors": out[:, 10:13],
+    }
+    return vals
+
+
+@_geodocs
+def cones_and_cylinders(
+    network,
+    pore_diameter="pore.diameter",
+    throat_diameter="throat.diameter",
+):
+    r"""
+    Computes all throat properties assuming pores are truncated cones and
+    throats are cylinders in a single pass
+
+    Parameters
+    ----------
+    %(network)s
+    %(Dp)s
+    %(Dt)s
+
+    Returns
+    -------
+    vals : dict
+        A dictionary containing the following arrays, which are identical to
+        those produced by the corresponding model in ``models.geometry``:
+
+        ================================= ===================================
+        key                               equivalent model
+        ================================= ===================================
+        'throat.length'                   throat_length.cones_and_cylinders
+        'throat.cross_sectional_area'     throat_cross_sectional_area.cylinder
+        'throat.volume'                   throat_volume.cylinder
+        'throat.diffusive_size_factors'   diffusive_size_factors.cones_and_cylinders
+        'throat.hydraulic_size_factors'   hydraulic_size_factors.cones_and_cylinders
+        ================================= ===================================
+
+    """
+    conns = network["throat.conns"]
+    Dp = network[pore_diameter]
+    Dt = network[throat_diameter]
+    L_ctc = _get_L_ctc(network)
+    out = _cones_and_cylinders(conns, Dp, Dp**3, Dt, Dt**3, L_ctc)
+    vals = {
+        "throat.length": out[:, 1],
+        "throat.cross_sectional_area": out[:, 3],
+        "throat.volume": out[:, 4],
+        "throat.diffusive_size_factors": out[:, 5:8],
+        "throat.hydraulic_size_factors": out[:, 8:11],
+    }
+    return vals
+
+
+# The kernels below repeat the arithmetic of the individual models term for
+# term, including the order of operations, so that results are identical
+@njit
+def _overlap(L1, L2, D1, D2, L_ctc):
+    # Handle throats w/ overlapping pores
+    if L_ctc - 0.5 * (D1 + D2) < 0:
+        L1 = (4 * L_ctc**2 + D1**2 - D2**2) / (8 * L_ctc)
+        L2 = L_ctc - L1
+    Lt = L_ctc - (L1 + L2)
+    if Lt < 1e-15:
+        Lt = 1e-15
+    return L1, Lt, L2
+
+
+@njit
+def _spheres_and_cylinders_lengths(conns, Dp, Dt, L_ctc):
+    Nt = conns.shape[0]
+    L = _np.empty((Nt, 3), dtype=_np.float64)
+    valid = True
+    for i in range(Nt):
+        D1 = Dp[conns[i, 0]]
+        D2 = Dp[conns[i, 1]]
+        if (Dt[i] > D1) or (Dt[i] > D2):
+            valid = False
+        L1 = _np.sqrt(D1**2 - Dt[i]**2) / 2
+        L2 = _np.sqrt(D2**2 - Dt[i]**2) / 2
+        L[i, 0], L[i, 1], L[i, 2] = _overlap(L1, L2, D1, D2, L_ctc[i])
+    return L, valid
+
+
+@njit
+def _spheres_and_cylinders(conns, Dp, Dp3, Dt, L, atanh, cosq):
+    Nt = conns.shape[0]
+    out = _np.empty((Nt, 13), dtype=_np.float64)
+    pi = _np.pi
+    I = 1 / (2 * pi)
+    for i in range(Nt):
+        D1 = Dp[conns[i, 0]]
+        D2 = Dp[conns[i, 1]]
+        Dti = Dt[i]
+        L1, Lt, L2 = L[i, 0], L[i, 1], L[i, 2]
+        out[i, 0] = L1
+        out[i, 1] = Lt
+        out[i, 2] = L2
+        # Throat area and volumes
+        out[i, 3] = pi / 4 * Dti**2
+        out[i, 4] = pi/4*Lt*Dti**2
+        a = Dti/2
+        V = 0.0
+        for j in range(2):
+            Rp = Dp[conns[i, j]]/2
+            h = Rp - Rp*cosq[j, i]
+            V += 1/6*pi*h*(3*a**2 + h**2)
+        out[i, 5] = V
+        out[i, 6] = out[i, 4] - V
+        # Diffusive size factors
+        F1 = 2 / (D1 * pi) * atanh[0, i]
+        F2 = 2 / (D2 * pi) * atanh[1, i]
+        Ft = Lt / (pi / 4 * Dti ** 2)
+        out[i, 7] = 1/F1
+        out[i, 8] = 1/Ft
+        out[i, 9] = 1/F2
+        # Hydraulic size factors
+        a = 4 / (Dp3[conns[i, 0]] * pi**2)
+        b = 2 * D1 * L1 / (D1**2 - 4 * L1**2) + atanh[0, i]
+        F1 = a * b
+        a = 4 / (Dp3[conns[i, 1]] * pi**2)
+        b = 2 * D2 * L2 / (D2**2 - 4 * L2**2) + atanh[1, i]
+        F2 = a * b
+        Ft = Lt / (pi / 4 * Dti**2)**2
+        out[i, 10] = 1 / (16 * pi**2 * I * F1)
+        out[i, 11] = 1 / (16 * pi**2 * I * Ft)
+        out[i, 12] = 1 / (16 * pi**2 * I * F2)
+    return out
+
+
+@njit
+def _cones_and_cylinders(conns, Dp, Dp3, Dt, Dt3, L_ctc):
+    Nt = conns.shape[0]
+    out = _np.empty((Nt, 11), dtype=_np.float64)
+    pi = _np.pi
+    I = 1 / (2 * pi)
+    for i in range(Nt):
+        D1 = Dp[conns[i, 0]]
+        D2 = Dp[conns[i, 1]]
+        Dti = Dt[i]
+        L1, Lt, L2 = _overlap(D1 / 2, D2 / 2, D1, D2, L_ctc[i])
+        out[i, 0] = L1
+        out[i, 1] = Lt
+        out[i, 2] = L2
+        # Throat area and volume
+        out[i, 3] = pi / 4 * Dti**2
+        out[i, 4] = pi/4*Lt*Dti**2
+        # Diffusive size factors
+        F1 = 4 * L1 / (D1 * Dti * pi)
+        F2 = 4 * L2 / (D2 * Dti * pi)
+        Ft = Lt / (pi * Dti**2 / 4)
+        out[i, 5] = 1/F1
+        out[i, 6] = 1/Ft
+        out[i, 7] = 1/F2
+        # Hydraulic size factors
+        F1 = 16 / 3 * (L1 * (D1**2 + D1 * Dti + Dti**2)
+                       / (Dp3[conns[i, 0]] * Dt3[i] * pi**2))
+        F2 = 16 / 3 * (L2 * (D2**2 + D2 * Dti + Dti**2)
+                       / (Dp3[conns[i, 1]] * Dt3[i] * pi**2))
+        Ft = Lt / (pi * Dti**2 / 4) ** 2
+        out[i, 8] = 1 / (16 * pi**2 * I * F1)
+        out[i, 9] = 1 / (16 * pi**2 * I * Ft)
+        out[i, 10] = 1 / (16 * pi**2 * I * F2)
+    return out
@@ -1,6 +1,7 @@
 import numpy as _np
 import openpnm.models.geometry.conduit_lengths as _conduit_lengths
 from openpnm.models.geometry import _geodocs
+from openpnm.utils import cacheable as _cacheable
 
 
 __all__ = [
@@ -21,6 +22,7 @@ __all__ = [
 ]
 
 
+@_cacheable(inputs=['throat.spacing'])
 @_geodocs
 def spheres_and_cylinders(
     network,
@@ -86,6 +88,7 @@ def spheres_and_cylinders(
     return _np.vstack([S1, St, S2]).T
 
 
+@_cacheable(inputs=['throat.spacing'])
 @_geodocs
 def circles_and_rectangles(
     network,
@@ -127,6 +130,7 @@ def circles_and_rectangles(
     return _np.vstack([S1, St, S2]).T
 
 
+@_cacheable(inputs=['throat.spacing'])
 @_geodocs
 def cones_and_cylinders(
     network,
@@ -173,6 +177,7 @@ def cones_and_cylinders(
     return _np.vstack([S1, St, S2]).T
 
 
+@_cacheable
 @_geodocs
 def intersecting_cones(
     network,
@@ -216,6 +221,7 @@ def intersecting_cones(
     return _np.vstack([S1, St, S2]).T
 
 
+@_cacheable(inputs=['throat.spacing'])
 @_geodocs
 def hybrid_cones_and_cylinders(
     network,
@@ -269,6 +275,7 @@ def hybrid_cones_and_cylinders(
     return _np.vstack([S1, St, S2]).T
 
 
+@_cacheable(inputs=['throat.spacing'])
 @_geodocs
 def trapezoids_and_rectangles(
     network,
@@ -312,6 +319,7 @@ def trapezoids_and_rectangles(
     return _np.vstack([S1, St, S2]).T
 
 
+@_cacheable
 @_geodocs
 def intersecting_trapezoids(
     network,
@@ -355,6 +363,7 @@ def intersecting_trapezoids(
     return _np.vstack([S1, St, S2]).T
 
 
+@_cacheable(inputs=['throat.spacing'])
 @_geodocs
 def hybrid_trapezoids_and_rectangles(
     network,
@@ -408,6 +417,7 @@ def hybrid_trapezoids_and_rectangles(
     return _np.vstack([S1, St, S2]).T
 
 
+@_cacheable(inputs=['throat.spacing'])
 @_geodocs
 def pyramids_and_cuboids(
     network,
@@ -454,6 +464,7 @@ def pyramids_and_cuboids(
     return _np.vstack([S1, St, S2]).T
 
 
+@_cacheable
 @_geodocs
 def intersecting_pyramids(
     network,
@@ -497,6 +508,7 @@ def intersecting_pyramids(
     return _np.vstack([S1, St, S2]).T
 
 
+@_cacheable(inputs=['throat.spacing'])
 @_geodocs
 def hybrid_pyramids_and_cuboids(
     network,
@@ -551,6 +563,7 @@ def hybrid_pyramids_and_cuboids(
     return _np.vstack([S1, St, S2]).T
 
 
+@_cacheable(inputs=['throat.spacing'])
 @_geodocs
 def cubes_and_cuboids(
     network,
@@ -603,6 +616,7 @@ def cubes_and_cuboids(
     return _np.vstack([S1, St, S2]).T
 
 
+@_cacheable(inputs=['throat.spacing'])
 @_geodocs
 def squares_and_rectangles(
     network,
@@ -652,6 +666,7 @@ def squares_and_rectangles(
     return _np.vstack([S1, St, S2]).T
 
 
+@_cacheable(inputs=['throat.spacing'])
 @_geodocs
 def ncylinders_in_series(
     network,
@@ -5,13 +5,15 @@ Neighbor Lookups
 """
 import logging
 import numpy as np
+from openpnm.utils import segment_reduce
 logger = logging.getLogger(__name__)
 
 
 __all__ = ['from_neighbor_throats', 'from_neighbor_pores']
 
 
-def from_neighbor_throats(target, prop, mode='min', ignore_nans=True):
+def from_neighbor_throats(target, prop, mode='min', ignore_nans=True,
+                          weights=None):
     r"""
     Adopt a value from the values found in neighboring throats
 
@@ -36,43 +38,38 @@ def from_neighbor_throats(target, prop, mode='min', ignore_nans=True):
             'max'        Returns the value of the maximum property of the
                          neighboring throats
             'mean'       Returns the value of the mean property of the
+                         neighboring throats, weighted by ``weights`` if
+                         given
+            'sum'        Returns the sum of the property of the
                          neighboring throats
             ===========  =====================================================
 
+    ignore_nans : bool (default is ``True``)
+        If ``True`` the result will ignore ``nans`` in the neighbors
+    weights : str, optional
+        The dictionary key of the throat property to use as weights when
+        ``mode`` is 'mean', such as 'throat.volume'.
+
     Returns
     -------
     value : ndarray
         Array containing customized values based on those of adjacent throats.
+        Pores with no (non-nan) neighboring values receive ``inf`` if
+        ``mode`` is 'min', ``-inf`` if 'max', 0 if 'sum' and ``nan`` if
+        'mean'.
 
     """
     network = target.network
-    data = target[prop]
-    nans = np.isnan(data)
-    im = network.create_incidence_matrix()
-    if mode == 'min':
-        if ignore_nans:
-            data[nans] = np.inf
-        values = np.ones((network.Np, ))*np.inf
-        np.minimum.at(values, im.row, data[im.col])
-    if mode == 'max':
-        if ignore_nans:
-            data[nans] = -np.inf
-        values = np.ones((network.Np, ))*-np.inf
-        np.maximum.at(values, im.row, data[im.col])
-    if mode == 'mean':
-        if ignore_nans:
-            data[nans] = 0
-        values = np.zeros((network.Np, ))
-        np.add.at(values, im.row, data[im.col])
-        counts = np.zeros((network.Np, ))
-        np.add.at(counts, im.row, np.ones((network.Nt, ))[im.col])
-        if ignore_nans:
-            np.subtract.at(counts, im.row, nans[im.col])
-        values = values/counts
+    im = network.get_incidence_matrix(fmt='csr')
+    if weights is not None:
+        weights = target[weights][im.indices]
+    values = segment_reduce(target[prop][im.indices], im.indptr, mode=mode,
+                            weights=weights, ignore_nans=ignore_nans)
     return values
 
 
-def from_neighbor_pores(target, prop, mode='min', ignore_nans=True):
+def from_neighbor_pores(target, prop, mode='min', ignore_nans=True,
+                        weights=None):
     r"""
     Adopt a value based on the values in neighboring pores
 
@@ -97,11 +94,16 @@ def from_neighbor_pores(target, prop, mode='min', ignore_nans=True):
             'max'        Returns the value of the maximum property of the
                          neighboring pores
             'mean'       Returns the value of the mean property of the
+                         neighboring pores, weighted by ``weights`` if given
+            'sum'        Returns the sum of the property of the
                          neighboring pores
             ===========  =====================================================
 
     ignore_nans : bool (default is ``True``)
         If ``True`` the result will ignore ``nans`` in the neighbors
+    weights : str, optional
+        The dictionary key of the pore property to use as weights when
+        ``mode`` is 'mean', such as 'pore.volume'.
 
     Returns
     -------
@@ -111,17 +113,13 @@ def from_neighbor_pores(target, prop, mode='min', ignore_nans=True):
     """
     network = target.network
     throats = target.Ts
-    P12 = network.find_connected_pores(throats)
-    pvalues = target[prop][P12]
-    if ignore_nans:
-        pvalues = np.ma.MaskedArray(data=pvalues, mask=np.isnan(pvalues))
-    try:  # If pvalues is not empty
-        if mode == 'min':
-            value = np.amin(pvalues, axis=1)
-        if mode == 'max':
-            value = np.amax(pvalues, axis=1)
-        if mode == 'mean':
-            value = np.mean(pvalues, axis=1)
-    except np.AxisError:  # Handle case of empty pvalues
-        value = []
-    return np.array(value)
+    P12 = network['throat.conns'][throats]
+    data = target[prop][P12]
+    data = data.reshape(-1, *data.shape[2:])
+    # Each throat is a segment containing the values of its two pores
+    indptr = np.arange(0, 2*len(throats) + 1, 2)
+    if weights is not None:
+        weights = target[weights][P12].flatten()
+    values = segment_reduce(data, indptr, mode=mode, weights=weights,
+                            ignore_nans=ignore_nans)
+    return values
@@ -124,14 +124,9 @@ def count_coincident_pores(network, thresh=1e-6):
     """
     # This needs to be a bit complicated because it cannot be assumed
     # the coincident pores are topologically connected
-    import scipy.spatial as sptl
-    coords = network.coords
-    tree = sptl.KDTree(coords)
-    hits = tree.query_pairs(r=thresh)
-    arr = np.array(list(hits)).flatten()
-    v, n = np.unique(arr, return_counts=True)
-    values = np.zeros(network.Np, dtype=int)
-    values[v.astype(int)] = n
+    tree = network.get_kdtree()
+    hits = tree.query_pairs(r=thresh, output_type='ndarray')
+    values = np.bincount(hits.flatten(), minlength=network.Np)
     return values
 
 
@@ -156,9 +151,7 @@ def find_coincident_pores(network, thresh=1e-6):
     """
     # This needs to be a bit complicated because it cannot be assumed
     # the coincident pores are topologically connected
-    import scipy.spatial as sptl
-    coords = network['pore.coords']
-    tree = sptl.KDTree(coords)
+    tree = network.get_kdtree()
     a = tree.sparse_distance_matrix(tree, max_distance=thresh,
                                     output_type='coo_matrix')
     a.data += 1.0
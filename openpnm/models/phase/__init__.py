@@ -28,6 +28,8 @@ logger = logging.getLogger(__name__)
 # %%
 import inspect as _inspect
 import numpy as _np
+from openpnm.utils import cacheable as _cacheable
+from openpnm.utils import elementwise as _elementwise
 
 
 default_argmap = {
@@ -58,6 +60,8 @@ mixture_argmap = {
 }
 
 
+@_cacheable(inputs='*')
+@_elementwise
 def chemicals_wrapper(phase, f, **kwargs):
     r"""
     Wrapper function for calling models in the ``chemicals`` package
@@ -96,17 +100,16 @@ def chemicals_wrapper(phase, f, **kwargs):
 
     Notes
     -----
-    This wrapper works with both pure and mixture phases, but the mixture
-    models are very slow due to the way ``chemicals`` vectorizes code. For pure
-    species it allows the computation of values at many different conditions
-    in a vectorized way. The means that the conditions in each pore, such as
+    This wrapper works with both pure and mixture phases. For pure species
+    it allows the computation of values at many different conditions in a
+    vectorized way. The means that the conditions in each pore, such as
     temperature, pressure, etc can be passed and iterpreted as a list of
-    conditions. For mixture models, however, the vectorization is done over
-    the compositions, at a *fixed* condition. This means that we must do a
-    pure-python for-loop (ie. slow) for each individual pore. As such, we
-    have re-implemented several of the most useful mixing models offered by
-    ``chemicals`` in ``OpenPNM``, and include unit tests to ensure both
-    implementations agree.
+    conditions. For mixture models, however, ``chemicals`` vectorizes over
+    the compositions at a *fixed* condition. To avoid a pure-python for-loop
+    over each pore, the mixing rules listed in
+    ``openpnm.models.phase.mixtures.vectorized_mixing_rules`` are instead
+    evaluated on (Ncomp x Np) arrays of component values in a single call.
+    Any other mixture functions still fall back to the (slow) per-pore loop.
 
     """
     import chemicals as _chemicals
@@ -117,9 +120,16 @@ def chemicals_wrapper(phase, f, **kwargs):
     args = _get_items_from_target(phase, f, argmap)
     # f = getattr(_chemicals.numba_vectorized, f.__name__)
     msg = f"Numba version failed for {f.__name__}, reverting to pure python"
-    if len(set(['xs', 'yz', 'zs']).intersection(args.keys())):
+    if len(set(['xs', 'ys', 'zs', 'ws']).intersection(args.keys())):
+        if f.__name__ in mixtures.vectorized_mixing_rules.keys():
+            rule = mixtures.vectorized_mixing_rules[f.__name__]
+            for item in args.keys():
+                if isinstance(args[item], list):
+                    args[item] = mixtures.stack_components(args[item])
+            vals = rule(**args)
+            return vals*_np.ones(phase.Np)
         # Call function in for-loop for each pore since they are not vectorized
-        logger.info(msg)
+        logger.info(f"No vectorized version of {f.__name__}, looping over pores")
         vals = _np.zeros(phase.Np)
         for pore in phase.Ps:
             a = {}
@@ -159,6 +169,9 @@ def _get_items_from_target(phase, f, argmap):
         if item in ['xs', 'ys', 'zs']:
             args[item] = list(phase['pore.mole_fraction'].values())
             continue
+        if item == 'ws':
+            args[item] = list(mixtures.mole_to_mass_fraction(phase).values())
+            continue
         if 'pore.' + item in phase.keys():
             # If eg. pore.Zc was added to dict directly, no argmap needed
             args[item] = phase[f"{'pore.'+item}"]
@@ -1,5 +1,6 @@
 import numpy as np
 from openpnm.models.phase import _phasedocs
+from openpnm.utils import elementwise as _elementwise
 
 
 __all__ = [
@@ -7,6 +8,7 @@ __all__ = [
 ]
 
 
+@_elementwise
 @_phasedocs
 def liquid_mixture_Vc_XXX(
     phase,
@@ -40,6 +42,7 @@ def liquid_mixture_Vc_XXX(
     return Vm
 
 
+@_elementwise
 @_phasedocs
 def liquid_mixture_Tc_XXX(
     phase,
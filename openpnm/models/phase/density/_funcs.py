@@ -1,4 +1,5 @@
 from openpnm.models.phase import _phasedocs
+from openpnm.utils import elementwise as _elementwise
 import numpy as np
 
 
@@ -11,6 +12,7 @@ __all__ = [
 ]
 
 
+@_elementwise
 @_phasedocs
 def ideal_gas(
     phase,
@@ -45,6 +47,7 @@ def ideal_gas(
     return value
 
 
+@_elementwise
 @_phasedocs
 def water_correlation(
     phase,
@@ -102,6 +105,7 @@ def water_correlation(
     return value
 
 
+@_elementwise
 @_phasedocs
 def liquid_mixture_COSTALD(
     phase,
@@ -175,6 +179,7 @@ def liquid_mixture_COSTALD(
     return rhoL
 
 
+@_elementwise
 @_phasedocs
 def liquid_pure_COSTALD(
     phase,
@@ -215,6 +220,7 @@ def liquid_pure_COSTALD(
     return rhoL
 
 
+@_elementwise
 @_phasedocs
 def mass_to_molar(
     phase,
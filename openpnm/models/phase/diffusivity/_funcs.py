@@ -1,5 +1,6 @@
 import numpy as np
 from openpnm.models.phase import _phasedocs
+from openpnm.utils import elementwise as _elementwise
 
 
 __all__ = [
@@ -10,6 +11,7 @@ __all__ = [
 ]
 
 
+@_elementwise
 @_phasedocs
 def liquid_mixture_tc(
     phase,
@@ -48,6 +50,7 @@ def liquid_mixture_tc(
     return value
 
 
+@_elementwise
 @_phasedocs
 def gas_mixture_ce(
     phase,
@@ -114,6 +117,7 @@ def gas_mixture_ce(
     return DAB
 
 
+@_elementwise
 @_phasedocs
 def gas_mixture_fesg(
     phase,
@@ -1,6 +1,7 @@
 import numpy as np
 from openpnm.models.phase.mixtures import mixing_rule
 from openpnm.models.phase import _phasedocs
+from openpnm.utils import elementwise as _elementwise
 
 
 __all__ = [
@@ -11,6 +12,7 @@ __all__ = [
 ]
 
 
+@_elementwise
 @_phasedocs
 def liquid_pure_rp(
     phase,
@@ -47,6 +49,7 @@ def liquid_pure_rp(
     return Cp
 
 
+@_elementwise
 @_phasedocs
 def gas_pure_TRC(
     phase,
@@ -84,6 +87,7 @@ def gas_pure_TRC(
     return Cp
 
 
+@_elementwise
 @_phasedocs
 def gas_mixture_yweighted(
     phase,
@@ -105,6 +109,7 @@ def gas_mixture_yweighted(
     return Cpmix
 
 
+@_elementwise
 @_phasedocs
 def liquid_mixture_xweighted(
     phase,
@@ -1,5 +1,6 @@
 import numpy as np
 from openpnm.models.phase import _phasedocs
+from openpnm.utils import elementwise as _elementwise
 
 
 __all__ = [
@@ -48,6 +49,7 @@ def mix_and_match(
     return values
 
 
+@_elementwise
 @_phasedocs
 def mole_to_mass_fraction(
     phase,
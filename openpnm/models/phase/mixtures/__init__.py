@@ -1 +1,2 @@
 from ._funcs import *
+from ._engine import *
@@ -0,0 +1,170 @@
+import numpy as np
+
+
+__all__ = [
+    'stack_components',
+    'vectorized_mixing_rules',
+]
+
+
+# Universal gas constant, as defined in ``fluids.constants``
+_R = 6.02214076e23*1.380649e-23
+
+
+def stack_components(vals):
+    r"""
+    Stacks per-component values into a single (Ncomp x N) array
+
+    Parameters
+    ----------
+    vals : list or dict
+        The values for each component. These can be scalars (such as
+        critical properties) or ndarrays with one value per pore (such as
+        mole fractions or pure component viscosities).
+
+    Returns
+    -------
+    arr : ndarray
+        An array with one row per component. If all the values are scalars
+        the array has shape (Ncomp x 1) so that it broadcasts against arrays
+        of pore values without duplicating the data.
+
+    """
+    if isinstance(vals, dict):
+        vals = list(vals.values())
+    arrs = [np.atleast_1d(np.asarray(v, dtype=float)) for v in vals]
+    if all(a.size == 1 for a in arrs):
+        return np.array([a[0] for a in arrs], dtype=float)[:, None]
+    return np.vstack(np.broadcast_arrays(*arrs))
+
+
+def herning_zipperer(zs, mus, MWs, MW_roots=None):
+    if MW_roots is None:
+        MW_roots = np.sqrt(MWs)
+    v = zs*MW_roots
+    return (v*mus).sum(axis=0)/v.sum(axis=0)
+
+
+def wassiljewa_herning_zipperer(zs, ks, MWs, MW_roots=None):
+    return herning_zipperer(zs=zs, mus=ks, MWs=MWs, MW_roots=MW_roots)
+
+
+def wilke(ys, mus, MWs):
+    mu_i, mu_j = mus[:, None], mus[None, :]
+    MW_i, MW_j = MWs[:, None], MWs[None, :]
+    phis = (1.0 + (mu_i/mu_j)**0.5*(MW_j/MW_i)**0.25)**2.0 \
+        / (8.0*(1.0 + MW_i/MW_j))**0.5
+    denom = (ys[None, :]*phis).sum(axis=1)
+    return (ys*mus/denom).sum(axis=0)
+
+
+def brokaw(T, ys, mus, MWs, molecular_diameters, Stockmayers):
+    MDs = molecular_diameters
+    Tsts = T/Stockmayers
+    Tstrs = Tsts**0.5
+    S = 1.0 + Tsts + 0.25*MDs*MDs
+    Sij = (1.0 + Tstrs[:, None]*Tstrs[None, :] + (MDs[:, None]*MDs[None, :])/4.) \
+        / S[:, None]**0.5/S[None, :]**0.5
+    small = (MDs <= 0.1)
+    Sij = np.where(small[:, None] & small[None, :], 1.0, Sij)
+    Mij = MWs[:, None]/MWs[None, :]
+    Mij45 = Mij**0.45
+    mij = (4./((1.0 + 1.0/Mij)*(1.0 + Mij)))**0.25
+    Aij = mij*Mij**-0.5*(1.0 + (Mij - Mij45)/(2.0*(1.0 + Mij)
+                                             + (1.0 + Mij45)*mij**-0.5/(1.0 + mij)))
+    phis = (mus[:, None]/mus[None, :])**0.5*Sij*Aij
+    denom = (ys[None, :]*phis).sum(axis=1)
+    return (ys*mus/denom).sum(axis=0)
+
+
+def lindsay_bromley(T, ys, ks, mus, Tbs, MWs):
+    Ss = 1.5*Tbs
+    S_roots = np.sqrt(Ss)
+    S_inv = 1.0/(T + Ss)
+    bigis = np.sqrt((T + Ss)*mus/(np.sqrt(MWs)*np.sqrt(np.sqrt(MWs))))
+    x0 = (T*S_inv)[:, None] + (S_roots*S_inv)[:, None]*S_roots[None, :]
+    big = 1.0 + bigis[:, None]/bigis[None, :]
+    Aij = big*big*x0
+    denom = (ys[None, :]*Aij).sum(axis=1)
+    return 4.0*(ys*ks/denom).sum(axis=0)
+
+
+def dippr9h(ws, ks):
+    return 1.0/np.sqrt((ws/(ks*ks)).sum(axis=0))
+
+
+def dippr9i(zs, Vms, ks):
+    phis = zs*Vms
+    phis = phis/phis.sum(axis=0)
+    kij = 2.0/(1.0/ks[:, None] + 1.0/ks[None, :])
+    return (phis[:, None]*phis[None, :]*kij).sum(axis=(0, 1))
+
+
+def filippov(ws, ks):
+    if len(ws) != 2 or len(ks) != 2:
+        raise ValueError("Filippov method is only defined for mixtures of"
+                         " two components")
+    return ws[0]*ks[0] + ws[1]*ks[1] - 0.72*ws[0]*ws[1]*(ks[1] - ks[0])
+
+
+def costald_mixture(xs, T, Tcs, Vcs, omegas):
+    sum1 = (xs*Vcs).sum(axis=0)
+    p = Vcs**(1.0/3.)
+    sum2 = (xs*p).sum(axis=0)
+    sum3 = (xs*p*p).sum(axis=0)
+    omega = (xs*omegas).sum(axis=0)
+    Vm = 0.25*(sum1 + 3.0*sum2*sum3)
+    vec = (Tcs*Vcs)**0.5*xs
+    Tcm = vec.sum(axis=0)**2/Vm
+    # Pure component COSTALD equation evaluated at the mixture parameters
+    T = np.minimum(T, Tcm)
+    Tr = T/Tcm
+    tau_cbrt = (1.0 - Tr)**(1.0/3.)
+    V_delta = (-0.296123 + Tr*(Tr*(-0.0480645*Tr - 0.0427258) + 0.386914)) \
+        / (Tr - 1.00001)
+    V_0 = tau_cbrt*(tau_cbrt*(tau_cbrt*(0.190454*tau_cbrt - 0.81446)
+                              + 1.43907) - 1.52816) + 1.0
+    return Vm*V_0*(1.0 - omega*V_delta)
+
+
+def rackett_mixture(T, xs, MWs, Tcs, Pcs, Zrs):
+    Tc = (Tcs*xs).sum(axis=0)
+    Zr = (Zrs*xs).sum(axis=0)
+    MW = (MWs*xs).sum(axis=0)
+    bigsum = (Tcs*xs/(Pcs*MWs)).sum(axis=0)
+    Tr = T/Tc
+    return (_R*bigsum*Zr**(1.0 + (1.0 - Tr)**(2.0/7.0)))*MW
+
+
+def mixing_simple(fracs, props):
+    return (fracs*props).sum(axis=0)
+
+
+def mixing_logarithmic(fracs, props):
+    return np.exp((fracs*np.log(props)).sum(axis=0))
+
+
+def mixing_power(fracs, props, r):
+    return (fracs*props**r).sum(axis=0)**(1.0/r)
+
+
+# Vectorized versions of the mixing rules offered by ``chemicals``, keyed by
+# the name of the corresponding ``chemicals`` function.  Each accepts the same
+# arguments, but per-component values are (Ncomp x N) or (Ncomp x 1) arrays
+# (see ``stack_components``) and conditions like ``T`` are scalars or length
+# N arrays, so a single call evaluates the mixture in every pore at once.
+vectorized_mixing_rules = {
+    'Herning_Zipperer': herning_zipperer,
+    'Wassiljewa_Herning_Zipperer': wassiljewa_herning_zipperer,
+    'Wilke': wilke,
+    'Brokaw': brokaw,
+    'Lindsay_Bromley': lindsay_bromley,
+    'DIPPR9H': dippr9h,
+    'DIPPR9I': dippr9i,
+    'Filippov': filippov,
+    'COSTALD_mixture': costald_mixture,
+    'Rackett_mixture': rackett_mixture,
+    'mixing_simple': mixing_simple,
+    'mixing_logarithmic': mixing_logarithmic,
+    'mixing_power': mixing_power,
+}
@@ -1,5 +1,6 @@
 import numpy as np
 from openpnm.models.phase import _phasedocs
+from openpnm.utils import elementwise as _elementwise
 
 
 __all__ = [
@@ -11,6 +12,7 @@ __all__ = [
 ]
 
 
+@_elementwise
 @_phasedocs
 def salinity(
     phase,
@@ -56,6 +58,7 @@ def salinity(
     return S
 
 
+@_elementwise
 @_phasedocs
 def mixing_rule(
     phase,
@@ -107,6 +110,7 @@ def mixing_rule(
     return z
 
 
+@_elementwise
 @_phasedocs
 def mole_to_mass_fraction(
     phase,
@@ -136,6 +140,7 @@ def mole_to_mass_fraction(
     return d
 
 
+@_elementwise
 @_phasedocs
 def mole_summation(phase):
     r"""
@@ -159,6 +164,7 @@ def mole_summation(phase):
     return xs
 
 
+@_elementwise
 @_phasedocs
 def from_component(phase, prop, compname):
     r"""
@@ -3,6 +3,7 @@ import os
 import numpy as np
 from pathlib import Path
 from openpnm.models.phase import _phasedocs
+from openpnm.utils import elementwise as _elementwise
 
 
 logger = logging.getLogger(__name__)
@@ -11,6 +12,7 @@ logger = logging.getLogger(__name__)
 __all__ = ["gaseous_species_in_water"]
 
 
+@_elementwise
 @_phasedocs
 def gaseous_species_in_water(
     phase,
@@ -1,5 +1,6 @@
 import numpy as np
 from openpnm.models.phase import _phasedocs
+from openpnm.utils import elementwise as _elementwise
 
 
 __all__ = [
@@ -9,6 +10,7 @@ __all__ = [
 ]
 
 
+@_elementwise
 @_phasedocs
 def water_correlation(
     phase,
@@ -61,6 +63,7 @@ def water_correlation(
     return value
 
 
+@_elementwise
 @_phasedocs
 def liquid_pure_bb(
     phase,
@@ -103,6 +106,7 @@ def liquid_pure_bb(
     return sigma
 
 
+@_elementwise
 @_phasedocs
 def liquid_mixture_wsd(
     phase,
@@ -1,5 +1,6 @@
 import numpy as np
 from openpnm.models.phase import _phasedocs
+from openpnm.utils import elementwise as _elementwise
 
 
 __all__ = [
@@ -12,6 +13,7 @@ __all__ = [
 ]
 
 
+@_elementwise
 @_phasedocs
 def water_correlation(
     phase,
@@ -67,6 +69,7 @@ def water_correlation(
     return value
 
 
+@_elementwise
 @_phasedocs
 def gas_pure_gismr(
     phase,
@@ -112,6 +115,7 @@ def gas_pure_gismr(
     return k
 
 
+@_elementwise
 @_phasedocs
 def liquid_pure_gismr(
     phase,
@@ -154,6 +158,7 @@ def liquid_pure_gismr(
     return k
 
 
+@_elementwise
 @_phasedocs
 def liquid_pure_sr(
     phase,
@@ -194,6 +199,7 @@ def liquid_pure_sr(
     return value
 
 
+@_elementwise
 @_phasedocs
 def liquid_mixture_DIPPR9I(
     phase,
@@ -238,6 +244,7 @@ def liquid_mixture_DIPPR9I(
     return kmix
 
 
+@_elementwise
 @_phasedocs
 def liquid_mixture_DIPPR9H(
     phase,
@@ -272,6 +279,7 @@ def liquid_mixture_DIPPR9H(
     return kmix
 
 
+@_elementwise
 @_phasedocs
 def gas_mixture_whz(
     phase,
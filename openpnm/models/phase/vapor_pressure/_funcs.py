@@ -1,5 +1,6 @@
 import numpy as np
 from openpnm.models.phase import _phasedocs
+from openpnm.utils import elementwise as _elementwise
 
 
 __all__ = [
@@ -9,6 +10,7 @@ __all__ = [
 ]
 
 
+@_elementwise
 @_phasedocs
 def water_correlation(phase, T='pore.temperature', salinity='pore.salinity'):
     r"""
@@ -56,6 +58,7 @@ def water_correlation(phase, T='pore.temperature', salinity='pore.salinity'):
     return value
 
 
+@_elementwise
 @_phasedocs
 def liquid_pure_lk(
     phase,
@@ -94,6 +97,7 @@ def liquid_pure_lk(
     return Pvap
 
 
+@_elementwise
 @_phasedocs
 def liquid_pure_antoine(
     phase,
@@ -1,6 +1,7 @@
 import numpy as np
 from openpnm.models.phase.mixtures import mixing_rule
 from openpnm.models.phase import _phasedocs
+from openpnm.utils import elementwise as _elementwise
 
 
 __all__ = [
@@ -13,6 +14,7 @@ __all__ = [
 ]
 
 
+@_elementwise
 @_phasedocs
 def water_correlation(
     phase,
@@ -75,6 +77,7 @@ def water_correlation(
     return value
 
 
+@_elementwise
 @_phasedocs
 def air_correlation(
     phase,
@@ -130,6 +133,7 @@ def air_correlation(
     return mu
 
 
+@_elementwise
 @_phasedocs
 def gas_pure_st(
     phase,
@@ -174,6 +178,7 @@ def gas_pure_st(
     return mu/1000
 
 
+@_elementwise
 @_phasedocs
 def gas_pure_gesmr(
     phase,
@@ -212,6 +217,7 @@ def gas_pure_gesmr(
     return mu
 
 
+@_elementwise
 @_phasedocs
 def gas_mixture_hz(
     phase,
@@ -249,6 +255,7 @@ def gas_mixture_hz(
     return mu
 
 
+@_elementwise
 @_phasedocs
 def liquid_pure_ls(
     phase,
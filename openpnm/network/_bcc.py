@@ -47,7 +47,8 @@ class BodyCenteredCubic(Network):
         if np.any(shape < 2):
             raise Exception('BCC lattice networks must have at least 2 '
                             'pores in all directions')
-        net = bcc(shape=shape, spacing=spacing,
+        index_dtype = self._get_index_dtype(2*np.prod(shape))
+        net = bcc(shape=shape, spacing=spacing, index_dtype=index_dtype,
                   node_prefix='pore', edge_prefix='throat')
         self.update(net)
         # Deal with labels
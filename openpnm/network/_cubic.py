@@ -52,21 +52,38 @@ class Cubic(Network):
         can specify 14 or 18, then use ``openpnm.topotools.trim`` to remove
         the face-to-face connections, which can be identified by looking
         for throats with a length equal to the network spacing.
+    chunk_size : int, optional
+        If given, the lattice is generated in slabs of approximately this
+        many pores and 'throat.conns' is stored as int32 when the number of
+        pores allows it, which bounds the memory needed to build very large
+        networks.  The resulting network is identical either way.
+    store : str, optional
+        The path of a directory in which to write 'pore.coords' and
+        'throat.conns' as ``.npy`` files.  These are used as memory mapped
+        arrays by the network, so the lattice never needs to be held in
+        memory in full.
 
     %(Network.parameters)s
 
     """
 
-    def __init__(self, shape, spacing=[1, 1, 1], connectivity=6, **kwargs):
+    def __init__(self, shape, spacing=[1, 1, 1], connectivity=6,
+                 chunk_size=None, store=None, **kwargs):
         super().__init__(**kwargs)
+        index_dtype = self._get_index_dtype(np.prod(shape))
+        if (chunk_size is not None) or (store is not None):
+            index_dtype = np.int32 if np.prod(shape) < 2**31 else np.int64
         net = skgr.generators.cubic(shape=shape, spacing=spacing,
                                     connectivity=connectivity,
-                                    node_prefix='pore', edge_prefix='throat')
+                                    node_prefix='pore', edge_prefix='throat',
+                                    index_dtype=index_dtype,
+                                    chunk_size=chunk_size, store=store)
         self.update(net)
         self._post_init()
         self["pore.surface"] = skgr.tools.find_surface_nodes_cubic(self)
         Ps = self["pore.surface"]
-        self["throat.surface"] = np.all(Ps[self["throat.conns"]], axis=1)
+        conns = self["throat.conns"]
+        self["throat.surface"] = Ps[conns[:, 0]] & Ps[conns[:, 1]]
         self.update(skgr.generators.tools.label_faces_cubic(self))
 
     def add_boundary_pores(self, labels=["top", "bottom", "front",
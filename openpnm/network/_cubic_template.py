@@ -43,6 +43,7 @@ class CubicTemplate(Network):
         template = np.atleast_3d(template)
         net = cubic_template(template=template,
                              spacing=spacing,
+                             index_dtype=self._get_index_dtype(template.size),
                              node_prefix='pore',
                              edge_prefix='throat')
         self.update(net)
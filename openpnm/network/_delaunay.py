@@ -1,3 +1,4 @@
+import numpy as np
 from openpnm.network import Network
 from openpnm.utils import Docorator
 from openpnm._skgraph.generators import delaunay
@@ -36,6 +37,16 @@ class Delaunay(Network):
     trim : bool, optional
         If ``True`` (default) then all vertices laying outside the domain will
         be removed. This is only useful if ``reflect=True``.
+    divs : int or array_like, optional
+        If given, the domain is split into this many tiles along each axis
+        which are triangulated separately and in parallel, then stitched
+        together.  This produces the same network as a single triangulation
+        but spreads the work for very large numbers of points over several
+        cores.
+        In this case the ``tri`` attribute is ``None``.
+    cores : int, optional
+        The number of processes to use when ``divs`` is given.  The default
+        is to use all available cores.
 
     %(Network.parameters)s
 
@@ -51,14 +62,20 @@ class Delaunay(Network):
 
     """
 
-    def __init__(self, shape, points, reflect=True, trim=True, **kwargs):
+    def __init__(self, shape, points, reflect=True, trim=True, divs=None,
+                 cores=None, **kwargs):
         super().__init__(**kwargs)
+        # Reflection at most adds a copy of the points across each face
+        n = 7*(points if np.isscalar(points) else len(points))
         net, tri = delaunay(points=points,
                             shape=shape,
                             reflect=reflect,
                             trim=trim,
                             node_prefix='pore',
-                            edge_prefix='throat')
+                            edge_prefix='throat',
+                            divs=divs,
+                            cores=cores,
+                            index_dtype=self._get_index_dtype(n))
         self.update(net)
         self._post_init()
         self.tri = tri
@@ -64,13 +64,17 @@ class DelaunayVoronoiDual(Network):
         **kwargs
     ):
         super().__init__(**kwargs)
+        # A generous bound on the number of base points and Voronoi vertices,
+        # of which there are about 7 per point in 3D including reflections
+        n = 64*(points if np.isscalar(points) else len(points))
         net, vor, tri = voronoi_delaunay_dual(shape=shape,
                                               points=points,
                                               trim=trim,
                                               reflect=reflect,
                                               relaxation=relaxation,
                                               node_prefix='pore',
-                                              edge_prefix='throat')
+                                              edge_prefix='throat',
+                                              index_dtype=self._get_index_dtype(n))
         self.update(net)
         self._post_init()
         self.vor = vor
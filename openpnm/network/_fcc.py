@@ -47,7 +47,8 @@ class FaceCenteredCubic(Network):
         if np.any(shape < 2):
             raise Exception('FCC lattice networks must have at least 2 '
                             'pores in all directions')
-        net = fcc(shape=shape, spacing=spacing,
+        index_dtype = self._get_index_dtype(4*np.prod(shape))
+        net = fcc(shape=shape, spacing=spacing, index_dtype=index_dtype,
                   node_prefix='pore', edge_prefix='throat')
         self.update(net)
         # Add labels
@@ -6,6 +6,7 @@ from openpnm.core import Domain
 from openpnm import topotools
 from openpnm.utils import Docorator
 from openpnm.utils import Workspace
+from openpnm.utils import compact_array, is_compact
 import openpnm.models.network as mods
 logger = logging.getLogger(__name__)
 ws = Workspace()
@@ -86,15 +87,18 @@ class Network(Domain):
 
     All of the topological queries are accomplished by inspecting the
     adjacency and incidence matrices. They are created on demand, and are
-    stored for future use to save construction time.
+    stored for future use to save construction time.  The stored matrices
+    are discarded automatically whenever 'throat.conns' is written or the
+    number of pores changes, but not if the 'throat.conns' array is edited
+    in place, so after doing so call ``invalidate_topology``.
 
     """
 
     def __init__(self, conns=None, coords=None, name='net', **kwargs):
+        self._topology = {}
+        self._kdtree = None
         super().__init__(name=name, **kwargs)
         self.settings._update(NetworkSettings())
-        self._am = {}
-        self._im = {}
 
         if coords is not None:
             coords = np.array(coords)
@@ -125,7 +129,164 @@ class Network(Domain):
             if np.any(value[:, 0] > value[:, 1]):
                 logger.warning('Converting throat.conns to be upper triangular')
                 value = np.sort(value, axis=1)
-        super().__setitem__(key, value)
+            self.invalidate_topology()
+        super().__setitem__(key, self._apply_precision(key, value))
+
+    def update(self, *args, **kwargs):
+        d = dict(*args, **kwargs)
+        super().update({k: self._apply_precision(k, v) for k, v in d.items()})
+
+    def _apply_precision(self, key, value):
+        # Casts data to the types requested by the project's settings, see
+        # ProjectSettings for details
+        if not isinstance(value, np.ndarray) or (value.size == 0):
+            return value
+        if key == 'throat.conns':
+            if (value.dtype.kind in 'iu') and (value.dtype != np.int32):
+                dtype = self._get_index_dtype(value.max() + 1)
+                value = value.astype(dtype, copy=False)
+        elif (value.dtype.kind == 'f') and (key != 'pore.coords'):
+            dtype = self._get_float_dtype()
+            if value.dtype.itemsize > dtype.itemsize:
+                if is_compact(value):
+                    value = compact_array(value[:1].astype(dtype),
+                                          value.shape[0])
+                else:
+                    value = value.astype(dtype)
+        return value
+
+    def _get_stored_arrays(self):
+        items = super()._get_stored_arrays()
+        # Include the cached topology and kd-tree since they can be large
+        for k, v in self._topology.items():
+            if k != 'stamp':
+                items.append((f'_topology.{k}', 'cache', v))
+        if self._kdtree is not None:
+            items.append(('_kdtree', 'cache', self._kdtree))
+        return items
+
+    def _get_float_dtype(self):
+        proj = self.project
+        if proj is None:
+            return np.dtype(np.float64)
+        return np.dtype(getattr(proj.settings, 'geometry_dtype', 'float64'))
+
+    def invalidate_topology(self):
+        r"""
+        Discards the stored adjacency and incidence matrices so they are
+        regenerated on their next use
+
+        Notes
+        -----
+        This is done automatically when 'throat.conns' is assigned or the
+        number of pores changes, so it is only needed after modifying the
+        values of the 'throat.conns' array in place, or replacing it without
+        assigning it to the network (e.g. with ``dict.__setitem__``).
+
+        """
+        self._mark_written('throat.conns')
+        self._topology.clear()
+        self._kdtree = None
+
+    def _remap_topology(self, Pkeep, Tkeep):
+        r"""
+        Updates the stored adjacency and incidence matrices after pores and
+        throats have been removed, instead of discarding them
+
+        Parameters
+        ----------
+        Pkeep, Tkeep : ndarray
+            Boolean masks of the pores and throats that were kept, relative
+            to the matrices that are currently stored.
+
+        Notes
+        -----
+        This must be called after the new 'throat.conns' array has been
+        written.  Entries for removed throats are dropped and the remaining
+        pore and throat indices are renumbered, which keeps the rows and
+        columns in the same order as a full rebuild would produce.
+
+        """
+        old = self._topology
+        new = {}
+        Tmap = np.cumsum(Tkeep) - 1
+        for key in ['am', 'im']:
+            if key not in old:
+                continue
+            mat = old[key]
+            keep = Tkeep[mat.data]
+            # The number of kept entries before each location gives the new
+            # location of each entry, and the removed pores have none left
+            locs = np.zeros(keep.size + 1, dtype=int)
+            np.cumsum(keep, out=locs[1:])
+            indptr = np.append(locs[mat.indptr[:-1]][Pkeep], locs[-1])
+            data = Tmap[mat.data[keep]].astype(mat.data.dtype)
+            Np = indptr.size - 1
+            if key == 'am':
+                Pmap = np.cumsum(Pkeep) - 1
+                indices = Pmap[mat.indices[keep]]
+                shape = (Np, Np)
+                if 'positions' in old:
+                    new['positions'] = \
+                        locs[old['positions'][Tkeep]].astype(data.dtype)
+            else:
+                indices = data
+                shape = (Np, Tmap[-1] + 1)
+                new['degree'] = np.diff(indptr).astype(old['degree'].dtype)
+            new[key] = sprs.csr_matrix((data, indices, indptr), shape=shape)
+        old.clear()
+        old['stamp'] = self._topology_stamp()
+        old.update(new)
+
+    def _topology_stamp(self):
+        # The write version of 'throat.conns' (see _get_version), which
+        # changes whenever it is assigned or invalidate_topology is called
+        return (self._get_version('throat.conns'), self.Np)
+
+    def _get_topology(self, key):
+        r"""
+        Fetches an item from the topology cache, building it if necessary
+
+        The available items are:
+
+        ==============  ======================================================
+        key             description
+        ==============  ======================================================
+        'am'            The adjacency matrix in CSR format with throat indices
+                        as the values, and the column indices sorted
+        'positions'     An Nt-by-2 array with the location in ``am.data`` of
+                        the [upper, lower] triangular entries of each throat
+        'im'            The incidence matrix in CSR format with throat indices
+                        as the values, and the column indices sorted
+        'degree'        The number of throats connected to each pore
+        'laplacian'     The row and column indices of the entries of the
+                        Laplacian matrix in COO format, being the [upper,
+                        lower] triangular entries of each throat followed by
+                        the diagonal
+        ==============  ======================================================
+
+        """
+        conns = self['throat.conns']
+        top = self._topology
+        stamp = self._topology_stamp()
+        if top.get('stamp') != stamp:
+            top.clear()
+            top['stamp'] = stamp
+        if key not in top:
+            dtype = self._get_index_dtype(max(2*conns.shape[0], self.Np))
+            if key in ['am', 'positions']:
+                top.update(_build_adjacency(conns, self.Np, dtype))
+            elif key in ['im', 'degree']:
+                top.update(_build_incidence(conns, self.Np, dtype))
+            elif key == 'laplacian':
+                Ps = np.arange(self.Np, dtype=dtype)
+                top[key] = (np.concatenate((conns[:, 0], conns[:, 1], Ps)),
+                            np.concatenate((conns[:, 1], conns[:, 0], Ps)))
+            else:
+                fmt = key.split('.', 1)[-1]
+                top[key] = getattr(self._get_topology(key.split('.')[0]),
+                                   f'to{fmt}')()
+        return top[key]
 
     def get_adjacency_matrix(self, fmt='coo'):
         r"""
@@ -155,13 +316,9 @@ class Network(Domain):
         entries, use ``sp.sparse.triu(am, k=1)``.
 
         """
-        # Retrieve existing matrix if available
-        if fmt in self._am.keys():
-            am = self._am[fmt]
-        else:
-            am = self.create_adjacency_matrix(weights=self.Ts, fmt=fmt)
-            self._am[fmt] = am
-        return am
+        if fmt == 'csr':
+            return self._get_topology('am')
+        return self._get_topology(f'am.{fmt}')
 
     def get_incidence_matrix(self, fmt='coo'):
         r"""
@@ -188,17 +345,9 @@ class Network(Domain):
         non-zero location use ``create_incidence_matrix``.
 
         """
-        if fmt in self._im.keys():
-            im = self._im[fmt]
-        elif self._im.keys():
-            im = self._im[list(self._im.keys())[0]]
-            tofmt = getattr(im, f"to{fmt}")
-            im = tofmt()
-            self._im[fmt] = im
-        else:
-            im = self.create_incidence_matrix(weights=self.Ts, fmt=fmt)
-            self._im[fmt] = im
-        return im
+        if fmt == 'csr':
+            return self._get_topology('im')
+        return self._get_topology(f'im.{fmt}')
 
     im = property(fget=get_incidence_matrix)
 
@@ -270,6 +419,31 @@ class Network(Domain):
             raise Exception('Received weights are of incorrect length')
         weights = np.array(weights)
 
+        if fmt != 'coo':
+            # Place the weights into the stored CSR structure, which avoids
+            # sorting the entries each time
+            am = self._get_topology('am')
+            pos = self._get_topology('positions')
+            data = np.zeros(am.data.shape, dtype=weights.dtype)
+            if weights.shape == (2 * self.Nt, ):
+                weights = weights.reshape((2, self.Nt)).T
+            if weights.shape == (self.Nt, 2):
+                data[pos[:, 0]] = weights[:, 0]
+                data[pos[:, 1]] = weights[:, 1]
+                triu = False
+            else:
+                data[pos[:, 0]] = weights
+                data[pos[:, 1]] = weights
+            temp = sprs.csr_matrix((data, am.indices.copy(), am.indptr.copy()),
+                                   shape=am.shape)
+            if triu:
+                temp = sprs.triu(temp, k=1, format='csr')
+            if drop_zeros:
+                temp.eliminate_zeros()
+            # Duplicate throats are summed, as when converting from COO
+            temp.sum_duplicates()
+            return temp if fmt == 'csr' else getattr(temp, f'to{fmt}')()
+
         # Append row & col to each other, and data to itself
         conn = self['throat.conns']
         row = conn[:, 0]
@@ -362,6 +536,16 @@ class Network(Domain):
         elif np.shape(weights)[0] != self.Nt:
             raise Exception('Received dataset of incorrect length')
 
+        weights = np.array(weights)
+        if fmt != 'coo':
+            im = self._get_topology('im')
+            temp = sprs.csr_matrix(
+                (weights[im.data], im.indices.copy(), im.indptr.copy()),
+                shape=im.shape)
+            if drop_zeros:
+                temp.eliminate_zeros()
+            return temp if fmt == 'csr' else getattr(temp, f'to{fmt}')()
+
         conn = self['throat.conns']
         row = conn[:, 0]
         row = np.append(row, conn[:, 1])
@@ -386,7 +570,8 @@ class Network(Domain):
 
         return temp
 
-    def find_connected_pores(self, throats=[], flatten=False, mode='or'):
+    def find_connected_pores(self, throats=[], flatten=False, mode='or',
+                             ragged=False):
         r"""
         Return a list of pores connected to the given list of throats
 
@@ -420,10 +605,19 @@ class Network(Domain):
                          accepts 'intersection' and 'all'
             ===========  =====================================================
 
+        ragged : bool
+            If ``True`` the result is returned as a ragged array in the
+            form of an ``(indptr, indices)`` tuple, where the pores of
+            input throat ``i`` are ``indices[indptr[i]:indptr[i+1]]``.
+            This is computed directly from 'throat.conns' so is much
+            faster than ``flatten=False`` for large numbers of throats,
+            and overrides ``flatten``.  The default is ``False``.
+
         Returns
         -------
         1D array (if ``flatten`` is ``True``) or ndarray of arrays (if
-        ``flatten`` is ``False``)
+        ``flatten`` is ``False``), or a tuple of arrays (if ``ragged`` is
+        ``True``)
 
         Examples
         --------
@@ -440,7 +634,8 @@ class Network(Domain):
         """
         Ts = self._parse_indices(throats)
         pores = topotools.find_connected_sites(bonds=Ts, network=self,
-                                               flatten=flatten, logic=mode)
+                                               flatten=flatten, logic=mode,
+                                               ragged=ragged)
         return pores
 
     def find_connecting_throat(self, P1, P2):
@@ -479,11 +674,12 @@ class Network(Domain):
 
         """
         sites = np.vstack((P1, P2)).T
-        Ts = topotools.find_connecting_bonds(sites=sites, network=self)
+        am = self.get_adjacency_matrix(fmt='csr')
+        Ts = topotools.find_connecting_bonds(sites=sites, am=am)
         return Ts
 
     def find_neighbor_pores(self, pores, mode='or', flatten=True,
-                            include_input=False, asmask=False):
+                            include_input=False, asmask=False, ragged=False):
         r"""
         Returns a list of pores that are direct neighbors to the given pore(s)
 
@@ -527,13 +723,21 @@ class Network(Domain):
             If ``False`` (default), the returned result is a list of the
             neighboring pores as indices. If ``True``, the returned result is a
             boolean mask. (Useful for labelling)
+        ragged : bool
+            If ``True`` the result is returned as a ragged array in the
+            form of an ``(indptr, indices)`` tuple, where the neighbors of
+            input pore ``i`` are ``indices[indptr[i]:indptr[i+1]]``.
+            This is computed directly from the stored adjacency matrix so is
+            much faster than ``flatten=False`` for large numbers of
+            pores, and overrides ``flatten``.  The default is ``False``.
 
         Returns
         -------
         If ``flatten`` is ``True``, returns a 1D array of pore indices
         filtered according to the specified mode.  If ``flatten`` is
         ``False``, returns a list of lists, where each list contains the
-        neighbors of the corresponding input pores.
+        neighbors of the corresponding input pores.  If ``ragged`` is
+        ``True`` returns an ``(indptr, indices)`` tuple.
 
         Notes
         -----
@@ -562,6 +766,12 @@ class Network(Domain):
         [ 1  5 25]
         >>> print(Ps[1])
         [ 1  3  7 27]
+        >>> indptr, indices = pn.find_neighbor_pores(pores=[0, 2],
+        ...                                          ragged=True)
+        >>> print(indptr)
+        [0 3 7]
+        >>> print(indices)
+        [ 1  5 25  1  3  7 27]
         >>> Ps = pn.find_neighbor_pores(pores=[0, 2], mode='xnor')
         >>> print(Ps)
         [1]
@@ -571,22 +781,24 @@ class Network(Domain):
 
         """
         pores = self._parse_indices(pores)
-        if np.size(pores) == 0:
+        if (np.size(pores) == 0) and not ragged:
             return np.array([], ndmin=1, dtype=int)
+        am = self.get_adjacency_matrix(fmt='csr')
         neighbors = topotools.find_neighbor_sites(sites=pores, logic=mode,
-                                                  network=self,
+                                                  network=self, am=am,
                                                   flatten=flatten,
-                                                  include_input=include_input)
+                                                  include_input=include_input,
+                                                  ragged=ragged)
         if asmask is False:
             return neighbors
-        elif flatten is True:
+        elif (flatten is True) and not ragged:
             neighbors = self._tomask(element='pore', indices=neighbors)
             return neighbors
         else:
             raise Exception('Cannot create mask on an unflattened output')
 
     def find_neighbor_throats(self, pores, mode='or', flatten=True,
-                              asmask=False):
+                              asmask=False, ragged=False):
         r"""
         Returns a list of throats neighboring the given pore(s)
 
@@ -624,13 +836,21 @@ class Network(Domain):
             If ``False`` (default), the returned result is a list of the
             neighboring throats as indices. If ``True``, the returned result is a
             boolean mask. (Useful for labelling)
+        ragged : bool
+            If ``True`` the result is returned as a ragged array in the
+            form of an ``(indptr, indices)`` tuple, where the neighbors of
+            input pore ``i`` are ``indices[indptr[i]:indptr[i+1]]``.
+            This is computed directly from the stored incidence matrix so is
+            much faster than ``flatten=False`` for large numbers of
+            pores, and overrides ``flatten``.  The default is ``False``.
 
         Returns
         -------
         If ``flatten`` is ``True``, returns a 1D array of throat indices
         filtered according to the specified mode.  If ``flatten`` is
         ``False``, returns a list of lists, where each list contains the
-        neighbors of the corresponding input pores.
+        neighbors of the corresponding input pores.  If ``ragged`` is
+        ``True`` returns an ``(indptr, indices)`` tuple.
 
         Notes
         -----
@@ -655,18 +875,20 @@ class Network(Domain):
 
         """
         pores = self._parse_indices(pores)
-        if np.size(pores) == 0:
+        if (np.size(pores) == 0) and not ragged:
             return np.array([], ndmin=1, dtype=int)
-        if flatten is False:
+        if (flatten is False) or ragged:
+            im = self.get_incidence_matrix(fmt='csr')
             neighbors = topotools.find_neighbor_bonds(sites=pores, logic=mode,
-                                                      network=self,
-                                                      flatten=flatten)
+                                                      network=self, im=im,
+                                                      flatten=flatten,
+                                                      ragged=ragged)
         else:
             neighbors = topotools.find_neighbor_bonds(sites=pores, logic=mode,
                                                       network=self, flatten=True)
         if asmask is False:
             return neighbors
-        elif flatten is True:
+        elif (flatten is True) and not ragged:
             neighbors = self._tomask(element='throat', indices=neighbors)
             return neighbors
         else:
@@ -743,12 +965,58 @@ class Network(Domain):
             num = self.find_neighbor_pores(pores, flatten=flatten,
                                            mode=mode, include_input=True)
             num = np.size(num)
-        else:   # Could be done much faster if flatten == False
-            am = self.create_adjacency_matrix(fmt="csr")
-            num = am[pores].sum(axis=1).A1
+        else:
+            num = self._get_topology('degree')[pores]
         return num
 
-    def find_nearby_pores(self, pores, r, flatten=False, include_input=False):
+    def get_kdtree(self):
+        r"""
+        KD-tree of the pore coordinates, for use in spatial queries
+
+        Returns
+        -------
+        tree : scipy.spatial.cKDTree
+            A tree built from 'pore.coords'
+
+        Notes
+        -----
+        The tree is built on first use and stored for later calls.  It keeps
+        its own copy of the coordinates, which is compared to 'pore.coords'
+        on each call, so the tree is rebuilt whenever pores are moved, added
+        or removed, including by editing 'pore.coords' in place.  This
+        comparison is much faster than building the tree.
+
+        """
+        coords = self['pore.coords']
+        tree = self._kdtree
+        if (tree is None) or (tree.data.shape != coords.shape) \
+                or not np.array_equal(tree.data, coords):
+            self._kdtree = sptl.cKDTree(coords, balanced_tree=False,
+                                        copy_data=True)
+        return self._kdtree
+
+    def _query_radius(self, pores, r):
+        # Finds the pores within r of each given pore, excluding itself,
+        # and returns them as a ragged (indptr, indices) pair
+        tree = self.get_kdtree()
+        if np.array_equal(pores, self.Ps):
+            pairs = tree.query_pairs(r=r, output_type='ndarray')
+            rows = np.concatenate((pairs[:, 0], pairs[:, 1]))
+            cols = np.concatenate((pairs[:, 1], pairs[:, 0]))
+        else:
+            sub = sptl.cKDTree(self['pore.coords'][pores])
+            hits = sub.sparse_distance_matrix(tree, max_distance=r,
+                                              output_type='ndarray')
+            rows, cols = hits['i'], hits['j']
+            keep = cols != pores[rows]
+            rows, cols = rows[keep], cols[keep]
+        order = np.lexsort((cols, rows))
+        indptr = np.zeros(len(pores) + 1, dtype=int)
+        np.cumsum(np.bincount(rows, minlength=len(pores)), out=indptr[1:])
+        return indptr, cols[order].astype(np.int64)
+
+    def find_nearby_pores(self, pores, r, flatten=False, include_input=False,
+                          ragged=False):
         r"""
         Find all pores within a given radial distance of the input pore(s)
         regardless of whether or not they are toplogically connected.
@@ -771,6 +1039,11 @@ class Network(Domain):
             criteria, otherwise returns an array containing a sub-array for
             each input pore, where each sub-array contains the pores that
             are nearby to each given input pore.  The default is False.
+        ragged : bool
+            If ``True`` the result for each input pore is returned as a
+            ragged array, which is much faster than creating a list of
+            sub-arrays when many pores are given (see Returns).  This
+            overrides ``flatten``.  The default is False.
 
         Returns
         -------
@@ -779,6 +1052,10 @@ class Network(Domain):
             such lists is returned.  The returned lists each contain the
             pore for which the neighbors were sought.
 
+            If ``ragged`` is ``True`` a tuple of ``(indptr, indices)`` is
+            returned, where the pores near input pore ``i`` are
+            ``indices[indptr[i]:indptr[i+1]]``.
+
         Examples
         --------
         >>> import openpnm as op
@@ -794,40 +1071,96 @@ class Network(Domain):
         >>> Ps = pn.find_nearby_pores(pores=[0, 1], r=1, flatten=True)
         >>> print(Ps)
         [ 2  3  4  9 10]
+        >>> indptr, indices = pn.find_nearby_pores(pores=[0, 1], r=1,
+        ...                                        ragged=True)
+        >>> print(indptr)
+        [0 2 5]
+        >>> print(indices)
+        [ 3  9  2  4 10]
 
         """
         pores = self._parse_indices(pores)
         # Handle an empty array if given
         if np.size(pores) == 0:
+            if ragged:
+                return np.zeros(1, dtype=int), np.array([], dtype=np.int64)
             return np.array([], dtype=np.int64)
         if r <= 0:
             raise Exception('Provided distances should be greater than 0')
-        # Create kdTree objects
-        kd = sptl.cKDTree(self['pore.coords'])
-        kd_pores = sptl.cKDTree(self['pore.coords'][pores])
-        # Perform search
-        Ps_within_r = kd_pores.query_ball_tree(kd, r=r)
-        # Remove self from each list
-        for i, P in enumerate(Ps_within_r):
-            Ps_within_r[i].remove(pores[i])
-        # Convert to flattened list by default
-        temp = np.concatenate((Ps_within_r))
-        Pn = np.unique(temp).astype(np.int64)
+        indptr, indices = self._query_radius(pores, r)
         # Remove inputs if necessary
         if include_input is False:
-            Pn = Pn[~np.in1d(Pn, pores)]
-        # Convert list of lists to a list of ndarrays
-        if flatten is False:
-            if len(Pn) == 0:  # Deal with no nearby neighbors
-                Pn = [np.array([], dtype=np.int64) for i in pores]
-            else:
-                mask = np.zeros(shape=np.amax((Pn.max(), pores.max())) + 1, dtype=bool)
-                mask[Pn] = True
-                temp = []
-                for item in Ps_within_r:
-                    temp.append(np.array(item, dtype=np.int64)[mask[item]])
-                Pn = temp
-        return Pn
+            keep = ~self._tomask(element='pore', indices=pores)[indices]
+            n = len(pores)
+            rows = np.repeat(np.arange(n), np.diff(indptr))
+            counts = np.bincount(rows[keep], minlength=n)
+            indices = indices[keep]
+            indptr = np.zeros_like(indptr)
+            np.cumsum(counts, out=indptr[1:])
+        if ragged:
+            return indptr, indices
+        if flatten:
+            return np.unique(indices)
+        return np.split(indices, indptr[1:-1])
+
+    def find_nearest_pores(self, pores, k=1, r=np.inf, ragged=False):
+        r"""
+        Find the ``k`` nearest pores to each of the input pore(s) regardless
+        of whether or not they are topologically connected.
+
+        Parameters
+        ----------
+        pores : array_like
+            The list of pores for whom the nearest neighbors are sought
+        k : int
+            The number of neighbors to find for each pore.  The default is 1.
+        r : scalar
+            The maximum distance to search for neighbors.  The default is
+            ``inf``, so exactly ``k`` neighbors are found for each pore if
+            the network has enough pores.
+        ragged : bool
+            If ``True`` the result is returned as a ragged array, which is
+            useful when ``r`` is given since pores may have fewer than ``k``
+            neighbors within ``r`` (see Returns).  The default is False.
+
+        Returns
+        -------
+        neighbors : ndarray
+            An N-by-k array with the indices of the neighbors of each input
+            pore sorted by increasing distance.  Locations where fewer than
+            ``k`` pores were found within ``r`` contain -1.  If ``ragged`` is
+            ``True`` a tuple of ``(indptr, indices)`` is returned instead,
+            where the neighbors of input pore ``i`` are
+            ``indices[indptr[i]:indptr[i+1]]``.
+
+        Examples
+        --------
+        >>> import openpnm as op
+        >>> pn = op.network.Cubic(shape=[3, 3, 3])
+        >>> pn['pore.coords'][1] += [0, 0, 0.2]
+        >>> print(pn.find_nearest_pores(pores=[1, 2], k=1))
+        [[2]
+         [1]]
+
+        """
+        pores = self._parse_indices(pores)
+        tree = self.get_kdtree()
+        # Query one extra point since each pore finds itself
+        d, ids = tree.query(self['pore.coords'][pores], k=k+1,
+                            distance_upper_bound=r)
+        ids = ids.reshape((len(pores), k+1))
+        valid = (ids != pores[:, None]) & (ids < self.Np)
+        # Discard the last point if the pore did not find itself, which can
+        # happen when several pores are coincident
+        valid &= np.cumsum(valid, axis=1) <= k
+        if ragged:
+            indptr = np.zeros(len(pores) + 1, dtype=int)
+            np.cumsum(valid.sum(axis=1), out=indptr[1:])
+            return indptr, ids[valid].astype(np.int64)
+        neighbors = np.full((len(pores), k), -1, dtype=np.int64)
+        counts = valid.sum(axis=1)
+        neighbors[np.arange(k) < counts[:, None]] = ids[valid]
+        return neighbors
 
     @property
     def info(self):
@@ -893,3 +1226,30 @@ class Network(Domain):
     def coords(self):
         r"""Returns the list of pore coordinates of the network."""
         return self['pore.coords']
+
+
+def _build_adjacency(conns, Np, dtype=int):
+    # Sort the entries for both directions of each throat by row then column
+    Nt = conns.shape[0]
+    rows = conns.flatten()
+    cols = conns[:, ::-1].flatten()
+    order = np.lexsort((cols, rows))
+    indptr = np.zeros(Np + 1, dtype=int)
+    np.cumsum(np.bincount(rows, minlength=Np), out=indptr[1:])
+    data = (order // 2).astype(dtype, copy=False)
+    am = sprs.csr_matrix((data, cols[order], indptr), shape=(Np, Np))
+    positions = np.empty(2*Nt, dtype=dtype)
+    positions[order] = np.arange(2*Nt)
+    return {'am': am, 'positions': positions.reshape((Nt, 2))}
+
+
+def _build_incidence(conns, Np, dtype=int):
+    # A stable sort by pore keeps the throats of each pore in order
+    Nt = conns.shape[0]
+    rows = conns.flatten()
+    Ts = (np.argsort(rows, kind='stable') // 2).astype(dtype, copy=False)
+    degree = np.bincount(rows, minlength=Np).astype(dtype, copy=False)
+    indptr = np.zeros(Np + 1, dtype=int)
+    np.cumsum(degree, out=indptr[1:])
+    im = sprs.csr_matrix((Ts, Ts, indptr), shape=(Np, Nt))
+    return {'im': im, 'degree': degree}
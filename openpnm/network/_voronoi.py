@@ -1,3 +1,4 @@
+import numpy as np
 from openpnm.network import Network
 from openpnm.utils import Docorator
 from openpnm.topotools import label_faces
@@ -71,13 +72,17 @@ class Voronoi(Network):
         **kwargs
     ):
         super().__init__(**kwargs)
+        # A generous bound on the number of Voronoi vertices, of which there
+        # are about 7 per point in 3D including any reflected points
+        n = 64*(points if np.isscalar(points) else len(points))
         net, vor = voronoi(points=points,
                            shape=shape,
                            trim=trim,
                            reflect=reflect,
                            relaxation=relaxation,
                            node_prefix='pore',
-                           edge_prefix='throat')
+                           edge_prefix='throat',
+                           index_dtype=self._get_index_dtype(n))
         self.update(net)
         self._post_init()
         self.vor = vor
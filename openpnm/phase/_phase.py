@@ -1,7 +1,8 @@
 import logging
 import numpy as np
 from openpnm.core import Domain
-from openpnm.utils import Workspace, Docorator
+from openpnm.utils import Workspace, Docorator, PrintableDict
+from openpnm.utils._compact import _state
 
 
 docstr = Docorator()
@@ -45,6 +46,7 @@ class Phase(Domain):
     """
 
     def __init__(self, network, name='phase_?', **kwargs):
+        self._interpolated = {}
         super().__init__(network=network, name=name, **kwargs)
         self.settings._update(PhaseSettings())
         # Set standard conditions on the phase
@@ -66,8 +68,9 @@ class Phase(Domain):
                 temp = self._initialize_empty_array_like(value, element)
                 self[element + '.' + prop] = temp
             # Insert values into masked locations
-            mask = self.project._get_locations(element + '.' + domain)
-            temp[mask] = value
+            locs = self.project._get_domain_indices(element + '.' + domain)
+            temp[locs] = value
+            self._mark_written(element + '.' + prop)
 
     def __getitem__(self, key):
         try:  # If key exists, just get it
@@ -100,14 +103,56 @@ class Phase(Domain):
                     raise KeyError(key)
                 elif (element == 'throat') and ('pore.'+prop not in self.keys()):
                     raise KeyError(key)
-                vals = self.interpolate_data(element + '.' + prop)
+                vals = self._get_interpolated_data(element + '.' + prop)
             else:
                 raise KeyError(key)
 
         # Finally get locs
         if domain == 'all':
-            locs = np.ones(self._count(element), dtype=bool)
-        else:
-            locs = self.project._get_locations(element + '.' + domain)
-
+            return np.array(vals)
+        if _state['uniform'] and (vals.shape[0] == 1):
+            return vals
+        locs = self.project._get_domain_indices(element + '.' + domain)
         return vals[locs]
+
+    def _get_interpolated_data(self, propname):
+        # Reuse the previously interpolated values unless the source data
+        # or the network topology have been written since
+        element, prop = propname.split('.', 1)
+        source = ('pore.' if element == 'throat' else 'throat.') + prop
+        version = (self._get_version(source),
+                   self.network._get_version('throat.conns'))
+        try:
+            cached, vals = self._interpolated[propname]
+            if cached == version:
+                return vals
+        except KeyError:
+            pass
+        vals = self.interpolate_data(propname)
+        self._interpolated[propname] = (version, vals)
+        return vals
+
+    @property
+    def interpolated(self):
+        r"""
+        A dictionary of the properties that are currently being generated by
+        interpolating the neighboring pore or throat values, along with the
+        property from which they are derived
+
+        Notes
+        -----
+        When ``auto_interpolate`` is ``True``, a missing property such as
+        ``'throat.viscosity'`` is computed from ``'pore.viscosity'`` the first
+        time it is requested.  The result is cached and reused until the
+        source array or the network topology are written (see
+        ``_get_version``), which includes the in-place writes made by
+        ``run_model``. A source array that is changed in place by other means
+        must be assigned back to the phase.
+        """
+        d = PrintableDict(key='Interpolated', value='Source')
+        for k in self._interpolated.keys():
+            element, prop = k.split('.', 1)
+            source = ('pore.' if element == 'throat' else 'throat.') + prop
+            if (k not in self.keys()) and (source in self.keys()):
+                d[k] = source
+        return d
@@ -0,0 +1,57 @@
+import numpy as np
+from scipy.sparse import csr_matrix, csc_matrix
+from scipy.sparse.linalg import cg, splu, LinearOperator
+from openpnm.solvers import IterativeSolver
+from openpnm.topotools import prolongation_matrix
+
+__all__ = ['TwoLevelCG']
+
+
+class TwoLevelCG(IterativeSolver):
+    r"""
+    Solves a linear system using ``scipy.sparse.linalg.cg`` with a two-level
+    preconditioner built from aggregates of pores
+
+    Parameters
+    ----------
+    aggregates : array_like
+        The number of the aggregate to which each pore belongs, numbered
+        from 0, such as produced by ``op.topotools.find_aggregates``.
+    tol : float
+        The relative tolerance of the solution
+    maxiter : int
+        The maximum number of iterations
+
+    Notes
+    -----
+    The preconditioner adds a Jacobi sweep on the fine pores to an exact
+    solve of the Galerkin coarse system ``P.T @ A @ P``, where ``P`` is the
+    prolongation matrix of the aggregates.  The coarse system removes the
+    smooth error components which Jacobi alone is very slow to reduce, so
+    the number of iterations grows much more slowly with the size of the
+    network.
+
+    """
+
+    def __init__(self, aggregates, tol=1e-8, maxiter=1000):
+        super().__init__(tol=tol, maxiter=maxiter)
+        self.aggregates = np.asarray(aggregates)
+
+    def solve(self, A, b, **kwargs):
+        """Solves the given linear system of equations Ax=b."""
+        if not isinstance(A, (csr_matrix, csc_matrix)):
+            A = A.tocsr()
+        M = self._get_preconditioner(A)
+        atol = self._get_atol(b)
+        return cg(A, b, tol=self.tol, atol=atol, maxiter=self.maxiter, M=M,
+                  **kwargs)
+
+    def _get_preconditioner(self, A):
+        P = prolongation_matrix(self.aggregates)
+        lu = splu((P.T @ A @ P).tocsc())
+        Dinv = 1.0/A.diagonal()
+
+        def apply(r):
+            return Dinv*r + P @ lu.solve(P.T @ r)
+
+        return LinearOperator(A.shape, matvec=apply, dtype=float)
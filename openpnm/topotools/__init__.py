@@ -10,3 +10,4 @@ network topology.
 from ._topotools import *
 from ._perctools import *
 from ._graphtools import *
+from ._coarsening import *
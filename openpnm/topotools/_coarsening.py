@@ -0,0 +1,299 @@
+import logging
+import numpy as np
+import scipy.sparse as sprs
+from scipy.sparse import csgraph
+from scipy.sparse.linalg import spsolve
+from openpnm._skgraph.queries._funcs import _gather_rows
+
+
+logger = logging.getLogger(__name__)
+__all__ = [
+    'find_aggregates',
+    'coarsen',
+    'upscale_conductance',
+    'prolongation_matrix',
+    'restriction_matrix',
+]
+
+
+def find_aggregates(network, divs):
+    r"""
+    Groups the pores of a network into connected aggregates by dividing the
+    domain into blocks
+
+    Parameters
+    ----------
+    network : Network
+        The network whose pores are to be grouped
+    divs : int or array_like
+        The number of blocks along each axis of the domain.  Axes along
+        which all the pores have the same coordinate are ignored.
+
+    Returns
+    -------
+    aggregates : ndarray
+        The number of the aggregate to which each pore belongs, numbered
+        from 0 in the order of their lowest pore index.
+
+    Notes
+    -----
+    Each block is split into the clusters of pores which are connected by
+    throats lying within the block, so every aggregate is connected, as
+    required by ``upscale_conductance``.
+
+    Examples
+    --------
+    >>> import openpnm as op
+    >>> pn = op.network.Cubic(shape=[8, 8, 8])
+    >>> agg = op.topotools.find_aggregates(network=pn, divs=4)
+    >>> print(agg.max() + 1)
+    64
+
+    """
+    coords = network.coords
+    divs = np.ones(3, dtype=int)*np.array(divs, dtype=int)
+    lo, span = coords.min(axis=0), np.ptp(coords, axis=0)
+    span[span == 0] = 1.0
+    bins = np.floor((coords - lo)/span*divs).astype(int)
+    bins = np.clip(bins, 0, divs - 1)
+    block = np.ravel_multi_index(bins.T, divs)
+    conns = network.conns
+    keep = block[conns[:, 0]] == block[conns[:, 1]]
+    am = sprs.coo_matrix((np.ones(keep.sum()), (conns[keep, 0], conns[keep, 1])),
+                         shape=(network.Np, network.Np))
+    _, labels = csgraph.connected_components(am, directed=False)
+    # Renumber so that aggregates appear in the same order as their pores
+    _, first, labels = np.unique(labels, return_index=True, return_inverse=True)
+    order = np.argsort(np.argsort(first))
+    return order[labels]
+
+
+def coarsen(network, aggregates, conductance=None):
+    r"""
+    Creates a coarse network with one pore for each aggregate of pores in
+    the given network
+
+    Parameters
+    ----------
+    network : Network
+        The fine network
+    aggregates : array_like
+        The number of the aggregate to which each pore belongs, such as
+        produced by ``find_aggregates``, which must be numbered from 0.
+    conductance : array_like, optional
+        The conductance of each throat of the fine network.  If given, the
+        conductances of the coarse throats are found using
+        ``upscale_conductance`` and stored in ``'throat.conductance'``.
+
+    Returns
+    -------
+    coarse : Network
+        A new network in its own project with a pore at the centroid of
+        each aggregate, a throat between each pair of aggregates connected
+        by fine throats, and ``'pore.num_fine'`` containing the number of
+        fine pores in each aggregate.
+
+    Notes
+    -----
+    The coarse network can be used as a fast surrogate for the fine one,
+    with ``restriction_matrix`` and ``prolongation_matrix`` transferring
+    pore data between the two.
+
+    Examples
+    --------
+    >>> import openpnm as op
+    >>> import numpy as np
+    >>> pn = op.network.Cubic(shape=[8, 8, 8])
+    >>> agg = op.topotools.find_aggregates(network=pn, divs=4)
+    >>> cn = op.topotools.coarsen(network=pn, aggregates=agg,
+    ...                           conductance=np.ones(pn.Nt))
+    >>> print(cn.Np, cn.Nt)
+    64 144
+    >>> print(cn['throat.conductance'].round(6).max())
+    2.0
+
+    """
+    from openpnm.network import Network
+    aggregates = np.asarray(aggregates)
+    Nc = aggregates.max() + 1
+    size = np.bincount(aggregates, minlength=Nc)
+    coords = np.vstack([np.bincount(aggregates, weights=c, minlength=Nc)
+                        for c in network.coords.T]).T/size[:, None]
+    conns, _ = _coarse_conns(network.conns, aggregates)
+    coarse = Network(coords=coords, conns=conns)
+    coarse['pore.num_fine'] = size
+    if conductance is not None:
+        coarse['throat.conductance'] = upscale_conductance(
+            network=network, aggregates=aggregates, conductance=conductance)
+    return coarse
+
+
+def upscale_conductance(network, aggregates, conductance):
+    r"""
+    Finds the conductance between each pair of connected aggregates which
+    reproduces the flux through the fine throats between them
+
+    Parameters
+    ----------
+    network : Network
+        The fine network
+    aggregates : array_like
+        The number of the aggregate to which each pore belongs, numbered
+        from 0.  The pores of each aggregate must be connected.
+    conductance : array_like
+        The conductance of each throat of the fine network
+
+    Returns
+    -------
+    conductance : ndarray
+        The conductance of each throat of the coarse network, in the order
+        produced by ``coarsen``.
+
+    Notes
+    -----
+    For each pair of aggregates a local problem is solved on the fine pores
+    of the two aggregates.  Values falling linearly from 1 at the centroid
+    of the first aggregate to 0 at the centroid of the second are imposed
+    on the pores in the rear half of the first and the front half of the
+    second.  The conductance is the flux between the aggregates divided by
+    the difference between their mean values, which is exact for a uniform
+    lattice divided into blocks.
+    All of the local problems are assembled into a single block diagonal
+    system and solved at once.
+
+    """
+    aggregates = np.asarray(aggregates)
+    g = np.asarray(conductance, dtype=float)
+    conns, coords = network.conns, network.coords
+    Np = aggregates.size
+    Nc = aggregates.max() + 1
+    cconns, cinv = _coarse_conns(conns, aggregates)
+    K = cconns.shape[0]
+    if K == 0:
+        return np.zeros(0, dtype=float)
+    size = np.bincount(aggregates, minlength=Nc)
+    centroid = np.vstack([np.bincount(aggregates, weights=c, minlength=Nc)
+                          for c in coords.T]).T/size[:, None]
+    # The pores of each aggregate, and the position of each pore within it
+    order = np.argsort(aggregates, kind='stable')
+    ptr = np.zeros(Nc + 1, dtype=np.int64)
+    np.cumsum(size, out=ptr[1:])
+    pos = np.empty(Np, dtype=np.int64)
+    pos[order] = np.arange(Np) - ptr[aggregates[order]]
+    # Throats inside each aggregate
+    A0, A1 = aggregates[conns[:, 0]], aggregates[conns[:, 1]]
+    inner = np.where(A0 == A1)[0]
+    tsize = np.bincount(A0[inner], minlength=Nc)
+    torder = inner[np.argsort(A0[inner], kind='stable')]
+    tptr = np.zeros(Nc + 1, dtype=np.int64)
+    np.cumsum(tsize, out=tptr[1:])
+    # Each local problem holds the pores of its first aggregate followed by
+    # those of its second, starting at offset[k] in the combined system
+    nI, nJ = size[cconns[:, 0]], size[cconns[:, 1]]
+    offset = np.zeros(K + 1, dtype=np.int64)
+    np.cumsum(nI + nJ, out=offset[1:])
+    rows, data = [], []
+    local = []
+    for side, start in [(0, offset[:-1]), (1, offset[:-1] + nI)]:
+        aggs = cconns[:, side]
+        p_ptr, Ps = _gather_rows(ptr, order, aggs)
+        k = np.repeat(np.arange(K), np.diff(p_ptr))
+        local.append((k, Ps, start[k] + pos[Ps]))
+        t_ptr, Ts = _gather_rows(tptr, torder, aggs)
+        k = np.repeat(np.arange(K), np.diff(t_ptr))
+        ends = start[k][:, None] + pos[conns[Ts]]
+        rows.append(ends)
+        data.append(g[Ts])
+    # Throats between the two aggregates of each local problem
+    cross = np.where(A0 != A1)[0]
+    first = (A0[cross] == cconns[cinv, 0])[:, None]
+    ends = offset[cinv][:, None] + pos[conns[cross]]
+    ends += np.where(first, [0, 1], [1, 0])*nI[cinv][:, None]
+    rows.append(ends)
+    data.append(g[cross])
+    ends, gvals = np.vstack(rows), np.concatenate(data)
+    # Impose a linear profile, falling from 1 at the centroid of the first
+    # aggregate to 0 at the second, on the pores behind each centroid
+    N = offset[-1]
+    fixed = np.zeros(N, dtype=bool)
+    b = np.zeros(N, dtype=float)
+    d = centroid[cconns[:, 1]] - centroid[cconns[:, 0]]
+    d /= (d**2).sum(axis=1)[:, None]
+    for side, (k, Ps, inds) in enumerate(local):
+        t = ((coords[Ps] - centroid[cconns[k, 0]])*d[k]).sum(axis=1)
+        mean = np.bincount(k, weights=t, minlength=K)/np.bincount(k, minlength=K)
+        hit = t <= mean[k] if side == 0 else t >= mean[k]
+        fixed[inds[hit]] = True
+        b[inds[hit]] = 1.0 - t[hit]
+    u, v = ends.T
+    rows = np.concatenate((u, v, u, v))
+    cols = np.concatenate((v, u, u, v))
+    data = np.concatenate((-gvals, -gvals, gvals, gvals))
+    keep = ~fixed[rows]
+    Fs = np.where(fixed)[0]
+    A = sprs.coo_matrix((np.append(data[keep], np.ones(Fs.size)),
+                         (np.append(rows[keep], Fs), np.append(cols[keep], Fs))),
+                        shape=(N, N)).tocsc()
+    x = spsolve(A, b)
+    # Flux through the throats between the aggregates of each problem
+    cu, cv = ends[-cross.size:].T
+    Q = np.bincount(cinv, weights=g[cross]*(x[cu] - x[cv]), minlength=K)
+    (kI, _, iI), (kJ, _, iJ) = local
+    dx = np.bincount(kI, weights=x[iI], minlength=K)/nI \
+        - np.bincount(kJ, weights=x[iJ], minlength=K)/nJ
+    return Q/dx
+
+
+def prolongation_matrix(aggregates):
+    r"""
+    Creates the matrix which copies the value of each aggregate to its pores
+
+    Parameters
+    ----------
+    aggregates : array_like
+        The number of the aggregate to which each pore belongs, numbered
+        from 0
+
+    Returns
+    -------
+    P : sparse matrix
+        An Np-by-Nc matrix in CSR format, so that ``P @ x_coarse`` gives the
+        values on the fine pores.
+
+    """
+    aggregates = np.asarray(aggregates)
+    Np = aggregates.size
+    return sprs.csr_matrix((np.ones(Np), aggregates, np.arange(Np + 1)),
+                           shape=(Np, aggregates.max() + 1))
+
+
+def restriction_matrix(aggregates):
+    r"""
+    Creates the matrix which averages the values on the pores of each
+    aggregate
+
+    Parameters
+    ----------
+    aggregates : array_like
+        The number of the aggregate to which each pore belongs, numbered
+        from 0
+
+    Returns
+    -------
+    R : sparse matrix
+        An Nc-by-Np matrix in CSR format, so that ``R @ x_fine`` gives the
+        mean value on each aggregate.
+
+    """
+    P = prolongation_matrix(aggregates).T.tocsr()
+    size = np.diff(P.indptr)
+    return sprs.diags(1.0/size) @ P
+
+
+def _coarse_conns(conns, aggregates):
+    # The unique pairs of aggregates connected by throats, and the coarse
+    # throat to which each throat between different aggregates belongs
+    A = np.sort(aggregates[conns], axis=1)
+    A = A[A[:, 0] != A[:, 1]]
+    conns, inv = np.unique(A, axis=0, return_inverse=True)
+    return conns, inv.ravel()
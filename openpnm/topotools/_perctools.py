@@ -18,6 +18,8 @@ __all__ = [
     'bond_percolation',
     'find_clusters',
     'find_path',
+    'find_shortest_paths',
+    'reconstruct_path',
 ]
 
 
@@ -28,6 +30,21 @@ def find_path(network, pore_pairs, weights=None):
 find_path.__doc__ = queries.find_path.__doc__
 
 
+def find_shortest_paths(network, pore_pairs, weights=None, cores=1):
+    return queries.find_shortest_paths(network=network, pairs=pore_pairs,
+                                       weights=weights, cores=cores)
+
+
+find_shortest_paths.__doc__ = queries.find_shortest_paths.__doc__
+
+
+def reconstruct_path(paths, i):
+    return queries.reconstruct_path(paths=paths, i=i)
+
+
+reconstruct_path.__doc__ = queries.reconstruct_path.__doc__
+
+
 def ispercolating(network, inlets, outlets):
     if np.array(inlets).dtype == bool:
         inlets = np.where(inlets)[0]
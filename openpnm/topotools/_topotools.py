@@ -1,10 +1,10 @@
 import logging
 import numpy as np
-import scipy as sp
+import scipy.sparse as sprs
 from scipy.spatial import cKDTree
 from scipy.sparse import csgraph
 from scipy.spatial import ConvexHull
-from openpnm.utils import Workspace
+from openpnm.utils import Workspace, compact_array, is_compact
 import openpnm._skgraph as skgr
 
 
@@ -15,6 +15,7 @@ __all__ = [
     'rotate_coords',
     'shear_coords',
     'trim',
+    'reorder',
     'extend',
     'label_faces',
     'find_surface_pores',
@@ -164,71 +165,255 @@ def trim(network, pores=[], throats=[]):
         The Network from which pores or throats should be removed
     pores (or throats) : array_like
         The indices of the of the pores or throats to be removed from the
-        network.
+        network.  A list of several such arrays (or boolean masks) can also
+        be given, such as the results of several queries, in which case
+        their union is removed in a single pass.
+
+    Notes
+    -----
+    Throats connected to any removed pores are also removed.  The arrays on
+    every object in the project are compacted at once, and the adjacency
+    and incidence matrices stored by the network are updated by
+    renumbering their entries rather than being rebuilt, so it is much
+    faster to remove all unwanted pores in one call than in several.
+
+    Examples
+    --------
+    >>> import openpnm as op
+    >>> pn = op.network.Cubic(shape=[5, 5, 5])
+    >>> op.topotools.trim(network=pn, pores=[pn.pores('left'), [62]],
+    ...                   throats=[0, 1])
+    >>> print(pn.Np, pn.Nt)
+    99 229
 
     """
-    pores = network._parse_indices(pores)
-    throats = network._parse_indices(throats)
-    Pkeep = np.copy(network['pore.all'])
-    Tkeep = np.copy(network['throat.all'])
-    if np.size(pores) > 0:
-        Pkeep[pores] = False
-        if not np.any(Pkeep):
-            raise Exception('Cannot delete ALL pores')
-        # # Performing customized find_neighbor_throats which is much faster,
-        # # but not general for other types of queries
-        # temp = np.in1d(network['throat.conns'].flatten(), pores)
-        # temp = np.reshape(temp, (network.Nt, 2))
-        # Ts = np.any(temp, axis=1)
-        # Ts = network.Ts[Ts]
-        Ts = network.find_neighbor_throats(pores=~Pkeep, mode='union')
-        if len(Ts) > 0:
-            Tkeep[Ts] = False
-    if np.size(throats) > 0:
-        Tkeep[throats] = False
-        # The following IF catches the special case of deleting ALL throats
-        # It removes all throat props, adds 'all', and skips rest of function
-        if not np.any(Tkeep):
-            logger.info('Removing ALL throats from network')
-            for item in list(network.keys()):
-                if item.split('.', 1)[0] == 'throat':
-                    del network[item]
-            network['throat.all'] = np.array([], ndmin=1)
+    Pkeep = np.ones(network.Np, dtype=bool)
+    Tkeep = np.ones(network.Nt, dtype=bool)
+    for inds in _split_index_sets(pores):
+        Pkeep[network._parse_indices(inds)] = False
+    for inds in _split_index_sets(throats):
+        Tkeep[network._parse_indices(inds)] = False
+    if not np.any(Pkeep):
+        raise Exception('Cannot delete ALL pores')
+    conns = network['throat.conns'] if 'throat.conns' in network \
+        else np.zeros((0, 2), dtype=int)
+    if not np.all(Pkeep):
+        # Remove any throats connected to the removed pores
+        Tkeep &= Pkeep[conns[:, 0]] & Pkeep[conns[:, 1]]
+    if np.all(Pkeep) and np.all(Tkeep):
+        return
+    # Check all arrays before changing anything so a failure leaves the
+    # project intact
+    Np_old, Nt_old = Pkeep.size, Tkeep.size
+    for obj in network.project:
+        for key, temp in dict.items(obj):
+            N_old = Np_old if key.split('.', 1)[0] == 'pore' else Nt_old
+            if temp.shape[0] != N_old:
+                raise Exception(f'{obj.name}[{key}] is the wrong length for'
+                                ' the network so cannot be trimmed')
+    # The following IF catches the special case of deleting ALL throats
+    # It removes all throat props, adds 'all', and skips the throats below
+    all_throats = (Tkeep.size > 0) and not np.any(Tkeep)
+    if all_throats:
+        logger.info('Removing ALL throats from network')
+        for item in list(network.keys()):
+            if item.split('.', 1)[0] == 'throat':
+                del network[item]
+        network['throat.all'] = np.array([], ndmin=1)
+        if np.all(Pkeep):
             return
 
-    # Temporarily store throat conns and pore map for processing later
-    Np_old = network.Np
-    Nt_old = network.Nt
+    # Delete specified pores and throats from all objects in a single pass
     Pkeep_inds = np.where(Pkeep)[0]
     Tkeep_inds = np.where(Tkeep)[0]
-    Pmap = np.ones((network.Np,), dtype=int)*-1
-    tpore1 = network['throat.conns'][:, 0]
-    tpore2 = network['throat.conns'][:, 1]
-
-    # Delete specified pores and throats from all objects
     for obj in network.project[::-1]:
-        if (obj.Np == Np_old) and (obj.Nt == Nt_old):
-            Ps = Pkeep_inds
-            Ts = Tkeep_inds
-        else:  # If subdomain object then Np/Nt < Np/Nt_old
-            Ps = obj.to_local(pores=Pkeep_inds, missing_vals=None)
-            Ts = obj.to_local(throats=Tkeep_inds, missing_vals=None)
-        for key in list(obj.keys()):
-            temp = obj.pop(key)
-            if key.split('.', 1)[0] == 'throat':
-                obj.update({key: temp[Ts]})
-            if key.split('.', 1)[0] == 'pore':
-                obj.update({key: temp[Ps]})
+        new = {}
+        for key, temp in dict.items(obj):
+            element = key.split('.', 1)[0]
+            if (element == 'throat') and all_throats:
+                continue
+            inds = Pkeep_inds if element == 'pore' else Tkeep_inds
+            if is_compact(temp):  # Keep uniform arrays stored compactly
+                new[key] = compact_array(temp[:1], inds.size)
+            elif key != 'throat.conns':
+                new[key] = temp[inds]
+        obj.update(new)
 
     # Remap throat connections
-    Pmap[Pkeep] = np.arange(0, np.sum(Pkeep))
-    Tnew1 = Pmap[tpore1[Tkeep]]
-    Tnew2 = Pmap[tpore2[Tkeep]]
-    network.update({'throat.conns': np.vstack((Tnew1, Tnew2)).T})
+    if not all_throats:
+        Pmap = np.cumsum(Pkeep) - 1
+        network.update({'throat.conns': Pmap[conns[Tkeep]].astype(conns.dtype)})
+        network._remap_topology(Pkeep, Tkeep)
+
 
-    # Clear adjacency and incidence matrices which will be out of date now
-    network._am.clear()
-    network._im.clear()
+def reorder(network, method='rcm'):
+    r"""
+    Renumbers the pores and throats so that neighboring pores have nearby
+    indices
+
+    Parameters
+    ----------
+    network : Network
+        The network whose pores and throats are to be renumbered.  The data
+        on every object in the project is permuted accordingly.
+    method : str
+        The ordering to use. Options are:
+
+        =========== ==========================================================
+        method      description
+        =========== ==========================================================
+        'rcm'       The reverse Cuthill-McKee ordering of the adjacency
+                    matrix, which minimizes its bandwidth
+        'hilbert'   The order in which a Hilbert curve passes through the
+                    pore coordinates, which keeps nearby pores together
+        'morton'    The same as 'hilbert' but using a Z-order curve, which
+                    is slightly faster to compute
+        =========== ==========================================================
+
+    Returns
+    -------
+    Ps, Ts : ndarray
+        The previous index of each pore and throat, so ``x[Ps]`` converts
+        an array ``x`` from the previous to the new order.
+
+    Notes
+    -----
+    Networks produced by image extraction often have their pores in an
+    arbitrary order, so operations such as ``x[network.conns]`` access
+    memory at random and sparse matrices have a large bandwidth.  After
+    renumbering the pores, the throats are sorted by the pores they
+    connect.
+
+    The original indices are stored in ``'pore.original_index'`` and
+    ``'throat.original_index'`` the first time this function is called, and
+    are permuted along with the other data afterwards, so the results can
+    always be mapped back to the original order.
+
+    Throats whose pores become reversed are flipped to keep
+    ``'throat.conns'`` upper triangular, so the two columns of any
+    Nt-by-2 array, and the values of ``'.pore1'`` and ``'.pore2'`` or
+    ``'.tail'`` and ``'.head'`` pairs of arrays, are swapped for these
+    throats.  Conduit data stored as Nt-by-3 arrays cannot be distinguished
+    from coordinates so should be regenerated afterwards.
+
+    Examples
+    --------
+    >>> import openpnm as op
+    >>> import numpy as np
+    >>> pn = op.network.Cubic(shape=[10, 10, 10])
+    >>> pn['pore.x'] = pn.coords[:, 0]
+    >>> Ps, Ts = op.topotools.reorder(network=pn, method='hilbert')
+    >>> np.all(pn['pore.x'] == pn.coords[:, 0])
+    True
+    >>> np.all(pn['pore.original_index'] == Ps)
+    True
+
+    """
+    if method == 'rcm':
+        am = network.get_adjacency_matrix(fmt='csr')
+        am = sprs.csr_matrix((np.ones(am.data.size, dtype=bool), am.indices,
+                              am.indptr), shape=am.shape)
+        Ps = csgraph.reverse_cuthill_mckee(am, symmetric_mode=True)
+    elif method in ['hilbert', 'morton']:
+        Ps = np.argsort(_curve_index(network.coords, method), kind='stable')
+    else:
+        raise Exception(f'Unrecognized method: {method}')
+    Ps = Ps.astype(int)
+    Pmap = np.empty_like(Ps)
+    Pmap[Ps] = np.arange(Ps.size)
+    conns = Pmap[network.conns]
+    flip = conns[:, 0] > conns[:, 1]
+    conns = np.sort(conns, axis=1)
+    Ts = np.lexsort((conns[:, 1], conns[:, 0]))
+    flip = np.where(flip[Ts])[0]
+    for element, inds in [('pore', Ps), ('throat', Ts)]:
+        key = element + '.original_index'
+        if key not in network.keys():
+            network[key] = np.arange(inds.size)
+    # Permute the arrays on every object, as trim does
+    pairs = [('.pore1', '.pore2'), ('.tail', '.head')]
+    for obj in network.project:
+        new = {}
+        for key, temp in dict.items(obj):
+            element = key.split('.', 1)[0]
+            inds = Ps if element == 'pore' else Ts
+            if (temp.shape[0] != inds.size) or is_compact(temp) \
+                    or (key == 'throat.conns'):
+                continue
+            new[key] = temp[inds]
+            if (element == 'throat') and (new[key].ndim == 2) \
+                    and (new[key].shape[1] == 2):
+                new[key][flip] = new[key][flip, ::-1]
+        for key in list(new.keys()):
+            for a, b in pairs:
+                if key.endswith(a) and (key[:-len(a)] + b in new):
+                    other = key[:-len(a)] + b
+                    new[key][flip], new[other][flip] = \
+                        new[other][flip], new[key][flip].copy()
+        obj.update(new)
+        # Discard matrices built with the previous order
+        for attr in ['_A', '_b', '_pure_A', '_pure_b']:
+            if getattr(obj, attr, None) is not None:
+                setattr(obj, attr, None)
+        for soln in getattr(obj, 'soln', {}).values():
+            if soln.shape[0] == Ps.size:
+                soln[:] = soln[Ps]
+                if hasattr(soln, '_interpolant'):
+                    del soln._interpolant
+    network.update({'throat.conns': conns[Ts].astype(network.conns.dtype)})
+    network.invalidate_topology()
+    return Ps, Ts
+
+
+def _curve_index(coords, method='hilbert'):
+    r"""
+    Finds the position of each point along a Hilbert or Z-order curve
+    through the bounding box of the points
+    """
+    coords = coords[:, np.ptp(coords, axis=0) > 0]
+    ndim = coords.shape[1]
+    if ndim == 0:
+        return np.zeros(coords.shape[0], dtype=np.int64)
+    bits = 63 // ndim
+    scale = (2**bits - 1)/np.ptp(coords, axis=0)
+    X = ((coords - coords.min(axis=0))*scale).astype(np.int64).T.copy()
+    if method == 'hilbert':
+        # Converts the coordinates to the 'transposed' Hilbert index
+        # following Skilling, AIP Conference Proceedings 707, 381 (2004)
+        Q = 1 << (bits - 1)
+        while Q > 1:
+            P = Q - 1
+            for i in range(ndim):
+                hit = (X[i] & Q) > 0
+                X[0][hit] ^= P
+                t = (X[0] ^ X[i]) & P
+                t[hit] = 0
+                X[0] ^= t
+                X[i] ^= t
+            Q >>= 1
+        for i in range(1, ndim):
+            X[i] ^= X[i - 1]
+        t = np.zeros_like(X[0])
+        Q = 1 << (bits - 1)
+        while Q > 1:
+            t[(X[ndim - 1] & Q) > 0] ^= Q - 1
+            Q >>= 1
+        X ^= t
+    # Interleave the bits of each axis, from most to least significant
+    index = np.zeros(X.shape[1], dtype=np.int64)
+    for b in range(bits - 1, -1, -1):
+        for i in range(ndim):
+            index = (index << 1) | ((X[i] >> b) & 1)
+    return index
+
+
+def _split_index_sets(inds):
+    # Returns a list of index arrays, since trim accepts either a single
+    # array of indices or a list of several of them
+    if isinstance(inds, (list, tuple)) and len(inds) \
+            and all([np.ndim(i) > 0 for i in inds]):
+        return list(inds)
+    return [inds]
 
 
 def extend(network, coords=[], conns=[], labels=[], **kwargs):
@@ -314,10 +499,6 @@ def extend(network, coords=[], conns=[], labels=[], **kwargs):
                     network['throat.'+label] = False
                 network['throat.'+label][Ts] = True
 
-    # Clear adjacency and incidence matrices which will be out of date now
-    network._am.clear()
-    network._im.clear()
-
 
 def label_faces(network, tol=0.0, label='surface'):
     r"""
@@ -513,10 +694,6 @@ def clone_pores(network, pores, labels=['clone'], mode='parents'):
     for item in labels:
         network.set_label(label=item, throats=range(Nt, Ntnew))
 
-    # Clear adjacency and incidence matrices which will be out of date now
-    network._am.clear()
-    network._im.clear()
-
 
 def merge_networks(network, donor=[]):
     r"""
@@ -591,10 +768,6 @@ def merge_networks(network, donor=[]):
                     s = np.shape(donor[key])[0]
                     network[key][-s:] = donor[key]
 
-    # Clear adjacency and incidence matrices which will be out of date now
-    network._am.clear()
-    network._im.clear()
-
 
 def stitch(network, donor, P_network, P_donor, method='nearest',
            len_max=np.inf, label_suffix='', label_stitches='stitched'):
@@ -652,24 +825,33 @@ def stitch(network, donor, P_network, P_donor, method='nearest',
     N_init = {}
     N_init['pore'] = network.Np
     N_init['throat'] = network.Nt
+    P1 = np.array(P_network, ndmin=1)
+    P2 = np.array(P_donor, ndmin=1) + N_init['pore']  # Increment donor pores
+    C1 = network['pore.coords'][P1]
+    C2 = donor['pore.coords'][P2 - N_init['pore']]
+    # Use kd-trees rather than the full distance matrix between the two sets
+    t1 = cKDTree(C1)
     if method == 'nearest':
-        P1 = P_network
-        P2 = P_donor + N_init['pore']  # Increment pores on donor
-        C1 = network['pore.coords'][P_network]
-        C2 = donor['pore.coords'][P_donor]
-        D = sp.spatial.distance.cdist(C1, C2)
-        [P1_ind, P2_ind] = np.where(D == D.min(axis=0))
-        conns = np.vstack((P1[P1_ind], P2[P2_ind])).T
+        # Find the nearest pore(s) for each donor pore, including ties
+        dmin = t1.query(C2, k=1)[0]
+        hits = t1.query_ball_point(C2, r=dmin*(1 + 1e-9) + 1e-12)
+        n = np.array([len(h) for h in hits], dtype=int)
+        P1_ind = np.concatenate(hits).astype(int)
+        P2_ind = np.repeat(np.arange(len(P2)), n)
+        D = np.linalg.norm(C1[P1_ind] - C2[P2_ind], axis=1)
+        Dmin = np.full(len(P2), np.inf)
+        np.minimum.at(Dmin, P2_ind, D)
+        keep = D == Dmin[P2_ind]
+        P1_ind, P2_ind = P1_ind[keep], P2_ind[keep]
     elif method == 'radius':
-        P1 = P_network
-        P2 = P_donor + N_init['pore']  # Increment pores on donor
-        C1 = network['pore.coords'][P_network]
-        C2 = donor['pore.coords'][P_donor]
-        D = sp.spatial.distance.cdist(C1, C2)
-        [P1_ind, P2_ind] = np.where(D <= len_max)
-        conns = np.vstack((P1[P1_ind], P2[P2_ind])).T
+        t2 = cKDTree(C2)
+        hits = t1.sparse_distance_matrix(t2, max_distance=len_max,
+                                         output_type='ndarray')
+        P1_ind, P2_ind = hits['i'], hits['j']
     else:
         raise Exception('<{}> method not supported'.format(method))
+    order = np.lexsort((P2_ind, P1_ind))
+    conns = np.vstack((P1[P1_ind[order]], P2[P2_ind[order]])).T
 
     merge_networks(network, donor)
 
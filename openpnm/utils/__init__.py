@@ -12,6 +12,10 @@ from ._misc import *
 from ._settings import *
 from ._workspace import *
 from ._project import *
+from ._cache import *
+from ._tabulation import *
+from ._compact import *
+from ._segments import *
 from ._health import *
 
 
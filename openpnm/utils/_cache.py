@@ -0,0 +1,361 @@
+import os
+import hashlib
+import logging
+import tempfile
+import numpy as np
+from collections import OrderedDict
+from openpnm.utils import SettingsAttr, is_valid_propname
+from openpnm.utils._compact import uniform_inputs
+
+
+logger = logging.getLogger(__name__)
+
+
+__all__ = [
+    'ModelCache',
+    'cacheable',
+    'fast_hash',
+]
+
+
+# Registry of model functions that are eligible for memoization, along with
+# any data they read from the target object that are not in their kwargs
+_cacheable_models = {}
+
+
+def fast_hash(arr):
+    r"""
+    Computes a short digest of the shape, dtype and contents of an array
+
+    Parameters
+    ----------
+    arr : array_like
+        The numerical or boolean array to hash
+
+    Returns
+    -------
+    digest : str
+        A 32 character hexadecimal string which changes if any value in
+        ``arr`` changes
+
+    Notes
+    -----
+    Object arrays cannot be hashed by content so a ``TypeError`` is raised.
+    """
+    arr = np.ascontiguousarray(arr)
+    if arr.dtype.hasobject:
+        raise TypeError('Arrays of objects cannot be hashed')
+    h = hashlib.blake2b(digest_size=16)
+    h.update(str((arr.shape, arr.dtype.str)).encode())
+    h.update(arr.reshape(-1).view(np.uint8))
+    return h.hexdigest()
+
+
+def cacheable(func=None, inputs=[]):
+    r"""
+    Marks a pore-scale model as eligible for memoization by ``ModelCache``
+
+    Parameters
+    ----------
+    func : function
+        The model function to mark. This function is returned unchanged so
+        that the argument inspection done by ``add_model`` still works.
+    inputs : list of str or '*'
+        The names of any arrays read from the target object which are *not*
+        referred to in the model's keyword arguments, such as
+        ``'pore.coords'``. If ``'*'`` is given then all arrays on the target
+        (and its components in the case of a mixture) are included in the
+        cache key.
+
+    Notes
+    -----
+    Can be used either as ``@cacheable`` or ``@cacheable(inputs=[...])``.
+    Models that produce random values should not be marked as cacheable.
+    """
+    def decorator(f):
+        _cacheable_models[f] = inputs
+        return f
+    if func is None:
+        return decorator
+    return decorator(func)
+
+
+class ModelCacheSettings(SettingsAttr):
+    r"""
+
+    Parameters
+    ----------
+    enabled : bool
+        Whether the cache is used when running models. The default is
+        ``False`` so memoization must be explicitly requested.
+    max_memory : float
+        The number of bytes which cached results may occupy in memory. When
+        exceeded the least recently used results are discarded.
+    cachedir : str
+        If given, results are also written to ``.npz`` files in this
+        directory so they can be found by subsequent sessions. The default
+        is an empty string which disables the on-disk tier.
+    """
+    enabled = False
+    max_memory = 1e9
+    cachedir = ''
+
+
+class ModelCache:
+    r"""
+    A content-addressed store of pore-scale model results
+
+    Results are keyed on the model function, its scalar arguments and a hash
+    of every array the model reads, so a model is only re-run when one of its
+    inputs has actually changed. This class is a singleton so the same cache
+    is shared by all projects in the Workspace.
+
+    Examples
+    --------
+    >>> import openpnm as op
+    >>> cache = op.utils.ModelCache()
+    >>> cache.enable(max_memory=5e8)
+    >>> cache.disable()
+
+    Notes
+    -----
+    Only models marked with the ``cacheable`` decorator are memoized. The
+    in-memory tier is a least-recently-used store bounded by
+    ``settings['max_memory']``, and the optional on-disk tier is enabled by
+    setting ``settings['cachedir']``.
+    """
+
+    __instance__ = None
+
+    def __new__(cls, *args, **kwargs):
+        if ModelCache.__instance__ is None:
+            instance = super().__new__(cls)
+            instance.settings = ModelCacheSettings()
+            instance._data = OrderedDict()
+            instance._nbytes = 0
+            instance.hits = 0
+            instance.misses = 0
+            ModelCache.__instance__ = instance
+        return ModelCache.__instance__
+
+    def __len__(self):
+        return len(self._data)
+
+    def __contains__(self, key):
+        return key in self._data
+
+    @property
+    def nbytes(self):
+        r"""The number of bytes currently held in the in-memory tier"""
+        return self._nbytes
+
+    def enable(self, max_memory=None, cachedir=None):
+        r"""
+        Turns on memoization of cacheable models
+
+        Parameters
+        ----------
+        max_memory : float, optional
+            The memory budget in bytes for the in-memory tier
+        cachedir : str, optional
+            A directory in which to store results on disk. It is created if
+            it does not exist.
+        """
+        if max_memory is not None:
+            self.settings['max_memory'] = float(max_memory)
+        if cachedir:
+            os.makedirs(cachedir, exist_ok=True)
+            self.settings['cachedir'] = cachedir
+        self.settings['enabled'] = True
+
+    def disable(self):
+        r"""Turns off memoization, without discarding stored results"""
+        self.settings['enabled'] = False
+
+    def clear(self, disk=False):
+        r"""
+        Discards all stored results
+
+        Parameters
+        ----------
+        disk : bool
+            If ``True`` the ``.npz`` files in the cache directory are also
+            deleted. The default is ``False``.
+        """
+        self._data.clear()
+        self._nbytes = 0
+        self.hits = 0
+        self.misses = 0
+        cachedir = self.settings['cachedir']
+        if disk and cachedir and os.path.isdir(cachedir):
+            for f in os.listdir(cachedir):
+                if f.endswith('.npz'):
+                    os.remove(os.path.join(cachedir, f))
+
+    def run(self, model, target, **kwargs):
+        r"""
+        Runs the given model, returning stored results if available
+
+        Parameters
+        ----------
+        model : function
+            The pore-scale model to run
+        target : Base2
+            The object to which the model is attached
+        kwargs
+            The arguments to pass to ``model``
+
+        Returns
+        -------
+        vals : ndarray or dict
+            The values computed by ``model``, or a copy of the stored values
+            if the same inputs were seen before.
+        """
+        if not self.settings['enabled'] or (model not in _cacheable_models):
+            return model(target, **kwargs)
+        try:
+            key = self.get_key(model, target, kwargs)
+        except (KeyError, TypeError, AttributeError):
+            return model(target, **kwargs)
+        vals = self._fetch(key)
+        if vals is None:
+            self.misses += 1
+            vals = model(target, **kwargs)
+            self._store(key, vals)
+        else:
+            self.hits += 1
+        return vals
+
+    def get_key(self, model, target, kwargs):
+        r"""
+        Generates the content-address under which results are stored
+
+        Parameters
+        ----------
+        model : function
+            The pore-scale model
+        target : Base2
+            The object to which the model is attached
+        kwargs : dict
+            The arguments that will be passed to ``model``
+
+        Returns
+        -------
+        key : str
+            A hexadecimal digest combining the model name, the arguments
+            and the contents of all arrays read by the model
+        """
+        h = hashlib.blake2b(digest_size=20)
+        h.update(f'{model.__module__}.{model.__qualname__}'.encode())
+        h.update(target.__class__.__name__.encode())
+        # Geometrical models implicitly depend on the topology
+        network = target.network
+        with uniform_inputs(False):
+            for item in ['pore.coords', 'throat.conns']:
+                if item in network.keys():
+                    h.update(fast_hash(network[item]).encode())
+        for k in sorted(kwargs.keys()):
+            h.update(k.encode())
+            h.update(self._hash_arg(target, kwargs[k]).encode())
+        for k in sorted(target.params.keys()):
+            h.update(k.encode())
+            h.update(self._hash_arg(target, target.params[k]).encode())
+        inputs = _cacheable_models[model]
+        if inputs == '*':
+            objs = [target] + list(getattr(target, 'components', {}).values())
+            for obj in objs:
+                for k in sorted(obj.keys()):
+                    h.update(k.encode())
+                    h.update(fast_hash(obj[k]).encode())
+                for k in sorted(obj.params.keys()):
+                    h.update(self._hash_arg(obj, obj.params[k]).encode())
+        else:
+            for item in inputs:
+                h.update(self._hash_arg(target, item).encode())
+        return h.hexdigest()
+
+    def _hash_arg(self, target, arg):
+        if isinstance(arg, str):
+            if is_valid_propname(arg):
+                # Models often fetch both pore and throat values of a prop
+                prop = arg.split('.', 1)[1]
+                s = arg
+                for element in ['pore', 'throat']:
+                    try:
+                        s += self._hash_arg(target, target[f'{element}.{prop}'])
+                    except KeyError:
+                        pass
+                return s
+            if arg.startswith('param.'):
+                return arg + self._hash_arg(target, target[arg])
+            return arg
+        if isinstance(arg, np.ndarray):
+            return fast_hash(arg)
+        if isinstance(arg, dict):
+            return str([(k, self._hash_arg(target, arg[k])) for k in sorted(arg)])
+        if isinstance(arg, (list, tuple)):
+            return str([self._hash_arg(target, v) for v in arg])
+        if callable(arg):
+            return f'{getattr(arg, "__module__", "")}.{arg.__name__}'
+        return repr(arg)
+
+    def _fetch(self, key):
+        if key in self._data:
+            self._data.move_to_end(key)
+            return _copy(self._data[key])
+        cachedir = self.settings['cachedir']
+        if not cachedir:
+            return None
+        fname = os.path.join(cachedir, key + '.npz')
+        if not os.path.isfile(fname):
+            return None
+        with np.load(fname) as f:
+            if '__array__' in f.files:
+                vals = f['__array__']
+            else:
+                vals = {k: f[k] for k in f.files}
+        self._add_to_memory(key, vals)
+        return _copy(vals)
+
+    def _store(self, key, vals):
+        if isinstance(vals, dict):
+            vals = {k: np.array(v) for k, v in vals.items()}
+        elif isinstance(vals, np.ndarray) and (vals.ndim > 0):
+            vals = {'__array__': vals.copy()}
+        else:
+            return
+        if any(v.dtype.hasobject for v in vals.values()):
+            return
+        cachedir = self.settings['cachedir']
+        if cachedir:
+            # Write to a temporary file first so that concurrent sessions
+            # never see a partially written entry
+            fd, tmp = tempfile.mkstemp(dir=cachedir, suffix='.tmp')
+            with os.fdopen(fd, 'wb') as f:
+                np.savez(f, **vals)
+            os.replace(tmp, os.path.join(cachedir, key + '.npz'))
+        if '__array__' in vals.keys():
+            vals = vals['__array__']
+        self._add_to_memory(key, vals)
+
+    def _add_to_memory(self, key, vals):
+        size = _nbytes(vals)
+        if size > self.settings['max_memory']:
+            return
+        self._data[key] = vals
+        self._nbytes += size
+        while self._nbytes > self.settings['max_memory']:
+            _, old = self._data.popitem(last=False)
+            self._nbytes -= _nbytes(old)
+
+
+def _nbytes(vals):
+    if isinstance(vals, dict):
+        return sum([v.nbytes for v in vals.values()])
+    return vals.nbytes
+
+
+def _copy(vals):
+    if isinstance(vals, dict):
+        return {k: v.copy() for k, v in vals.items()}
+    return vals.copy()
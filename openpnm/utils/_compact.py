@@ -0,0 +1,104 @@
+import numpy as np
+from contextlib import contextmanager
+
+
+__all__ = [
+    'elementwise',
+    'compact_array',
+    'is_compact',
+    'uniform_inputs',
+]
+
+
+_elementwise_models = set()
+_state = {'uniform': False}
+
+
+def elementwise(func):
+    r"""
+    Decorator used to mark pore-scale models whose values at each location
+    depend only on the inputs at that same location
+
+    Notes
+    -----
+    When all the arrays such a model reads from its target are uniform, the
+    model is evaluated once using length 1 arrays and the result is stored
+    as a compact constant array (see ``compact_array``).  The evaluation is
+    abandoned as soon as the model reads an array which is not uniform, and
+    the model is run on the full arrays instead.
+
+    """
+    _elementwise_models.add(func)
+    return func
+
+
+def compact_array(value, n):
+    r"""
+    Creates a read-only array of length ``n`` containing ``value`` at every
+    location, but without allocating ``n`` elements of memory
+
+    Parameters
+    ----------
+    value : scalar or ndarray
+        The value to broadcast. If an array, it must have a length of 1
+        along its first axis.
+    n : int
+        The length of the returned array
+
+    Returns
+    -------
+    arr : ndarray
+        A read-only view with a stride of 0 along its first axis.  Objects
+        that inherit from ``Base2`` store such arrays as given, and expand
+        them into normal writable arrays when they are next read (see
+        ``Base2.__getitem__``), so they should only be used for data that
+        is replaced rather than written in place.
+
+    """
+    value = np.array(value, ndmin=1)
+    return np.broadcast_to(value, (n, *value.shape[1:]))
+
+
+def is_compact(arr):
+    r"""
+    Returns ``True`` if the given array was created by ``compact_array``
+    """
+    return isinstance(arr, np.ndarray) and (arr.ndim > 0) \
+        and (arr.strides[0] == 0) and not arr.flags.writeable
+
+
+class _NotUniform(Exception):
+    # Raised when a non-uniform array is read within uniform_inputs, so that
+    # the model can be run on the full arrays instead
+    pass
+
+
+def _uniform_value(arr):
+    # Returns the first row of arr if all its rows are the same
+    if not isinstance(arr, np.ndarray) or (arr.ndim == 0):
+        return arr
+    if is_compact(arr) or (arr.shape[0] <= 1):
+        return arr[:1]
+    if np.all(arr == arr[:1]):
+        return arr[:1]
+    raise _NotUniform
+
+
+@contextmanager
+def uniform_inputs(enabled=True):
+    r"""
+    Context manager within which ``Base2`` objects return uniform arrays as
+    length 1 arrays, and raise an exception when a non-uniform array is read
+
+    Parameters
+    ----------
+    enabled : bool
+        If ``False`` arrays are returned as usual within the context, which
+        is needed to read data such as labels while evaluating a model.
+    """
+    prev = _state['uniform']
+    _state['uniform'] = enabled
+    try:
+        yield
+    finally:
+        _state['uniform'] = prev
@@ -1,8 +1,10 @@
 import re
+import sys
 import pickle
 import logging
 import uuid
 import numpy as np
+import scipy.sparse as sprs
 from copy import deepcopy
 from datetime import datetime
 from openpnm.utils import Workspace, SettingsAttr
@@ -55,9 +57,28 @@ class ProjectSettings(SettingsAttr):
     r"""
     uuid : str
         A universally unique identifier for the object to keep things straight
+    compact_indices : bool
+        If ``True`` then 'throat.conns' and the index arrays derived from it
+        are stored as ``int32`` rather than ``int64`` when they contain values
+        below 2**31, which halves their memory.  The default is taken from
+        the Workspace settings.
+    geometry_dtype : str
+        The floating point type used for the properties stored on the
+        network, such as pore and throat sizes.  Using 'float32' halves their
+        memory, while algorithms still assemble and solve their systems in
+        double precision.  'pore.coords' is not affected. The default is
+        taken from the Workspace settings.
+
+    Notes
+    -----
+    The ``compact_indices`` and ``geometry_dtype`` settings are applied when
+    data is written to the network, so should be set before the network is
+    generated or loaded.
     """
     uuid = ''
     original_uuid = ''
+    compact_indices = False
+    geometry_dtype = 'float64'
 
     @property
     def name(self):
@@ -100,6 +121,8 @@ class Project(SimpleList):
 
     def __init__(self, *args, **kwargs):
         self.settings = ProjectSettings()
+        self.settings['compact_indices'] = ws.settings['compact_indices']
+        self.settings['geometry_dtype'] = ws.settings['geometry_dtype']
         self.settings['name'] = kwargs.pop('name', None)
         self.settings['uuid'] = str(uuid.uuid4())
         self.settings['original_uuid'] = self.settings['uuid']
@@ -250,6 +273,161 @@ class Project(SimpleList):
                 pass
         raise KeyError(label)
 
+    def _get_domain_indices(self, label):
+        r"""
+        Find the indices of the locations indicated by the given label
+        regardless of which object it is defined on
+
+        Parameters
+        ----------
+        label : str
+            The label whose locations are sought, such as 'pore.left'
+
+        Returns
+        -------
+        locations : ndarray
+            The integer indices of locations which have the given label.
+            These are cached by the object on which ``label`` is defined.
+
+        """
+        for item in self:
+            try:
+                return item._get_domain_indices(label)
+            except KeyError:
+                pass
+        raise KeyError(label)
+
+    def footprint(self, by='array', objects=None):
+        r"""
+        Reports the memory used by the arrays stored on each object, along
+        with the run time of the models that produced them
+
+        Parameters
+        ----------
+        by : str
+            How to summarize the results. Options are:
+
+            ========== ====================================================
+            by         description
+            ========== ====================================================
+            'array'    (default) One row for each array on each object
+            'element'  The total memory of the 'pore' and 'throat' arrays,
+                       and of the data cached by each object
+            'object'   The total memory of the arrays on each object
+            'model'    The total memory of the arrays produced by each
+                       model, along with its run time if profiled
+            ========== ====================================================
+
+        objects : list, optional
+            The objects to include. The default is all objects in the
+            project.
+
+        Returns
+        -------
+        df : pandas.DataFrame
+            A table sorted by decreasing memory. When ``by`` is 'array' the
+            columns are:
+
+            ============== ================================================
+            column         description
+            ============== ================================================
+            'object'       The name of the object holding the array
+            'key'          The dictionary key of the array
+            'element'      'pore', 'throat', or 'cache' for data such as
+                           the adjacency matrix stored by a network
+            'dtype'        The data type of the array
+            'shape'        The shape of the array
+            'nbytes'       The memory actually held by the array
+            'broadcast'    ``True`` if the array is stored as a single
+                           value (see ``compact_array``)
+            'constant'     ``True`` if every value in a fully stored array
+                           is the same, so it could be stored as a single
+                           value instead
+            'duplicate_of' The 'object/key' of an earlier array with the
+                           same contents, if any
+            'model'        The model(s) which produce the array
+            'model_calls'  The number of times those models were run
+            'model_time'   The total run time of those models in seconds
+            ============== ================================================
+
+        Notes
+        -----
+        Model run times are only recorded while
+        ``Workspace().settings['profile_models']`` is ``True``. Models which
+        return a dict of arrays are credited with every array they wrote on
+        their last run, including those stored under other propnames.
+
+        Duplicates are found by hashing the contents of each array, so this
+        function reads all the data in the project and takes some time on
+        large networks.
+
+        """
+        from pandas import DataFrame
+        from openpnm.utils import fast_hash, is_compact
+        if objects is None:
+            objects = list(self)
+        rows = []
+        seen = {}
+        for obj in objects:
+            times = getattr(obj, '_model_times', {})
+            outputs = getattr(obj, '_model_outputs', {})
+            models = getattr(obj, 'models', {})
+            for key, element, arr in obj._get_stored_arrays():
+                row = {'object': obj.name, 'key': key, 'element': element,
+                       'dtype': '', 'shape': (), 'nbytes': _nbytes(arr),
+                       'broadcast': False, 'constant': False,
+                       'duplicate_of': '', 'model': '', 'model_calls': 0,
+                       'model_time': 0.0}
+                if isinstance(arr, np.ndarray):
+                    row['dtype'] = str(arr.dtype)
+                    row['shape'] = arr.shape
+                    row['broadcast'] = is_compact(arr)
+                    if (arr.size > 1) and not row['broadcast'] \
+                            and not arr.dtype.hasobject:
+                        row['constant'] = bool(np.all(arr == arr[:1]))
+                        h = fast_hash(arr)
+                        row['duplicate_of'] = seen.setdefault(
+                            h, f'{obj.name}/{key}')
+                        if row['duplicate_of'] == f'{obj.name}/{key}':
+                            row['duplicate_of'] = ''
+                elif sprs.issparse(arr):
+                    row['dtype'] = str(arr.dtype)
+                    row['shape'] = arr.shape
+                elif isinstance(getattr(arr, 'data', None), np.ndarray):
+                    row['dtype'] = str(arr.data.dtype)  # kd-trees
+                    row['shape'] = arr.data.shape
+                mods = [m for m in models.keys()
+                        if (m.split('@')[0] == key)
+                        or key.startswith(m.split('@')[0] + '.')
+                        or (key in outputs.get(m, []))]
+                row['model'] = ', '.join(mods)
+                for m in mods:
+                    row['model_calls'] += times.get(m, [0, 0.0])[0]
+                    row['model_time'] += times.get(m, [0, 0.0])[1]
+                rows.append(row)
+        df = DataFrame(rows, columns=['object', 'key', 'element', 'dtype',
+                                      'shape', 'nbytes', 'broadcast',
+                                      'constant', 'duplicate_of', 'model',
+                                      'model_calls', 'model_time'])
+        if by == 'array':
+            pass
+        elif by in ['element', 'object']:
+            cols = ['object', 'element'] if by == 'element' else ['object']
+            df = df.groupby(cols, as_index=False).agg(
+                nbytes=('nbytes', 'sum'), arrays=('key', 'count'))
+        elif by == 'model':
+            df = df[df['model'] != '']
+            # A model that returns a dict produces several arrays, so its run
+            # time is only counted once
+            df = df.groupby(['object', 'model'], as_index=False).agg(
+                nbytes=('nbytes', 'sum'), arrays=('key', 'count'),
+                model_calls=('model_calls', 'max'),
+                model_time=('model_time', 'max'))
+        else:
+            raise Exception(f'Unrecognized option for by: {by}')
+        df = df.sort_values('nbytes', ascending=False, kind='stable')
+        return df.reset_index(drop=True)
+
     def __str__(self):  # pragma: no cover
         hr = '―'*78
         s = '═'*78 + '\n'
@@ -259,3 +437,21 @@ class Project(SimpleList):
             s += item.__repr__() + '\n'
         s += hr
         return s
+
+
+def _nbytes(arr):
+    # The memory held by an array, or by an object made of several arrays
+    # such as a sparse matrix or kd-tree
+    from openpnm.utils import is_compact
+    if isinstance(arr, np.ndarray):
+        return arr[:1].nbytes if is_compact(arr) else arr.nbytes
+    if isinstance(arr, (tuple, list)):
+        return sum([_nbytes(a) for a in arr])
+    parts = [getattr(arr, a, None) for a in
+             ['data', 'indices', 'indptr', 'row', 'col', 'offsets']]
+    parts = [a for a in parts if isinstance(a, np.ndarray)]
+    if len(parts):
+        return sum([a.nbytes for a in parts])
+    if sprs.issparse(arr):  # Formats such as dok are not made of arrays
+        return _nbytes(arr.tocoo())
+    return sys.getsizeof(arr)
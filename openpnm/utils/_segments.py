@@ -0,0 +1,109 @@
+import numpy as np
+
+
+__all__ = [
+    'segment_reduce',
+]
+
+
+def segment_reduce(values, indptr, mode='min', weights=None, ignore_nans=True):
+    r"""
+    Reduces contiguous segments of an array to a single value each
+
+    Parameters
+    ----------
+    values : ndarray
+        The values to reduce, arranged so that the entries belonging to
+        segment ``i`` are found in ``values[indptr[i]:indptr[i+1]]``. This is
+        the layout of the ``data`` (or ``indices``) attribute of a CSR matrix.
+    indptr : ndarray
+        The offset of each segment into ``values``, with a final entry equal
+        to the length of ``values``, as found on a CSR matrix.
+    mode : str
+        How the values in each segment are combined. Options are:
+
+            ===========  =====================================================
+            mode         meaning
+            ===========  =====================================================
+            'min'        The minimum value in each segment
+            'max'        The maximum value in each segment
+            'mean'       The average value in each segment, weighted by
+                         ``weights`` if given
+            'sum'        The sum of the values in each segment
+            ===========  =====================================================
+
+    weights : ndarray, optional
+        The weight of each entry in ``values``, only used when ``mode`` is
+        'mean'.
+    ignore_nans : bool
+        If ``True`` (default) ``nans`` are excluded from each segment,
+        otherwise they propagate to the result.
+
+    Returns
+    -------
+    result : ndarray
+        An array with one value per segment. Segments that contain no
+        (non-nan) values are given ``inf`` when ``mode`` is 'min', ``-inf``
+        when it is 'max', 0 when it is 'sum' and ``nan`` when it is 'mean'.
+
+    Notes
+    -----
+    The reduction uses ``ufunc.reduceat`` on the non-empty segments, which
+    is considerably faster than scattering the values with ``ufunc.at``.
+
+    """
+    values = np.asarray(values)
+    indptr = np.asarray(indptr)
+    if values.dtype == bool or values.dtype.kind in 'iu':
+        values = values.astype(float)
+    n = indptr.size - 1
+    shape = (n, ) + values.shape[1:]
+    fill = {'min': np.inf, 'max': -np.inf, 'sum': 0.0}.get(mode, np.nan)
+    result = np.full(shape, fill, dtype=values.dtype)
+    lengths = np.diff(indptr)
+    nonempty = lengths > 0
+    if not np.any(nonempty):
+        return result
+    starts = indptr[:-1][nonempty]
+    k = lengths[nonempty][0]
+    if np.all(lengths == k):
+        # All segments are the same length (e.g. the 2 pores on each
+        # throat) so combine the columns of the reshaped array directly
+        def reduce(f, arr):
+            arr = arr.reshape(n, k, *arr.shape[1:])
+            if k > 16:
+                return f.reduce(arr, axis=1)
+            out = arr[:, 0].copy()
+            for j in range(1, k):
+                f(out, arr[:, j], out=out)
+            return out
+    else:
+        def reduce(f, arr):
+            return f.reduceat(arr, starts, axis=0)
+    nans = np.isnan(values) if ignore_nans else None
+    if ignore_nans and not np.any(nans):
+        ignore_nans = False
+    if mode in ['min', 'max']:
+        if ignore_nans:
+            values = np.where(nans, np.inf if mode == 'min' else -np.inf, values)
+        # Segments of only nans are left at +/-inf, like empty segments
+        result[nonempty] = reduce(np.minimum if mode == 'min' else np.maximum,
+                                  values)
+    elif mode in ['mean', 'sum']:
+        if (weights is None) or (mode == 'sum'):
+            weights = np.ones(values.shape[0])
+        weights = np.asarray(weights, dtype=float)
+        weights = weights.reshape(weights.shape + (1, )*(values.ndim - 1))
+        weights = np.broadcast_to(weights, values.shape)
+        if ignore_nans:
+            values = np.where(nans, 0.0, values)
+            weights = np.where(nans, 0.0, weights)
+        total = reduce(np.add, values*weights)
+        if mode == 'sum':
+            result[nonempty] = total
+        else:
+            with np.errstate(divide='ignore', invalid='ignore'):
+                result[nonempty] = total/reduce(np.add, weights)
+    else:
+        raise Exception(f'Unrecognized mode {mode}')
+    return result
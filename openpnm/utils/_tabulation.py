@@ -0,0 +1,178 @@
+import logging
+import numpy as np
+
+
+logger = logging.getLogger(__name__)
+
+
+__all__ = [
+    'PropertyTable',
+]
+
+
+class PropertyTable:
+    r"""
+    A lookup table of a pore-scale model's values on a grid of temperature
+    and (optionally) pressure
+
+    Once built, calls to ``run`` return values obtained by (bi)linear
+    interpolation of the table, and the exact model is only called for the
+    locations where the conditions fall outside of the tabulated range.
+
+    Parameters
+    ----------
+    T_range : list of 2 scalars
+        The lower and upper temperature values to tabulate
+    P_range : list of 2 scalars, optional
+        The lower and upper pressure values to tabulate. If not given the
+        table is only a function of temperature, which is suitable for
+        isobaric simulations.
+    T : str
+        The dictionary key containing the temperature values on the target
+    P : str
+        The dictionary key containing the pressure values on the target
+    num_T : int
+        The number of points in the temperature direction of the initial grid
+    num_P : int
+        The number of points in the pressure direction of the initial grid
+    rtol : float
+        The maximum relative error allowed between the interpolated and exact
+        values, as measured at the centre of each cell of the grid. The grid
+        is refined until this tolerance is met or ``max_points`` is reached.
+    max_points : int
+        The maximum number of grid points allowed along each direction when
+        refining the table.
+
+    Notes
+    -----
+    The table is only valid if the model depends on temperature and pressure
+    alone, so it should not be used for mixtures whose composition varies
+    from pore to pore. Tables are not updated automatically, so if any
+    parameters of the phase are changed the table must be rebuilt.
+
+    """
+
+    def __init__(self, T_range, P_range=None, T='pore.temperature',
+                 P='pore.pressure', num_T=50, num_P=10, rtol=1e-4,
+                 max_points=5000):
+        self.T = T
+        self.P = P
+        self.T_range = [float(T_range[0]), float(T_range[1])]
+        self.P_range = None
+        if P_range is not None:
+            self.P_range = [float(P_range[0]), float(P_range[1])]
+        self.num_T = max(int(num_T), 2)
+        self.num_P = max(int(num_P), 2) if P_range is not None else 1
+        self.rtol = rtol
+        self.max_points = max_points
+        self.values = None
+        self.error = np.inf
+
+    @property
+    def T_grid(self):
+        return np.linspace(*self.T_range, self.num_T)
+
+    @property
+    def P_grid(self):
+        if self.P_range is None:
+            return np.array([np.nan])
+        return np.linspace(*self.P_range, self.num_P)
+
+    def build(self, model, target, **kwargs):
+        r"""
+        Evaluates the model on the grid, refining it until the requested
+        tolerance is met
+        """
+        while True:
+            Ts, Ps = np.meshgrid(self.T_grid, self.P_grid, indexing='ij')
+            vals = self._evaluate(model, target, kwargs, Ts.ravel(), Ps.ravel())
+            self.values = vals.reshape(Ts.shape)
+            # Check the interpolation error at the centre of each cell
+            Tc = (self.T_grid[:-1] + self.T_grid[1:])/2
+            Pc = self.P_grid
+            if self.P_range is not None:
+                Pc = (Pc[:-1] + Pc[1:])/2
+            Ts, Ps = np.meshgrid(Tc, Pc, indexing='ij')
+            exact = self._evaluate(model, target, kwargs, Ts.ravel(), Ps.ravel())
+            approx = self.interpolate(Ts.ravel(), Ps.ravel())
+            with np.errstate(divide='ignore', invalid='ignore'):
+                err = np.abs(approx - exact)/np.abs(exact)
+            self.error = np.nanmax(err) if np.any(np.isfinite(err)) else 0.0
+            if self.error <= self.rtol:
+                break
+            if self.num_T*2 - 1 > self.max_points:
+                logger.warning(f'Tabulated values have a relative error of'
+                               f' {self.error:.2e}, which exceeds the requested'
+                               f' tolerance of {self.rtol:.2e}')
+                break
+            self.num_T = self.num_T*2 - 1
+            if self.P_range is not None:
+                self.num_P = min(self.num_P*2 - 1, self.max_points)
+        return self
+
+    def _evaluate(self, model, target, kwargs, T, P):
+        # Run the model with the given conditions written onto the target,
+        # one batch of Np points at a time, then restore the original values
+        T0 = target[self.T].copy()
+        if self.P_range is not None:
+            P0 = target[self.P].copy()
+        N = T0.shape[0]
+        vals = np.zeros_like(T, dtype=float)
+        try:
+            for i in range(0, T.size, N):
+                n = min(N, T.size - i)
+                temp = np.full(N, T[i+n-1])
+                temp[:n] = T[i:i+n]
+                target[self.T] = temp
+                if self.P_range is not None:
+                    temp = np.full(N, P[i+n-1])
+                    temp[:n] = P[i:i+n]
+                    target[self.P] = temp
+                v = np.atleast_1d(model(target, **kwargs))
+                if v.ndim > 1:
+                    raise Exception('Only models returning a single value per'
+                                    ' location can be tabulated')
+                vals[i:i+n] = np.broadcast_to(v, (N, ))[:n]
+        finally:
+            target[self.T] = T0
+            if self.P_range is not None:
+                target[self.P] = P0
+        return vals
+
+    def interpolate(self, T, P=None):
+        r"""
+        Finds the values at the given conditions by interpolating the table
+        """
+        T = np.asarray(T, dtype=float)
+        v = self.values
+        dT = (self.T_range[1] - self.T_range[0])/(self.num_T - 1)
+        fi = (T - self.T_range[0])/dT
+        i = np.clip(np.floor(fi).astype(int), 0, self.num_T - 2)
+        wt = fi - i
+        if self.P_range is None:
+            return v[i, 0]*(1 - wt) + v[i+1, 0]*wt
+        P = np.asarray(P, dtype=float)
+        dP = (self.P_range[1] - self.P_range[0])/(self.num_P - 1)
+        fj = (P - self.P_range[0])/dP
+        j = np.clip(np.floor(fj).astype(int), 0, self.num_P - 2)
+        wp = fj - j
+        return (v[i, j]*(1 - wt) + v[i+1, j]*wt)*(1 - wp) \
+            + (v[i, j+1]*(1 - wt) + v[i+1, j+1]*wt)*wp
+
+    def run(self, model, target, **kwargs):
+        r"""
+        Returns the tabulated values at the current conditions on the target,
+        falling back to the exact model wherever they are out of range
+        """
+        T = target[self.T]
+        P = None
+        inside = (T >= self.T_range[0]) & (T <= self.T_range[1])
+        if self.P_range is not None:  # The pressure is not needed otherwise
+            P = target[self.P]
+            inside &= (P >= self.P_range[0]) & (P <= self.P_range[1])
+        vals = self.interpolate(T, P)
+        if not np.all(inside):
+            exact = np.atleast_1d(model(target, **kwargs))
+            exact = np.broadcast_to(exact, vals.shape)
+            vals[~inside] = exact[~inside]
+        return vals
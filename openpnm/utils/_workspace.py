@@ -38,8 +38,22 @@ class WorkspaceSettings(SettingsAttr):
         50      CRITICAL: A serious error, indicating that the program itself
                 may be unable to continue running.
         ======= ==============================================================
+
+    compact_indices : bool
+        The default value of this setting for new Projects, see
+        ``ProjectSettings``.
+    geometry_dtype : str
+        The default value of this setting for new Projects, see
+        ``ProjectSettings``.
+    profile_models : bool
+        If ``True`` the number of calls to each pore-scale model and the
+        total time spent running it are recorded, and reported by
+        ``Project.footprint``. The default is ``False``.
     """
     default_solver = 'PardisoSpsolve'
+    compact_indices = False
+    geometry_dtype = 'float64'
+    profile_models = False
 
     @property
     def loglevel(self):
@@ -22,6 +22,64 @@ class DrainageTest:
         # plt.imshow((drn['pore.invasion_pressure'] +
         #             20000*self.pn['pore.left']).reshape([10, 10]), origin='lower')
 
+    def test_run_matches_percolation_at_each_pressure(self):
+        np.random.seed(0)
+        pn = op.network.Cubic(shape=[12, 10, 3])
+        op.topotools.trim(pn, throats=np.random.rand(pn.Nt) < 0.3)
+        ph = op.phase.Phase(network=pn)
+        ph['throat.entry_pressure'] = np.round(np.random.rand(pn.Nt), 2)
+        for pressures in [np.linspace(0, 1, 15), [0.6, 0.3, 0.6, 0.9, 0.2]]:
+            drn = op.algorithms.Drainage(network=pn, phase=ph)
+            drn.set_inlet_BC(pores=pn.pores('left'))
+            drn.run(pressures)
+            # Find the invaded clusters at each pressure in turn
+            Pseq = -np.ones(pn.Np, dtype=int)
+            Tseq = -np.ones(pn.Nt, dtype=int)
+            for i, p in enumerate(pressures):
+                Tinv = ph['throat.entry_pressure'] <= p
+                s, b = op._skgraph.simulations.bond_percolation(pn.conns, Tinv)
+                hits = np.unique(s[pn['pore.left']])
+                hits = hits[hits >= 0]
+                Pseq[np.isin(s, hits) & (Pseq < 0)] = i
+                Tseq[np.isin(b, hits) & (Tseq < 0)] = i
+            assert np.all(drn['pore.invasion_sequence'] == Pseq)
+            assert np.all(drn['throat.invasion_sequence'] == Tseq)
+            p = np.append(pressures, np.inf)
+            assert np.all(drn['pore.invasion_pressure'] == p[Pseq])
+            assert np.all(drn['throat.invasion_pressure'] == p[Tseq])
+            assert np.all(drn['pore.invaded'] == (Pseq >= 0))
+
+    def test_run_with_nan_entry_pressures(self):
+        pn = op.network.Cubic(shape=[8, 6, 1])
+        ph = op.phase.Phase(network=pn)
+        np.random.seed(0)
+        entry = np.random.rand(pn.Nt)
+        entry[::3] = np.nan
+        ph['throat.entry_pressure'] = entry
+        drn = op.algorithms.Drainage(network=pn, phase=ph)
+        drn.set_inlet_BC(pores=pn.pores('left'))
+        drn.run(8)
+        p = drn['throat.invasion_pressure']
+        assert not np.any(np.isnan(p))
+        assert np.all(np.isinf(p[::3]))
+        assert np.all(drn['throat.invaded'][1::3])
+        # NaN entry pressures behave as infinite ones
+        ph['throat.entry_pressure'] = np.where(np.isnan(entry), np.inf, entry)
+        ref = op.algorithms.Drainage(network=pn, phase=ph)
+        ref.set_inlet_BC(pores=pn.pores('left'))
+        ref.run(np.unique(p[np.isfinite(p)]))
+        assert np.all(ref['pore.invasion_pressure']
+                      == drn['pore.invasion_pressure'])
+        # Nothing is invaded if all the entry pressures are NaN
+        ph['throat.entry_pressure'] = np.nan
+        drn = op.algorithms.Drainage(network=pn, phase=ph)
+        drn.set_inlet_BC(pores=pn.pores('left'))
+        drn.run(8)
+        assert not np.any(drn['pore.invaded'] & ~pn['pore.left'])
+        assert not np.any(drn['throat.invaded'])
+        with pytest.raises(Exception):
+            drn.run([1.0, np.nan])
+
     def test_pccurve(self):
         drn = op.algorithms.Drainage(network=self.pn, phase=self.air)
         drn.set_inlet_BC(pores=self.pn.pores('left'), mode='add')
@@ -46,6 +104,40 @@ class DrainageTest:
         data = drn.pc_curve(np.linspace(0, 50000, 10))
         assert max(data[1]) < 1.0
 
+    def test_apply_trapping_matches_site_percolation(self):
+        np.random.seed(1)
+        pn = op.network.Cubic(shape=[12, 10, 2])
+        op.topotools.trim(pn, throats=np.random.rand(pn.Nt) < 0.25)
+        ph = op.phase.Phase(network=pn)
+        ph['throat.entry_pressure'] = np.round(np.random.rand(pn.Nt), 1)
+        drn = op.algorithms.Drainage(network=pn, phase=ph)
+        drn.set_inlet_BC(pores=pn.pores('left'))
+        drn.run(np.linspace(0, 1, 11))
+        pseq = np.copy(drn['pore.invasion_pressure'])
+        tseq = np.copy(drn['throat.invasion_pressure'])
+        drn.set_outlet_BC(pores=pn.pores('right'))
+        drn.apply_trapping()
+        # Find the defending clusters cut off from the outlets at each pressure
+        Pt = np.zeros(pn.Np, dtype=bool)
+        Tt = np.all(pseq[pn.conns] > tseq[:, None], axis=1)
+        for p in np.unique(pseq):
+            s, b = op._skgraph.simulations.site_percolation(pn.conns, pseq > p)
+            hits = np.unique(s[pn['pore.right']])
+            Pt += (s >= 0) & ~np.isin(s, hits)
+            b = np.amax(s[pn.conns], axis=1)
+            Tt += (b >= 0) & ~np.isin(b, hits)
+        assert Pt.sum() > 0
+        assert np.all(drn['pore.trapped'] == Pt)
+        assert np.all(drn['throat.trapped'] == Tt)
+        assert np.all(np.isinf(drn['pore.invasion_pressure'][Pt]))
+        # NaN invasion pressures do not stop the sweep, and those pores are
+        # never trapped
+        drn['pore.invasion_pressure'] = pseq
+        drn['pore.invasion_pressure'][[0, 5]] = np.nan
+        drn['pore.trapped'] = False
+        drn.apply_trapping()
+        assert not np.any(drn['pore.trapped'][[0, 5]])
+
 
 if __name__ == "__main__":
 
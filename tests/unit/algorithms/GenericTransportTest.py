@@ -170,6 +170,22 @@ class TransportTest:
         # Revert back changes to objects
         self.setup_class()
 
+    def test_A_matches_laplacian(self):
+        from scipy.sparse import csgraph
+        net = op.network.Cubic(shape=[4, 4, 4])
+        phase = op.phase.Phase(network=net)
+        alg = op.algorithms.Transport(network=net, phase=phase)
+        alg.settings._update({"quantity": "pore.concentration",
+                              "conductance": "throat.conductance",
+                              "cache": False})
+        for g in [np.random.rand(net.Nt), np.random.rand(net.Nt, 2)]:
+            phase["throat.conductance"] = g
+            alg._build_A()
+            am = net.create_adjacency_matrix(weights=g, fmt='coo')
+            L = csgraph.laplacian(am)
+            assert alg.A.format == 'coo'
+            nt.assert_allclose(alg.A.toarray(), L.toarray())
+
     def test_rate_single_pore(self):
         alg = op.algorithms.ReactiveTransport(network=self.net,
                                               phase=self.phase)
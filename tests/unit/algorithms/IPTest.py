@@ -42,13 +42,41 @@ class IPTest:
         alg.run()
         assert alg["throat.invasion_sequence"].max() == alg.Nt
 
-    # def test_multiple_calls_to_run(self):
-    #     alg = op.algorithms.InvasionPercolation(network=self.net, phase=self.water)
-    #     alg.set_inlet_BC(pores=self.net.pores("top"))
-    #     alg.run(n_steps=10)
-    #     assert alg['pore.invasion_sequence'].max() == 10
-    #     alg.run(n_steps=10)
-    #     assert alg['pore.invasion_sequence'].max() == 20
+    def test_multiple_calls_to_run(self):
+        alg = op.algorithms.InvasionPercolation(network=self.net, phase=self.water)
+        alg.set_inlet_BC(pores=self.net.pores("top"))
+        alg.run(n_steps=10)
+        assert alg['throat.invasion_sequence'].max() == 10
+        alg.run(n_steps=10)
+        assert alg['throat.invasion_sequence'].max() == 20
+        alg.run()
+        ref = op.algorithms.InvasionPercolation(network=self.net, phase=self.water)
+        ref.set_inlet_BC(pores=self.net.pores("top"))
+        ref.run()
+        assert np.all(alg['pore.invasion_sequence'] == ref['pore.invasion_sequence'])
+        assert np.all(alg['throat.invasion_sequence']
+                      == ref['throat.invasion_sequence'])
+        assert np.all(alg['pore.invasion_pressure'] == ref['pore.invasion_pressure'])
+
+    def test_run_stopping_criteria(self):
+        alg = op.algorithms.InvasionPercolation(network=self.net, phase=self.water)
+        alg.set_inlet_BC(pores=self.net.pores("top"))
+        alg.run(pressure=750.0)
+        tseq = alg['throat.invasion_sequence']
+        assert alg['throat.invasion_pressure'][tseq >= 0].max() <= 750.0
+        assert np.all(np.isinf(alg['pore.invasion_pressure'][
+            alg['pore.invasion_sequence'] < 0]))
+        pseq = alg['pore.invasion_sequence']
+        Vp = self.net['pore.volume']
+        Vt = self.net['throat.volume']
+        Vtot = Vp.sum() + Vt.sum()
+        assert (Vp[pseq >= 0].sum() + Vt[tseq >= 0].sum())/Vtot < 0.5
+        alg.run(saturation=0.5)
+        n = tseq.max()
+        assert (Vp[pseq >= 0].sum() + Vt[tseq >= 0].sum())/Vtot >= 0.5
+        # The last step taken was needed to reach the target saturation
+        Vn = Vp[pseq == n].sum() + Vt[tseq == n].sum()
+        assert (Vp[pseq >= 0].sum() + Vt[tseq >= 0].sum() - Vn)/Vtot < 0.5
 
     def test_results(self):
         alg = op.algorithms.InvasionPercolation(network=self.net, phase=self.water)
@@ -67,6 +95,42 @@ class IPTest:
         alg.apply_trapping()
         assert "pore.trapped" in alg.keys()
 
+    def test_run_with_trapping(self):
+        np.random.seed(0)
+        pn = op.network.Cubic(shape=[15, 15, 1])
+        ph = op.phase.Phase(network=pn)
+        ph['throat.entry_pressure'] = np.random.rand(pn.Nt)
+        ref = op.algorithms.InvasionPercolation(network=pn, phase=ph)
+        ref.set_inlet_BC(pores=pn.pores('left'))
+        ref.run()
+        alg = op.algorithms.InvasionPercolation(network=pn, phase=ph)
+        alg.settings['trapping'] = True
+        alg.set_inlet_BC(pores=pn.pores('left'))
+        with pytest.raises(Exception):
+            alg.run()
+        alg.set_outlet_BC(pores=pn.pores('right'))
+        alg.reset()
+        alg.run(n_steps=100)
+        alg.run()
+        # A pore is trapped if its cluster of defending phase had no outlet
+        # just before the invasion without trapping reached it
+        ref_seq = ref['pore.invasion_sequence']
+        trapped = np.zeros(pn.Np, dtype=bool)
+        for p in np.where(ref_seq > 0)[0]:
+            s, b = op._skgraph.simulations.site_percolation(
+                pn.conns, ref_seq >= ref_seq[p])
+            trapped[p] = not np.any(s[pn['pore.right']] == s[p])
+        assert trapped.sum() > 0
+        assert np.all(alg['pore.trapped'] == trapped)
+        # The untrapped pores are invaded in the same order, but the invasion
+        # sequence has no gaps
+        pseq = alg['pore.invasion_sequence']
+        tseq = alg['throat.invasion_sequence']
+        assert np.all((pseq < 0) == trapped)
+        assert np.all(np.argsort(pseq[~trapped]) == np.argsort(ref_seq[~trapped]))
+        assert tseq.max() == np.sum(tseq > 0)
+        assert np.all(alg['throat.trapped'] == (tseq < 0))
+
     def test_plot_pc_curve(self):
         alg = op.algorithms.InvasionPercolation(network=self.net, phase=self.water)
         alg.set_inlet_BC(pores=self.net.pores("top"))
@@ -43,6 +43,13 @@ class SolversTest:
         x = self.alg['pore.x']
         nt.assert_allclose(x.mean(), 0.624134, rtol=1e-5)
 
+    def test_two_level_cg(self):
+        agg = op.topotools.find_aggregates(self.net, divs=2)
+        solver = op.solvers.TwoLevelCG(aggregates=agg)
+        self.alg.run(solver=solver)
+        x = self.alg['pore.x']
+        nt.assert_allclose(x.mean(), 0.624134, rtol=1e-5)
+
 
 if __name__ == '__main__':
     t = SolversTest()
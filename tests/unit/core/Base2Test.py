@@ -146,6 +146,84 @@ class Base2Test:
         assert g['pore.dict3.item1@left'].sum() == 3
         assert g['pore.dict3.item1@right'].sum() == 3
 
+    def test_scalars_stored_as_full_arrays(self):
+        pn = op.network.Cubic(shape=[5, 5, 5])
+        pn['pore.blah'] = 2.0
+        a = pn['pore.blah']
+        assert not op.utils.is_compact(dict.__getitem__(pn, 'pore.blah'))
+        a[0] = 5.0
+        assert np.asarray(a)[0] == 5.0
+        assert a.tolist()[0] == 5.0
+        a[:].fill(3.0)
+        assert np.all(pn['pore.blah'] == 3.0)
+
+    def test_compact_arrays_expanded_on_read(self):
+        pn = op.network.Cubic(shape=[5, 5, 5])
+        pn['pore.blah'] = op.utils.compact_array(2.0, pn.Np)
+        assert op.utils.is_compact(dict.__getitem__(pn, 'pore.blah'))
+        v = pn._get_version('pore.blah')
+        vals = pn['pore.blah']
+        assert not op.utils.is_compact(dict.__getitem__(pn, 'pore.blah'))
+        assert vals is dict.__getitem__(pn, 'pore.blah')
+        assert pn._get_version('pore.blah') != v
+        vals[0] = 3.0
+        assert pn['pore.blah'][0] == 3.0
+        assert np.all(pn['pore.blah'][1:] == 2.0)
+
+    def test_elementwise_model_with_uniform_inputs(self):
+        pn = op.network.Cubic(shape=[5, 5, 5])
+        water = op.phase.Water(network=pn)
+        assert op.utils.is_compact(dict.__getitem__(water, 'pore.viscosity'))
+        mu = water['pore.viscosity'].copy()
+        assert mu.shape == (pn.Np, )
+        water['pore.temperature'] = 350.0
+        water.regenerate_models('pore.viscosity')
+        assert op.utils.is_compact(dict.__getitem__(water, 'pore.viscosity'))
+        assert np.all(water['pore.viscosity'] < mu)
+        water['pore.temperature'][0] = 298.0
+        water.regenerate_models('pore.viscosity')
+        assert not op.utils.is_compact(dict.__getitem__(water, 'pore.viscosity'))
+        assert water['pore.viscosity'][0] == mu[0]
+        assert np.all(water['pore.viscosity'][1:] < mu[1:])
+
+    def test_domain_indices_are_cached_and_invalidated(self):
+        pn = op.network.Cubic(shape=[5, 5, 5])
+        pn['pore.blah'] = np.arange(pn.Np, dtype=float)
+        a = pn._get_domain_indices('pore.left')
+        assert a is pn._get_domain_indices('pore.left')
+        assert np.all(pn['pore.blah@left'] == pn.pores('left'))
+        # Changing the label in place is picked up
+        pn['pore.left'][0] = False
+        assert 0 not in pn._get_domain_indices('pore.left')
+        assert np.all(pn['pore.blah@left'] == pn.pores('left'))
+        pn.set_label(label='left', pores=[0, 124])
+        assert pn['pore.blah@left'].size == 26
+        assert np.all(pn['pore.blah@left'] == pn.pores('left'))
+        pn.set_label(label='left', pores=[124], mode='remove')
+        assert np.all(pn['pore.blah@left'] == pn.pores('left'))
+        # Overwriting the label discards the cached indices
+        pn['pore.left'] = pn['pore.right']
+        assert a is not pn._get_domain_indices('pore.left')
+        pn['pore.blah@left'] = -1.0
+        assert np.all(pn['pore.blah'][pn.pores('right')] == -1.0)
+
+    def test_nested_lookups_use_prefix_index(self):
+        pn = op.network.Cubic(shape=[3, 3, 3])
+        pn['pore.nest.b'] = 1.0
+        pn['pore.nest.a'] = 2.0
+        pn['pore.nest.c.d'] = 3.0
+        assert list(pn['pore.nest'].keys()) == ['b', 'a', 'c.d']
+        assert list(pn['pore.nest.c'].keys()) == ['d']
+        del pn['pore.nest.c']
+        assert 'pore.nest.c' not in pn._prefix_index.keys()
+        pn.pop('pore.nest.b')
+        assert list(pn['pore.nest'].keys()) == ['a']
+        pn.update({'pore.nest.e': np.ones(pn.Np)})
+        assert list(pn['pore.nest'].keys()) == ['a', 'e']
+        del pn['pore.nest']
+        with pytest.raises(KeyError):
+            pn['pore.nest']
+
 
 if __name__ == '__main__':
 
@@ -41,7 +41,48 @@ class ModelsTest:
         e = self.net['pore.diameter'].copy()
         assert not np.any(b == e)
 
+    def test_tabulate_model(self):
+        water = op.phase.Water(network=self.net)
+        np.random.seed(0)
+        water['pore.temperature'] = 300 + np.random.rand(self.net.Np)*50
+        water.regenerate_models()
+        ref = water['pore.viscosity'].copy()
+        water.tabulate_model('pore.viscosity', T_range=[280, 360], rtol=1e-5)
+        table = water.models['pore.viscosity@all'].table
+        assert table.error <= 1e-5
+        water['pore.viscosity'] = 0.0
+        water.regenerate_models('pore.viscosity')
+        np.testing.assert_allclose(water['pore.viscosity'], ref, rtol=1e-5)
+        assert not np.all(water['pore.viscosity'] == ref)
+        # The pressure is not needed by a table of temperature alone
+        P = water.pop('pore.pressure')
+        water.run_model('pore.viscosity')
+        np.testing.assert_allclose(water['pore.viscosity'], ref, rtol=1e-5)
+        water.tabulate_model('pore.viscosity', T_range=[280, 360], rtol=1e-5)
+        assert 'pore.pressure' not in water.keys()
+        water.run_model('pore.viscosity')
+        np.testing.assert_allclose(water['pore.viscosity'], ref, rtol=1e-5)
+        water['pore.pressure'] = P
+        # Conditions outside the table fall back to the exact model
+        water['pore.temperature'][0] = 370.0
+        water.run_model('pore.viscosity')
+        tabulated = water['pore.viscosity'].copy()
+        water.untabulate_model('pore.viscosity')
+        assert water.models['pore.viscosity@all'].table is None
+        water.run_model('pore.viscosity')
+        assert tabulated[0] == water['pore.viscosity'][0]
 
+    def test_tabulate_model_with_pressure(self):
+        air = op.phase.Air(network=self.net)
+        np.random.seed(0)
+        air['pore.temperature'] = 300 + np.random.rand(self.net.Np)*50
+        air['pore.pressure'] = 1e5 + np.random.rand(self.net.Np)*1e5
+        air.regenerate_models()
+        ref = air['pore.density'].copy()
+        air.tabulate_model('pore.density', T_range=[290, 360],
+                           P_range=[0.9e5, 2.1e5], rtol=1e-6)
+        air.regenerate_models('pore.density')
+        np.testing.assert_allclose(air['pore.density'], ref, rtol=1e-6)
 
 
 if __name__ == '__main__':
@@ -211,6 +211,50 @@ class MiscTest:
                                               0.48484848, 0.54545455,
                                               0.57575758, 0.63636364]))
 
+    def test_from_neighbor_throats_sum_and_weighted_mean(self):
+        net = op.network.Cubic(shape=[3, 3, 3])
+        net['throat.values'] = np.random.rand(net.Nt)
+        net['throat.values'][0] = np.nan
+        net['throat.weights'] = np.random.rand(net.Nt)
+        vals = net['throat.values'].copy()
+        f = mods.from_neighbor_throats
+        s = f(net, prop='throat.values', mode='sum')
+        m = f(net, prop='throat.values', mode='mean', weights='throat.weights')
+        # The data on the network should not be altered by the model
+        assert np.array_equal(net['throat.values'], vals, equal_nan=True)
+        w = np.copy(net['throat.weights'])
+        w[0] = 0.0
+        vals[0] = 0.0
+        for p in net.Ps:
+            Ts = net.find_neighbor_throats(pores=p)
+            assert np.isclose(s[p], vals[Ts].sum())
+            assert np.isclose(m[p], (vals[Ts]*w[Ts]).sum()/w[Ts].sum())
+
+    def test_from_neighbor_throats_isolated_pore(self):
+        net = op.network.Cubic(shape=[3, 1, 1])
+        net['throat.values'] = [1.0, 2.0]
+        op.topotools.trim(network=net, throats=1)
+        f = mods.from_neighbor_throats
+        vals = f(net, prop='throat.values', mode='min')
+        assert np.array_equal(vals, [1.0, 1.0, np.inf])
+        vals = f(net, prop='throat.values', mode='max')
+        assert np.array_equal(vals, [1.0, 1.0, -np.inf])
+        vals = f(net, prop='throat.values', mode='mean')
+        assert np.array_equal(vals, [1.0, 1.0, np.nan], equal_nan=True)
+        vals = f(net, prop='throat.values', mode='sum')
+        assert np.array_equal(vals, [1.0, 1.0, 0.0])
+
+    def test_from_neighbor_pores_weighted_mean(self):
+        net = op.network.Cubic(shape=[3, 3, 3])
+        net['pore.values'] = np.random.rand(net.Np)
+        net['pore.weights'] = np.random.rand(net.Np)
+        f = mods.from_neighbor_pores
+        vals = f(net, prop='pore.values', mode='mean', weights='pore.weights')
+        P12 = net.conns
+        w = net['pore.weights'][P12]
+        ref = (net['pore.values'][P12]*w).sum(axis=1)/w.sum(axis=1)
+        assert np.allclose(vals, ref)
+
     def test_from_neighbor_pores_min(self):
         del self.net['throat.seed']
         del self.net.models['throat.seed']
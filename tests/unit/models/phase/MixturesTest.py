@@ -1,5 +1,7 @@
 import openpnm as op
 import numpy as np
+import chemicals
+from numpy.testing import assert_allclose
 # from openpnm.phase import mixtures
 import openpnm.models as mods
 
@@ -7,6 +9,76 @@ import openpnm.models as mods
 class MixturesTest:
     def setup_class(self):
         self.net = op.network.Cubic(shape=[3, 3, 3])
+        self.o2 = op.phase.Species(network=self.net, species='oxygen')
+        self.n2 = op.phase.Species(network=self.net, species='nitrogen')
+        for c in [self.o2, self.n2]:
+            c.add_model(propname='pore.viscosity',
+                        model=mods.phase.viscosity.gas_pure_gesmr)
+            c.add_model(propname='pore.thermal_conductivity',
+                        model=mods.phase.thermal_conductivity.gas_pure_gismr)
+        self.air = op.phase.GasMixture(network=self.net,
+                                       components=[self.o2, self.n2])
+        np.random.seed(0)
+        y = np.random.rand(self.net.Np)
+        self.air.y(self.o2, y)
+        self.air.y(self.n2, 1 - y)
+        self.air['pore.temperature'] = 300 + np.random.rand(self.net.Np)*50
+
+    def _loop_over_pores(self, f, **kwargs):
+        vals = []
+        for p in self.net.Ps:
+            a = {}
+            for k, v in kwargs.items():
+                if isinstance(v, list):
+                    a[k] = [np.broadcast_to(i, (self.net.Np, ))[p] for i in v]
+                else:
+                    a[k] = np.broadcast_to(v, (self.net.Np, ))[p]
+            vals.append(f(**a))
+        return np.array(vals)
+
+    def test_vectorized_gas_mixture_viscosity(self):
+        ys = [self.air['pore.mole_fraction.' + c] for c in self.air.components]
+        mus = list(self.air.get_comp_vals('pore.viscosity').values())
+        MWs = list(self.air.get_comp_vals('param.molecular_weight').values())
+        for f in [chemicals.viscosity.Wilke,
+                  chemicals.viscosity.Herning_Zipperer]:
+            vals = mods.phase.chemicals_wrapper(phase=self.air, f=f)
+            ref = self._loop_over_pores(f, ys=ys, mus=mus, MWs=MWs) \
+                if f.__name__ == 'Wilke' else \
+                self._loop_over_pores(f, zs=ys, mus=mus, MWs=MWs)
+            assert_allclose(vals, ref, rtol=1e-12)
+
+    def test_vectorized_gas_mixture_thermal_conductivity(self):
+        f = chemicals.thermal_conductivity.Lindsay_Bromley
+        vals = mods.phase.chemicals_wrapper(phase=self.air, f=f,
+                                            ks='pore.thermal_conductivity')
+        ref = self._loop_over_pores(
+            f,
+            T=self.air['pore.temperature'],
+            ys=[self.air['pore.mole_fraction.' + c] for c in self.air.components],
+            ks=list(self.air.get_comp_vals('pore.thermal_conductivity').values()),
+            mus=list(self.air.get_comp_vals('pore.viscosity').values()),
+            Tbs=list(self.air.get_comp_vals('param.boiling_temperature').values()),
+            MWs=list(self.air.get_comp_vals('param.molecular_weight').values()),
+        )
+        assert_allclose(vals, ref, rtol=1e-12)
+
+    def test_vectorized_mass_fraction_based_mixing_rule(self):
+        f = chemicals.thermal_conductivity.DIPPR9H
+        vals = mods.phase.chemicals_wrapper(phase=self.air, f=f,
+                                            ks='pore.thermal_conductivity')
+        ws = mods.phase.mixtures.mole_to_mass_fraction(self.air)
+        ref = self._loop_over_pores(
+            f,
+            ws=list(ws.values()),
+            ks=list(self.air.get_comp_vals('pore.thermal_conductivity').values()),
+        )
+        assert_allclose(vals, ref, rtol=1e-12)
+
+    def test_stack_components(self):
+        stack = mods.phase.mixtures.stack_components
+        assert stack([1.0, 2.0]).shape == (2, 1)
+        assert stack({'a': np.ones(4), 'b': 2.0}).shape == (2, 4)
     #     self.N2 = mixtures.species.gases.N2(network=self.net)
     #     self.O2 = mixtures.species.gases.O2(network=self.net)
     #     self.H2O = mixtures.species.liquids.H2O(network=self.net)
@@ -120,6 +120,21 @@ class CubicTest:
             with pytest.raises(Exception):
                 _ = op.network.Cubic(shape=[3, 4, 5], connectivity=x)
 
+    def test_chunked_generation(self, tmp_path):
+        for x in [6, 14, 18, 20, 26]:
+            net = op.network.Cubic(shape=[5, 4, 3], connectivity=x)
+            net2 = op.network.Cubic(shape=[5, 4, 3], connectivity=x,
+                                    chunk_size=7)
+            assert net2.conns.dtype == np.int32
+            assert np.all(net.conns == net2.conns)
+            assert np.all(net.coords == net2.coords)
+            assert np.all(net['pore.left'] == net2['pore.left'])
+        net3 = op.network.Cubic(shape=[5, 4, 3], connectivity=26,
+                                chunk_size=12, store=str(tmp_path))
+        assert isinstance(net3.conns, np.memmap)
+        assert (tmp_path / 'conns.npy').exists()
+        assert np.all(np.load(tmp_path / 'conns.npy') == net2.conns)
+
 
 if __name__ == '__main__':
 
@@ -106,6 +106,30 @@ class DelaunayGabrielTest:
         tri = op.network.Delaunay(points=30, shape=[1])
         assert op.topotools.dimensionality(network=tri).sum() == 3
 
+    def test_delaunay_tiled_matches_full(self):
+        np.random.seed(0)
+        for shape in [[1, 2, 0], [1, 2, 3]]:
+            pts = np.random.rand(2000, 3)*shape
+            full = op.network.Delaunay(points=pts, shape=shape)
+            for divs, cores in [(3, 1), ([2, 3, 1], 2)]:
+                tiled = op.network.Delaunay(points=pts, shape=shape,
+                                            divs=divs, cores=cores)
+                assert tiled.tri is None
+                assert np.all(tiled.coords == full.coords)
+                assert np.all(tiled.conns == full.conns)
+
+    def test_delaunay_tiled_with_clustered_points(self):
+        # Most tiles and the faces at the far side hold too few points, so
+        # their halos must be widened
+        np.random.seed(0)
+        pts = np.vstack((np.random.rand(2000, 2)*0.1, [[1, 1], [1, 0.05]]))
+        pts = np.hstack((pts, np.zeros((pts.shape[0], 1))))
+        full = op.network.Delaunay(points=pts, shape=[1, 1, 0], reflect=False)
+        tiled = op.network.Delaunay(points=pts, shape=[1, 1, 0], reflect=False,
+                                    divs=3, cores=1)
+        assert np.all(tiled.coords == full.coords)
+        assert np.all(tiled.conns == full.conns)
+
 
 if __name__ == '__main__':
 
@@ -119,6 +119,33 @@ class NetworkTest:
                                            mode='exclusive_or')
         assert np.all(a == [0, 1, 2, 900, 902, 1800, 1802])
 
+    def test_find_neighbors_ragged_matches_unflattened(self):
+        Ps = [0, 1, 55, 555, 999]
+        for mode in ['or', 'xor', 'xnor']:
+            a = self.net.find_neighbor_pores(pores=Ps, mode=mode,
+                                             flatten=False)
+            indptr, indices = self.net.find_neighbor_pores(pores=Ps,
+                                                           mode=mode,
+                                                           ragged=True)
+            for i in range(len(Ps)):
+                assert np.all(indices[indptr[i]:indptr[i+1]] == a[i])
+            a = self.net.find_neighbor_throats(pores=Ps, mode=mode,
+                                               flatten=False)
+            indptr, indices = self.net.find_neighbor_throats(pores=Ps,
+                                                             mode=mode,
+                                                             ragged=True)
+            for i in range(len(Ps)):
+                assert np.all(indices[indptr[i]:indptr[i+1]] == a[i])
+        indptr, indices = self.net.find_connected_pores(throats=self.net.Ts,
+                                                        ragged=True)
+        assert np.all(indices.reshape(-1, 2) == self.net.conns)
+        indptr, indices = self.net.find_neighbor_throats(pores=self.net.Ps,
+                                                         ragged=True)
+        assert np.all(np.diff(indptr) == self.net.num_neighbors(self.net.Ps))
+        indptr, indices = self.net.find_neighbor_pores(pores=[], ragged=True)
+        assert np.all(indptr == [0])
+        assert indices.size == 0
+
     def test_num_neighbors_empty(self):
         a = self.net.num_neighbors(pores=[])
         assert np.size(a) == 0
@@ -180,27 +207,175 @@ class NetworkTest:
         assert np.size(a) == 17
         assert np.all(np.in1d([0, 1], a))
 
+    def test_find_nearby_pores_ragged(self):
+        Ps = [0, 1, 55, 999]
+        for include_input in [True, False]:
+            a = self.net.find_nearby_pores(pores=Ps, r=2,
+                                           include_input=include_input)
+            indptr, indices = self.net.find_nearby_pores(
+                pores=Ps, r=2, include_input=include_input, ragged=True)
+            assert indptr.size == len(Ps) + 1
+            for i in range(len(Ps)):
+                assert np.all(indices[indptr[i]:indptr[i+1]] == a[i])
+        indptr, indices = self.net.find_nearby_pores(pores=self.net.Ps, r=1,
+                                                     include_input=True,
+                                                     ragged=True)
+        assert np.all(np.diff(indptr) == self.net.num_neighbors(self.net.Ps))
+
+    def test_find_nearby_pores_last_pores_isolated(self):
+        net = op.network.Cubic(shape=[3, 3, 3])
+        coords = net['pore.coords']
+        coords[26] = [100, 100, 100]
+        net['pore.coords'] = coords
+        a = net.find_nearby_pores(pores=[0, 26], r=1, flatten=False)
+        assert np.all(a[0] == [1, 3, 9])
+        assert a[1].size == 0
+        indptr, indices = net.find_nearby_pores(pores=[0, 26], r=1,
+                                                ragged=True)
+        assert np.all(indptr == [0, 3, 3])
+
+    def test_find_nearest_pores(self):
+        a = self.net.find_nearest_pores(pores=[0, 555], k=6)
+        assert a.shape == (2, 6)
+        assert np.all(a[0, 3:] > -1)
+        assert set(a[1]) == set(self.net.find_neighbor_pores(pores=555))
+        a = self.net.find_nearest_pores(pores=[0, 555], k=6, r=1.01)
+        assert np.sum(a[0] == -1) == 3
+        assert np.all(a[1] > -1)
+        indptr, indices = self.net.find_nearest_pores(pores=[0, 555], k=6,
+                                                      r=1.01, ragged=True)
+        assert np.all(indptr == [0, 3, 9])
+        assert 0 not in indices[:3]
+
+    def test_kdtree_rebuilt_on_new_coords(self):
+        net = op.network.Cubic(shape=[3, 3, 1])
+        tree = net.get_kdtree()
+        assert net.get_kdtree() is tree
+        net['pore.coords'] = net.coords + 10
+        assert net.get_kdtree() is not tree
+        assert np.allclose(net.get_kdtree().data, net.coords)
+        # In place changes are picked up too
+        tree = net.get_kdtree()
+        net['pore.coords'][0] = [11.5, 11.6, 10.5]
+        a = net.find_nearby_pores(pores=[4], r=0.2)
+        assert np.all(a[0] == [0])
+        assert net.get_kdtree() is not tree
+        net['pore.coords'][:, 0] += 1
+        assert np.allclose(net.get_kdtree().data, net.coords)
+        a = net.find_nearest_pores(pores=[4], k=1)
+        assert a[0, 0] == 0
+
     def test_get_incidence_matrix(self):
         net = op.network.Demo([4, 4, 1])
-        assert net._im == {}
+        net.invalidate_topology()
+        assert net._topology == {}
         im = net.get_incidence_matrix(fmt='coo')
         assert im.shape == (16, 24)
         assert im.data.shape == (48,)
-        assert len(net._im) == 1
+        assert net.get_incidence_matrix(fmt='coo') is im
         im = net.get_incidence_matrix(fmt='dok')
         assert len(im.keys()) == 48
-        assert len(net._im) == 2
+        assert net.get_incidence_matrix(fmt='dok') is im
 
     def test_get_adjacency_matrix(self):
         net = op.network.Demo([4, 4, 1])
-        assert net._am == {}
-        im = net.get_adjacency_matrix(fmt='coo')
-        assert im.shape == (16, 16)
-        assert im.data.shape == (48,)
-        assert len(net._am) == 1
+        net.invalidate_topology()
+        assert net._topology == {}
+        am = net.get_adjacency_matrix(fmt='coo')
+        assert am.shape == (16, 16)
+        assert am.data.shape == (48,)
+        assert net.get_adjacency_matrix(fmt='coo') is am
         am = net.get_adjacency_matrix(fmt='dok')
         assert len(am.keys()) == 48
-        assert len(net._am) == 2
+        assert net.get_adjacency_matrix(fmt='dok') is am
+        am = net.get_adjacency_matrix(fmt='csr')
+        for t, (i, j) in enumerate(net.conns):
+            assert am[i, j] == t
+            assert am[j, i] == t
+
+    def test_topology_cache_invalidation(self):
+        net = op.network.Cubic(shape=[3, 3, 1])
+        am = net.get_adjacency_matrix(fmt='csr')
+        # Assigning new conns
+        net['throat.conns'] = net.conns[1:]
+        assert net.get_adjacency_matrix(fmt='csr') is not am
+        assert net.get_adjacency_matrix(fmt='csr').nnz == 2*net.Nt
+        # Adding pores and throats
+        op.topotools.extend(network=net, coords=[[5, 5, 0]], conns=[[0, 9]])
+        assert net.num_neighbors(pores=9) == 1
+        assert np.all(net.find_neighbor_pores(pores=9) == [0])
+        # Removing pores
+        op.topotools.trim(network=net, pores=[9])
+        assert net.get_incidence_matrix(fmt='csr').shape == (9, net.Nt)
+        # Replacing the conns array without assigning it must be flagged
+        dict.__setitem__(net, 'throat.conns', np.copy(net.conns[1:]))
+        net.invalidate_topology()
+        assert net.get_incidence_matrix(fmt='csr').shape == (9, net.Nt)
+        # In place changes must be flagged manually
+        net['throat.conns'][0] = [0, 8]
+        net.invalidate_topology()
+        assert 8 in net.find_neighbor_pores(pores=0)
+        assert net.find_connecting_throat([0], [8])[0] == 0
+
+    def test_create_adjacency_matrix_csr_matches_coo(self):
+        net = op.network.Cubic(shape=[4, 3, 2])
+        for w in [np.random.rand(net.Nt), np.random.rand(net.Nt, 2)]:
+            a = net.create_adjacency_matrix(weights=w, fmt='csr')
+            b = net.create_adjacency_matrix(weights=w, fmt='coo')
+            assert np.allclose(a.toarray(), b.toarray())
+        w = np.random.rand(net.Nt)
+        a = net.create_adjacency_matrix(weights=w, fmt='csr', triu=True)
+        b = net.create_adjacency_matrix(weights=w, fmt='coo', triu=True)
+        assert np.allclose(a.toarray(), b.toarray())
+        a = net.create_incidence_matrix(weights=w, fmt='csr')
+        b = net.create_incidence_matrix(weights=w, fmt='coo')
+        assert np.allclose(a.toarray(), b.toarray())
+        # Duplicate throats are summed as by the conversion from COO
+        op.topotools.extend(network=net, conns=[net.conns[0]])
+        w = np.random.rand(net.Nt)
+        a = net.create_adjacency_matrix(weights=w, fmt='csr')
+        b = net.create_adjacency_matrix(weights=w, fmt='coo').tocsr()
+        assert a.nnz == b.nnz == 2*(net.Nt - 1)
+        assert np.allclose(a.toarray(), b.toarray())
+        assert np.isclose(a[tuple(net.conns[0])], w[0] + w[-1])
+
+    def test_compact_dtypes(self):
+        proj = op.Project()
+        proj.settings['compact_indices'] = True
+        proj.settings['geometry_dtype'] = 'float32'
+        net = op.network.Cubic(shape=[4, 4, 4], project=proj)
+        assert net.conns.dtype == np.int32
+        assert net.coords.dtype == np.float64
+        net['pore.diameter'] = np.random.rand(net.Np)
+        assert net['pore.diameter'].dtype == np.float32
+        net['throat.diameter'] = 1.0
+        assert net['throat.diameter'].dtype == np.float32
+        net['pore.seed@left'] = 0.5
+        assert net['pore.seed'].dtype == np.float32
+        assert net.get_adjacency_matrix(fmt='csr').data.dtype == np.int32
+        assert net._get_domain_indices('pore.left').dtype == np.int32
+        # Adding pores and throats keeps the compact types
+        op.topotools.extend(network=net, coords=[[9, 9, 9]], conns=[[0, 64]])
+        assert net.conns.dtype == np.int32
+        assert np.all(net.find_neighbor_pores(pores=64) == [0])
+        # The other generators build their conns in the compact type too
+        nets = [
+            op.network.BodyCenteredCubic(shape=[3, 3, 3], project=proj),
+            op.network.FaceCenteredCubic(shape=[3, 3, 3], project=proj),
+            op.network.CubicTemplate(template=np.ones([3, 3, 3]),
+                                     project=proj),
+            op.network.Delaunay(shape=[1, 1, 1], points=50, project=proj),
+            op.network.Voronoi(shape=[1, 1, 1], points=50, project=proj),
+            op.network.DelaunayVoronoiDual(shape=[1, 1, 1], points=50,
+                                           project=proj),
+        ]
+        for net in nets:
+            assert net.conns.dtype == np.int32
+        # Objects in other projects are unaffected
+        net = op.network.Cubic(shape=[4, 4, 4])
+        assert net.conns.dtype == np.int64
+        net['pore.diameter'] = np.random.rand(net.Np)
+        assert net['pore.diameter'].dtype == np.float64
 
     def test_into(self):
         net = op.network.Demo([4, 4, 1])
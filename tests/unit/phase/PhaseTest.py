@@ -1,4 +1,5 @@
 import openpnm as op
+import numpy as np
 from numpy.testing import assert_allclose
 import pytest
 
@@ -55,6 +56,46 @@ class PhaseTest:
         with pytest.raises(KeyError):
             air['throat.density']
 
+    def test_getitem_interpolation_is_cached(self):
+        pn = op.network.Demo()
+        air = op.phase.Air(network=pn)
+        a = air['throat.viscosity']
+        assert 'throat.viscosity' in air.interpolated.keys()
+        assert air.interpolated['throat.viscosity'] == 'pore.viscosity'
+        cached = air._interpolated['throat.viscosity'][-1]
+        b = air['throat.viscosity']
+        assert air._interpolated['throat.viscosity'][-1] is cached
+        assert b is not cached
+        assert_allclose(a, b)
+        # Writing to the returned array must not affect the cache
+        b[:] = 0.0
+        assert_allclose(air['throat.viscosity'], a)
+        # Writing the source array triggers a recalculation
+        mu = air['pore.viscosity']
+        mu[pn.conns[0]] = 1.0
+        air['pore.viscosity'] = mu
+        assert air['throat.viscosity'][0] == 1.0
+        # As does regenerating the source after changing its inputs, which
+        # writes into the source array in place
+        np.random.seed(0)
+        air['pore.temperature'] = 300.0 + 50*np.random.rand(pn.Np)
+        air.regenerate_models()
+        mu = air['pore.viscosity']
+        assert_allclose(air['throat.viscosity'], mu[pn.conns].mean(axis=1))
+        air['pore.temperature'] = 320.0 + 50*np.random.rand(pn.Np)
+        air.regenerate_models()
+        mu = air['pore.viscosity']
+        assert_allclose(air['throat.viscosity'], mu[pn.conns].mean(axis=1))
+        air['pore.viscosity@left'] = 2.0
+        assert air['throat.viscosity'][pn.find_neighbor_throats(
+            pn.pores('left'), mode='xnor')].min() == 2.0
+        # As does changing the topology
+        op.topotools.trim(network=pn, throats=[0])
+        assert air['throat.viscosity'].shape == (pn.Nt, )
+        # Interpolated values are not reported once a real array exists
+        air['throat.viscosity'] = np.ones(pn.Nt)
+        assert 'throat.viscosity' not in air.interpolated.keys()
+
 
 if __name__ == '__main__':
 
@@ -68,6 +68,25 @@ class SKGRGeneratorToolsTest:
         pt = gen.tools.get_centroid(pts, mode='fast')
         assert_allclose(pt, [0.5, 0.5, 0.25], rtol=1e-12)
 
+    def test_lloyd_relaxation(self):
+        from scipy.spatial import Voronoi
+        np.random.seed(0)
+        for ndim in [2, 3]:
+            vor = Voronoi(np.random.rand(200, ndim))
+            for mode in ['rigorous', 'fast']:
+                pts = gen.tools.lloyd_relaxation(vor, mode=mode)
+                assert pts.shape == (200, 3)
+                for i, r in enumerate(vor.point_region):
+                    verts = vor.regions[r]
+                    if -1 in verts:
+                        assert_allclose(pts[i, :ndim], vor.points[i])
+                    else:
+                        pt = gen.tools.get_centroid(vor.vertices[verts],
+                                                    mode=mode)
+                        assert_allclose(pts[i, :ndim], pt, rtol=1e-8)
+        with pytest.raises(Exception):
+            gen.tools.lloyd_relaxation(vor, mode='blah')
+
     def test_parse_points(self):
         pts = gen.tools.parse_points(shape=[1, 1, 1], points=10)
         assert pts.shape == (10, 3)
@@ -157,6 +157,24 @@ class SKGRGeneratorsTest:
         assert net['node.coords'].shape[0] == 2425
         assert net['edge.conns'].shape[0] == 4730
 
+    def test_index_dtype(self):
+        np.random.seed(0)
+        nets = [
+            gen.fcc([3, 3, 3], index_dtype=np.int32),
+            gen.bcc([3, 3, 3], index_dtype=np.int32),
+            gen.cubic_template(np.ones([3, 3, 3]), index_dtype=np.int32),
+            gen.delaunay(points=50, index_dtype=np.int32)[0],
+            gen.delaunay(points=200, divs=2, cores=1, index_dtype=np.int32)[0],
+            gen.voronoi(points=50, index_dtype=np.int32)[0],
+            gen.voronoi_delaunay_dual(points=50, shape=[1, 1, 1],
+                                      index_dtype=np.int32)[0],
+        ]
+        for net in nets:
+            assert net['edge.conns'].dtype == np.int32
+        np.random.seed(0)
+        ref = gen.delaunay(points=50)[0]
+        assert np.all(ref['edge.conns'] == nets[3]['edge.conns'])
+
 
 # ax = plot_edges(net)
 # ax = plot_nodes(net, ax=ax)
@@ -1,5 +1,6 @@
 import numpy as np
 import pytest
+from scipy.sparse import csgraph
 from numpy.testing import assert_allclose
 from openpnm._skgraph.generators import cubic
 from openpnm._skgraph import queries
@@ -78,6 +79,48 @@ class SKGRQueriesTest:
         c = queries.find_neighbor_nodes(network=g, inds=[0, 3], logic='and')
         assert np.all(c == [2])
 
+    def test_find_neighbor_nodes_ragged(self):
+        g = cubic(shape=[3, 2, 1])
+        indptr, indices = queries.find_neighbor_nodes(network=g, inds=[0, 2],
+                                                      ragged=True)
+        assert np.all(indptr == [0, 1, 3])
+        assert np.all(indices == [1, 3, 4])
+        indptr, indices = queries.find_neighbor_nodes(network=g, inds=[0, 3],
+                                                      logic='xnor',
+                                                      ragged=True)
+        assert np.all(indptr == [0, 2, 4])
+        assert np.all(indices == [1, 2, 1, 2])
+        indptr, indices = queries.find_neighbor_nodes(network=g, inds=[],
+                                                      ragged=True)
+        assert np.all(indptr == [0])
+        assert indices.size == 0
+
+    def test_find_neighbor_edges_ragged(self):
+        g = cubic(shape=[3, 2, 1])
+        indptr, indices = queries.find_neighbor_edges(network=g,
+                                                      inds=[0, 2, 4],
+                                                      ragged=True)
+        assert np.all(indptr == [0, 2, 5, 7])
+        assert np.all(indices == [0, 3, 1, 3, 5, 2, 5])
+        indptr, indices = queries.find_neighbor_edges(network=g,
+                                                      inds=[0, 2, 4],
+                                                      logic='xor',
+                                                      ragged=True)
+        assert np.all(indptr == [0, 1, 2, 3])
+        assert np.all(indices == [0, 1, 2])
+
+    def test_find_connected_nodes_ragged(self):
+        g = cubic(shape=[3, 2, 1])
+        indptr, indices = queries.find_connected_nodes(network=g, inds=[0, 3],
+                                                       ragged=True)
+        assert np.all(indptr == [0, 2, 4])
+        assert np.all(indices == [0, 1, 0, 2])
+        indptr, indices = queries.find_connected_nodes(network=g, inds=[0, 3],
+                                                       logic='xnor',
+                                                       ragged=True)
+        assert np.all(indptr == [0, 1, 2])
+        assert np.all(indices == [0, 0])
+
     def test_find_connecting_edges_undirected(self):
         g = cubic(shape=[3, 2, 1])
         c = queries.find_connecting_edges(inds=[0, 1], network=g)
@@ -226,6 +269,42 @@ class SKGRQueriesTest:
         assert p['edge_paths'][0] == []
         assert p['edge_paths'][1] == [0]
 
+    def test_find_shortest_paths(self):
+        g = cubic(shape=[5, 5, 1])
+        np.random.seed(0)
+        w = np.random.rand(g['edge.conns'].shape[0])
+        pairs = [[0, 24], [12, 3], [0, 7], [12, 12], [0, 0]]
+        am = tools.dict_to_am(g, weights=w).tocsr()
+        d = csgraph.dijkstra(am, indices=[0, 12, 0, 12, 0])
+        for cores in [1, 2]:
+            p = queries.find_shortest_paths(network=g, pairs=pairs,
+                                            weights=w, cores=cores)
+            assert np.allclose(p['lengths'], d[np.arange(5), [24, 3, 7, 12, 0]])
+            assert np.all(p['sources'] == [0, 12])
+            assert p['predecessors'].shape == (2, 25)
+            assert np.all(p['index'] == [0, 1, 0, 1, 0])
+            for i, (a, b) in enumerate(pairs):
+                nodes = queries.reconstruct_path(p, i)
+                if a == b:
+                    assert len(nodes) == 0
+                    continue
+                assert nodes[0] == a
+                assert nodes[-1] == b
+                steps = np.vstack((nodes[:-1], nodes[1:])).T
+                e = queries.find_connecting_edges(steps, network=g).astype(int)
+                assert np.isclose(w[e].sum(), p['lengths'][i])
+        # No pairs gives empty results
+        for pairs in [[], np.zeros((0, 2), dtype=int)]:
+            p = queries.find_shortest_paths(network=g, pairs=pairs)
+            assert p['lengths'].shape == (0, )
+            assert p['pairs'].shape == (0, 2)
+            assert p['predecessors'].shape == (0, 25)
+        # Paths are not found against the direction of directed edges
+        g['edge.conns'][0, :] = [1, 0]
+        p = queries.find_shortest_paths(network=g, pairs=[[0, 1], [1, 0]])
+        assert np.all(p['lengths'] == [np.inf, 1])
+        assert len(queries.reconstruct_path(p, 0)) == 0
+
 
 if __name__ == '__main__':
     t = SKGRQueriesTest()
@@ -4,6 +4,7 @@ from openpnm._skgraph.queries import (
     qupc_reduce,
     qupc_update,
     qupc_compress,
+    qupc_find,
 )
 
 
@@ -29,6 +30,18 @@ class SKGRQUPCTest:
         qupc_compress(a)
         assert np.all(a == [0, 0, 1, 2, 1, 1, 1, 1, 0, 3])
 
+    def test_find(self):
+        a = qupc_initialize(10)
+        qupc_update(a, 4, 2)
+        qupc_update(a, 7, 4)
+        qupc_update(a, 9, 6)
+        qupc_update(a, 6, 2)
+        qupc_update(a, 5, 9)
+        roots = [qupc_find(a, i) for i in range(10)]
+        assert roots == [0, 1, 2, 3, 2, 2, 2, 2, 8, 2]
+        # The chain from 5 was shortened
+        assert a[5] == 2
+
 
 if __name__ == '__main__':
     t = SKGRQUPCTest()
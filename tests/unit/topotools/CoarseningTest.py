@@ -0,0 +1,97 @@
+import openpnm as op
+import numpy as np
+from numpy.testing import assert_allclose
+from openpnm import topotools
+
+
+class CoarseningTest:
+
+    def setup_class(self):
+        np.random.seed(0)
+        self.net = op.network.Cubic(shape=[12, 12, 12])
+        self.g = np.random.lognormal(0, 0.5, self.net.Nt)
+
+    def test_find_aggregates(self):
+        agg = topotools.find_aggregates(self.net, divs=[4, 3, 2])
+        assert agg.max() + 1 == 24
+        assert np.all(np.bincount(agg) == 72)
+        assert agg[0] == 0
+        # Each aggregate is connected
+        conns = self.net.conns
+        inner = agg[conns[:, 0]] == agg[conns[:, 1]]
+        Ps = topotools.find_clusters(self.net, mask=inner).pore_labels
+        assert np.unique(Ps).size == 24
+
+    def test_find_aggregates_splits_disconnected_blocks(self):
+        pn = op.network.Cubic(shape=[4, 4, 1])
+        topotools.trim(pn, throats=pn.find_neighbor_throats(pores=5))
+        agg = topotools.find_aggregates(pn, divs=[2, 2, 1])
+        assert agg.max() + 1 == 5
+        assert np.sum(agg == agg[5]) == 1
+
+    def test_coarsen(self):
+        agg = topotools.find_aggregates(self.net, divs=4)
+        cn = topotools.coarsen(self.net, aggregates=agg)
+        assert cn.Np == 64
+        assert cn.Nt == 144
+        assert cn.project is not self.net.project
+        assert np.all(cn['pore.num_fine'] == 27)
+        R = topotools.restriction_matrix(agg)
+        assert_allclose(cn.coords, R @ self.net.coords)
+        assert 'throat.conductance' not in cn.keys()
+
+    def test_upscale_conductance_uniform(self):
+        for divs in [6, 4, 3]:
+            agg = topotools.find_aggregates(self.net, divs=divs)
+            g = topotools.upscale_conductance(self.net, aggregates=agg,
+                                              conductance=np.ones(self.net.Nt))
+            # A block of n**3 pores behaves like n**2 chains of length n
+            n = 12//divs
+            assert_allclose(g, n, rtol=1e-10)
+
+    def test_upscale_conductance_matches_local_solve(self):
+        agg = topotools.find_aggregates(self.net, divs=4)
+        cn = topotools.coarsen(self.net, aggregates=agg, conductance=self.g)
+        assert np.all(cn['throat.conductance'] > 0)
+        # Repeat the first local problem using a Transport algorithm
+        I, J = cn.conns[0]
+        Ps = np.where((agg == I) | (agg == J))[0]
+        Ts = self.net.find_neighbor_throats(pores=Ps, mode='xnor')
+        sub = op.network.Network(coords=self.net.coords[Ps],
+                                 conns=np.searchsorted(Ps, self.net.conns[Ts]))
+        sub['throat.g'] = self.g[Ts]
+        alg = op.algorithms.StokesFlow(network=sub, phase=sub)
+        alg.settings['conductance'] = 'throat.g'
+        d = cn.coords[J] - cn.coords[I]
+        t = (sub.coords - cn.coords[I]) @ d/(d @ d)
+        inI = agg[Ps] == I
+        BC = np.where(inI, t <= t[inI].mean(), t >= t[~inI].mean())
+        alg.set_value_BC(pores=np.where(BC)[0], values=1.0 - t[BC])
+        alg.run()
+        x = alg.x
+        cross = agg[Ps][sub.conns[:, 0]] != agg[Ps][sub.conns[:, 1]]
+        c = sub.conns[cross]
+        sign = np.where(inI[c[:, 0]], 1, -1)
+        Q = np.sum(sign*sub['throat.g'][cross]*(x[c[:, 0]] - x[c[:, 1]]))
+        g = Q/(x[inI].mean() - x[~inI].mean())
+        assert_allclose(cn['throat.conductance'][0], g, rtol=1e-8)
+
+    def test_transfer_matrices(self):
+        agg = topotools.find_aggregates(self.net, divs=3)
+        P = topotools.prolongation_matrix(agg)
+        R = topotools.restriction_matrix(agg)
+        assert P.shape == (self.net.Np, 27)
+        assert R.shape == (27, self.net.Np)
+        assert_allclose((R @ P).toarray(), np.eye(27))
+        x = np.random.rand(27)
+        assert_allclose(P @ x, x[agg])
+
+
+if __name__ == '__main__':
+    t = CoarseningTest()
+    self = t
+    t.setup_class()
+    for item in t.__dir__():
+        if item.startswith('test'):
+            print(f'Running test: {item}')
+            t.__getattribute__(item)()
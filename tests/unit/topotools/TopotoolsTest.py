@@ -227,6 +227,85 @@ class TopotoolsTest:
         topotools.trim(pn, throats=pn.Ts[trimmers])
         assert ~np.any(pn['throat.random'] < 0.25)
 
+    def test_trim_batched_matches_sequential(self):
+        from openpnm.network._network import _build_adjacency, _build_incidence
+        pn = op.network.Cubic(shape=[5, 5, 5])
+        pn['throat.id'] = pn.Ts.astype(float)
+        pn['pore.compact'] = op.utils.compact_array(1.0, pn.Np)
+        pn.get_adjacency_matrix(fmt='csr')
+        pn.get_incidence_matrix(fmt='csr')
+        ref = op.network.Cubic(shape=[5, 5, 5])
+        ref['throat.id'] = ref.Ts.astype(float)
+        ref['pore.id'] = ref.Ps.astype(float)
+        topotools.trim(ref, pores=ref.pores('left'))
+        topotools.trim(ref, pores=np.where(ref['pore.id'] == 62)[0])
+        topotools.trim(ref, throats=np.where(ref['throat.id'] < 2)[0])
+        Ps = pn.pores('left')
+        topotools.trim(pn, pores=[Ps, [62]], throats=[0, 1])
+        assert pn.Np == ref.Np
+        assert pn.Nt == ref.Nt
+        assert np.all(pn.conns == ref.conns)
+        assert np.all(pn['throat.id'] == ref['throat.id'])
+        assert op.utils.is_compact(dict.__getitem__(pn, 'pore.compact'))
+        # The cached topology was remapped rather than discarded
+        am = pn._topology['am']
+        am_ref = _build_adjacency(pn.conns, pn.Np)['am']
+        assert np.all(am.indptr == am_ref.indptr)
+        assert np.all(am.indices == am_ref.indices)
+        assert np.all(am.data == am_ref.data)
+        im = pn._topology['im']
+        im_ref = _build_incidence(pn.conns, pn.Np)['im']
+        assert np.all(im.indptr == im_ref.indptr)
+        assert np.all(im.data == im_ref.data)
+
+    def test_trim_wrong_length_array(self):
+        pn = op.network.Cubic(shape=[3, 3, 3])
+        dict.__setitem__(pn, 'pore.bad', np.ones(pn.Np + 1))
+        with pytest.raises(Exception):
+            topotools.trim(pn, pores=[0])
+        # Nothing was trimmed
+        assert pn.Np == 27
+        assert pn['pore.bad'].size == 28
+
+    def test_reorder(self):
+        np.random.seed(0)
+        cubic = op.network.Cubic(shape=[8, 8, 8])
+        P = np.random.permutation(cubic.Np)
+        Pmap = np.argsort(P)
+        conns = np.sort(Pmap[cubic.conns], axis=1)
+        for method in ['rcm', 'hilbert', 'morton']:
+            pn = op.network.Network(coords=cubic.coords[P], conns=conns)
+            pn['throat.g'] = np.random.rand(pn.Nt, 2)
+            pn['pore.compact'] = op.utils.compact_array(1.0, pn.Np)
+            coords, g = pn.coords.copy(), pn['throat.g'].copy()
+            sf = op.algorithms.StokesFlow(network=pn, phase=pn)
+            sf.settings['conductance'] = 'throat.g'
+            sf.set_value_BC(pores=pn.coords[:, 0].argmin(), values=1.0)
+            sf.set_value_BC(pores=pn.coords[:, 0].argmax(), values=0.0)
+            sf.run()
+            x = sf.x.copy()
+            am = pn.get_adjacency_matrix()
+            bw = np.abs(am.row - am.col).max()
+            Ps, Ts = topotools.reorder(pn, method=method)
+            assert np.all(pn['pore.original_index'] == Ps)
+            assert np.all(pn['throat.original_index'] == Ts)
+            assert np.all(pn.coords == coords[Ps])
+            assert np.all(pn.conns[:, 0] < pn.conns[:, 1])
+            assert op.utils.is_compact(dict.__getitem__(pn, 'pore.compact'))
+            am = pn.get_adjacency_matrix()
+            assert np.abs(am.row - am.col).max() < bw
+            # Directional data follows the flipped throats
+            flip = np.any(Ps[pn.conns] != conns[Ts], axis=1)
+            assert np.all(Ps[pn.conns[flip]] == conns[Ts][flip][:, ::-1])
+            assert np.all(pn['throat.g'][flip] == g[Ts][flip][:, ::-1])
+            assert np.all(pn['throat.g'][~flip] == g[Ts][~flip])
+            # Results are permuted and the algorithm can be rerun
+            assert_allclose(sf.x, x[Ps])
+            sf.run()
+            assert_allclose(sf.x, x[Ps], rtol=1e-10)
+        with pytest.raises(Exception):
+            topotools.reorder(pn, method='blah')
+
     def test_iscoplanar(self):
         # Generate planar points with several parallel vectors at start
         coords = [[0, 0, 0], [0, 0, 0], [0, 0, 1], [0, 0, 2], [0, 1, 2]]
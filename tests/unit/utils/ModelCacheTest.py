@@ -0,0 +1,121 @@
+import os
+import numpy as np
+import openpnm as op
+from numpy.testing import assert_allclose
+
+
+mod = op.models.geometry.hydraulic_size_factors.spheres_and_cylinders
+
+
+class ModelCacheTest:
+
+    def setup_class(self):
+        self.cache = op.utils.ModelCache()
+        self.net = op.network.Cubic(shape=[4, 4, 4])
+        self.net['pore.diameter'] = 0.5
+        self.net['throat.diameter'] = 0.2
+
+    def teardown_method(self):
+        self.cache.disable()
+        self.cache.clear(disk=True)
+        self.cache.settings['max_memory'] = 1e9
+
+    def teardown_class(self):
+        ws = op.Workspace()
+        ws.clear()
+
+    def test_singleton(self):
+        assert op.utils.ModelCache() is self.cache
+
+    def test_fast_hash(self):
+        a = np.arange(10.0)
+        b = a.copy()
+        assert op.utils.fast_hash(a) == op.utils.fast_hash(b)
+        b[3] = -1
+        assert op.utils.fast_hash(a) != op.utils.fast_hash(b)
+        assert op.utils.fast_hash(a) != op.utils.fast_hash(a.astype(np.float32))
+
+    def test_disabled_by_default(self):
+        self.net.add_model(propname='throat.hydraulic_size_factors',
+                           model=mod)
+        assert len(self.cache) == 0
+        assert self.cache.misses == 0
+
+    def test_hit_on_identical_inputs(self):
+        self.cache.enable()
+        self.net.add_model(propname='throat.hydraulic_size_factors',
+                           model=mod)
+        assert self.cache.misses == 1
+        ref = self.net['throat.hydraulic_size_factors'].copy()
+        self.net['throat.hydraulic_size_factors'][:] = 0.0
+        self.net.regenerate_models('throat.hydraulic_size_factors')
+        assert self.cache.hits == 1
+        assert_allclose(self.net['throat.hydraulic_size_factors'], ref)
+
+    def test_miss_when_inputs_change(self):
+        self.cache.enable()
+        self.net.add_model(propname='throat.hydraulic_size_factors',
+                           model=mod)
+        self.net['pore.diameter'][0] = 0.6
+        self.net.regenerate_models('throat.hydraulic_size_factors')
+        self.net['pore.diameter'][0] = 0.5
+        assert self.cache.misses == 2
+        assert self.cache.hits == 0
+
+    def test_only_inputs_read_by_model_are_keyed(self):
+        from openpnm.utils._cache import _cacheable_models
+        lengths = op.models.geometry.conduit_lengths
+        assert _cacheable_models[lengths.spheres_and_cylinders] \
+            == ['throat.spacing']
+        assert _cacheable_models[lengths.intersecting_cones] == []
+        net = op.network.Cubic(shape=[3, 3, 3])
+        net['throat.coords'] = net.coords[net.conns].mean(axis=1)
+        f = lengths.intersecting_cones
+        a = self.cache.get_key(f, net, {'throat_coords': 'throat.coords'})
+        net['throat.spacing'] = 2.0
+        b = self.cache.get_key(f, net, {'throat_coords': 'throat.coords'})
+        assert a == b
+        f = lengths.spheres_and_cylinders
+        a = self.cache.get_key(f, net, {})
+        net['throat.spacing'] = 3.0
+        assert self.cache.get_key(f, net, {}) != a
+
+    def test_uncacheable_model_is_not_stored(self):
+        self.cache.enable()
+        self.net.add_model(propname='pore.seed',
+                           model=op.models.geometry.pore_seed.random)
+        assert len(self.cache) == 0
+
+    def test_lru_eviction(self):
+        self.cache.enable(max_memory=self.net.Nt*3*8*1.5)
+        for d in [0.20, 0.21, 0.22]:
+            self.net['throat.diameter'] = d
+            self.net.add_model(propname='throat.hydraulic_size_factors',
+                               model=mod)
+        self.net['throat.diameter'] = 0.2
+        assert len(self.cache) == 1
+        assert self.cache.nbytes <= self.cache.settings['max_memory']
+
+    def test_disk_tier(self, tmpdir):
+        cachedir = os.path.join(str(tmpdir), 'cache')
+        self.cache.enable(cachedir=cachedir)
+        self.net.add_model(propname='throat.hydraulic_size_factors',
+                           model=mod)
+        assert len(os.listdir(cachedir)) == 1
+        # Simulate a new session by clearing only the in-memory tier
+        self.cache.clear()
+        self.net.regenerate_models('throat.hydraulic_size_factors')
+        assert self.cache.hits == 1
+        self.cache.settings['cachedir'] = ''
+
+
+if __name__ == '__main__':
+
+    t = ModelCacheTest()
+    self = t
+    t.setup_class()
+    for item in t.__dir__():
+        if item.startswith('test'):
+            print('running test: '+item)
+            t.__getattribute__(item)()
+            t.teardown_method()
@@ -27,6 +27,58 @@ class ProjectTest:
         proj = pn.project
         assert 'bob' in proj.names
 
+    def test_footprint(self):
+        ws = op.Workspace()
+        net = op.network.Cubic(shape=[4, 4, 4])
+        net.add_model(propname='pore.seed',
+                      model=op.models.geometry.pore_seed.random)
+        net['pore.copy'] = net['pore.coords'].copy()
+        net['pore.uniform'] = op.utils.compact_array(2.0, net.Np)
+        net['throat.ones'] = np.ones(net.Nt)
+        df = net.project.footprint()
+        row = df.set_index('key').loc['throat.conns']
+        assert row['nbytes'] == net.conns.nbytes
+        assert row['element'] == 'throat'
+        row = df.set_index('key').loc['pore.copy']
+        assert row['duplicate_of'] == f'{net.name}/pore.coords'
+        row = df.set_index('key').loc['pore.uniform']
+        assert row['broadcast']
+        assert row['nbytes'] == 8
+        assert df.set_index('key').loc['throat.ones']['constant']
+        assert df.set_index('key').loc['pore.seed']['model'] == 'pore.seed@all'
+        assert np.all(np.diff(df['nbytes']) <= 0)
+        # Cached data on the network is reported too
+        net.get_adjacency_matrix(fmt='csr')
+        df = net.footprint(by='element')
+        assert set(df['element']) == {'pore', 'throat', 'cache'}
+        df = net.footprint(by='object')
+        assert len(df) == 1
+        assert df['nbytes'][0] == net.footprint()['nbytes'].sum()
+        # Model run times are only recorded when requested
+        ws.settings['profile_models'] = True
+        try:
+            net.regenerate_models()
+            net.regenerate_models()
+        finally:
+            ws.settings['profile_models'] = False
+        df = net.footprint(by='model').set_index('model')
+        assert df.loc['pore.seed@all']['model_calls'] == 2
+        assert df.loc['pore.seed@all']['model_time'] > 0
+        with pytest.raises(Exception):
+            net.footprint(by='blah')
+
+    def test_footprint_of_fused_models(self):
+        net = op.network.Cubic(shape=[4, 4, 4])
+        net.add_model_collection(
+            op.models.collections.geometry.spheres_and_cylinders_fused)
+        net.regenerate_models()
+        df = net.footprint().set_index('key')
+        for key in ['throat.length', 'throat.cross_sectional_area',
+                    'throat.hydraulic_size_factors']:
+            assert df.loc[key]['model'] == 'throat.conduit_geometry@all'
+        df = net.footprint(by='model').set_index('model')
+        assert df.loc['throat.conduit_geometry@all']['arrays'] > 3
+
     def test_get_locations(self):
         pn = op.network.Cubic([3, 3, 3], name='bob')
         air = op.phase.Air(network=pn)
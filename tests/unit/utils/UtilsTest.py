@@ -94,6 +94,28 @@ class UtilsTest:
         assert not op.utils.is_valid_propname("throat.")
         assert not op.utils.is_valid_propname("pore.foo..bar")
 
+    def test_segment_reduce(self):
+        vals = np.array([3.0, np.nan, 1.0, 4.0, np.nan, 2.0])
+        indptr = np.array([0, 3, 3, 5, 6])
+        f = op.utils.segment_reduce
+        assert np.array_equal(f(vals, indptr, 'min'), [1.0, np.inf, 4.0, 2.0])
+        assert np.array_equal(f(vals, indptr, 'max'), [3.0, -np.inf, 4.0, 2.0])
+        assert np.array_equal(f(vals, indptr, 'sum'), [4.0, 0.0, 4.0, 2.0])
+        assert np.array_equal(f(vals, indptr, 'mean'),
+                              [2.0, np.nan, 4.0, 2.0], equal_nan=True)
+        w = np.array([1.0, 1.0, 3.0, 1.0, 1.0, 1.0])
+        assert np.array_equal(f(vals, indptr, 'mean', weights=w),
+                              [1.5, np.nan, 4.0, 2.0], equal_nan=True)
+        assert np.isnan(f(vals, indptr, 'min', ignore_nans=False)[0])
+        # Segments of equal length take a different code path
+        vals = np.array([[1.0, np.nan], [4.0, 2.0], [np.nan, np.nan]])
+        r = f(vals.flatten(), np.arange(0, 7, 2), 'min')
+        assert np.array_equal(r, [1.0, 2.0, np.inf])
+        r = f(vals.flatten(), np.arange(0, 7, 2), 'max')
+        assert np.array_equal(r, [1.0, 4.0, -np.inf])
+        with pytest.raises(Exception):
+            f(vals.flatten(), np.arange(0, 7, 2), 'median')
+
 
 if __name__ == '__main__':
 